@@ -29,6 +29,31 @@ NOTION_RANKING_ITEM_ID = "notion_ranking_item_id_{}_{}_{}"
 # ttl: 2 weeks
 NOTION_SUMMARY_ITEM_ID = "notion_summary_item_id_{}_{}_{}"
 
+# key: prefix + agent name + hash(model + prompt + input)
+# val: llm response
+# ttl: 2 weeks
+LLM_RESPONSE_ITEM_ID = "llm_response_item_id_{}_{}"
+
+# key: prefix + md5(feed url)
+# val: json format: {"etag": xx, "modified": xx}
+# ttl: 1 week
+RSS_FEED_VALIDATORS = "rss_feed_validators_{}"
+
+# key: prefix + md5(clean page url)
+# val: last modified time of the page (isoformat)
+# ttl: 4 weeks
+WEB_LAST_MODIFIED = "web_last_modified_{}"
+
+# key: prefix + index db id
+# val: json format: {"since": xx, "database_ids": [xx], "sources": [xx]}
+# ttl: 10 minutes
+WEB_SOURCES = "web_sources_{}"
+
+# key: prefix + sha256(url + xpath)
+# val: page html rendered by the browser
+# ttl: 1 hour
+WEB_RENDERED_PAGE = "web_rendered_page_{}"
+
 # key: prefix + source_name + list_name + id
 # val: true/false
 OBSIDIAN_INBOX_ITEM_ID = "obsidian_inbox_item_id_{}_{}_{}"
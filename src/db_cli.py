@@ -27,11 +27,29 @@ class DBClient(DBClientBase):
         key = key_tpl.format(source, category, item_id)
         return self.driver.get(key)
 
+    def get_notion_toread_item_ids(self, source, items: list):
+        """
+        items: [(category, item_id), ...]
+
+        @return the visited markers in the order of items
+        """
+        key_tpl = data_model.NOTION_TOREAD_ITEM_ID
+        keys = [key_tpl.format(source, category, item_id) for category, item_id in items]
+        return self.driver.mget(keys)
+
     def set_notion_toread_item_id(self, source, category, item_id, **kwargs):
         key_tpl = data_model.NOTION_TOREAD_ITEM_ID
         key = key_tpl.format(source, category, item_id)
         self.driver.set(key, "true", **kwargs)
 
+    def set_notion_toread_item_ids(self, source, items: list, **kwargs):
+        """
+        items: [(category, item_id), ...]
+        """
+        key_tpl = data_model.NOTION_TOREAD_ITEM_ID
+        pairs = [(key_tpl.format(source, category, item_id), "true") for category, item_id in items]
+        return self.driver.mset(pairs, **kwargs)
+
     def get_notion_last_edited_time(self, source, category):
         key_tpl = data_model.NOTION_TOREAD_LAST_EDITED_KEY
         key = key_tpl.format(source, category)
@@ -47,6 +65,16 @@ class DBClient(DBClientBase):
         key = key_tpl.format(source, category, item_id)
         return self.driver.get(key)
 
+    def get_notion_ranking_item_ids(self, source, items: list):
+        """
+        items: [(category, item_id), ...]
+
+        @return cached rankings in the order of items
+        """
+        key_tpl = data_model.NOTION_RANKING_ITEM_ID
+        keys = [key_tpl.format(source, category, item_id) for category, item_id in items]
+        return self.driver.mget(keys)
+
     def set_notion_ranking_item_id(
         self,
         source,
@@ -64,6 +92,16 @@ class DBClient(DBClientBase):
         key = key_tpl.format(source, category, item_id)
         return self.driver.get(key)
 
+    def get_notion_summary_item_ids(self, source, items: list):
+        """
+        items: [(category, item_id), ...]
+
+        @return cached summaries in the order of items
+        """
+        key_tpl = data_model.NOTION_SUMMARY_ITEM_ID
+        keys = [key_tpl.format(source, category, item_id) for category, item_id in items]
+        return self.driver.mget(keys)
+
     def set_notion_summary_item_id(
         self,
         source,
@@ -76,6 +114,82 @@ class DBClient(DBClientBase):
         key = key_tpl.format(source, category, item_id)
         self.driver.set(key, s, **kwargs)
 
+    def get_llm_response_item_id(self, name, item_id):
+        key_tpl = data_model.LLM_RESPONSE_ITEM_ID
+        key = key_tpl.format(name, item_id)
+        return self.driver.get(key)
+
+    def set_llm_response_item_id(
+        self,
+        name,
+        item_id,
+        resp: str,
+        **kwargs
+    ):
+        key_tpl = data_model.LLM_RESPONSE_ITEM_ID
+        key = key_tpl.format(name, item_id)
+        self.driver.set(key, resp, **kwargs)
+
+    def get_rss_feed_validators(self, feed_id):
+        key_tpl = data_model.RSS_FEED_VALIDATORS
+        key = key_tpl.format(feed_id)
+        return self.driver.get(key)
+
+    def set_rss_feed_validators(
+        self,
+        feed_id,
+        json_data: str,
+        **kwargs
+    ):
+        key_tpl = data_model.RSS_FEED_VALIDATORS
+        key = key_tpl.format(feed_id)
+        self.driver.set(key, json_data, **kwargs)
+
+    def get_web_last_modified(self, url_id):
+        key_tpl = data_model.WEB_LAST_MODIFIED
+        key = key_tpl.format(url_id)
+        return self.driver.get(key)
+
+    def set_web_last_modified(
+        self,
+        url_id,
+        last_modified: str,
+        **kwargs
+    ):
+        key_tpl = data_model.WEB_LAST_MODIFIED
+        key = key_tpl.format(url_id)
+        self.driver.set(key, last_modified, **kwargs)
+
+    def get_web_sources(self, db_index_id):
+        key_tpl = data_model.WEB_SOURCES
+        key = key_tpl.format(db_index_id)
+        return self.driver.get(key)
+
+    def set_web_sources(
+        self,
+        db_index_id,
+        json_data: str,
+        **kwargs
+    ):
+        key_tpl = data_model.WEB_SOURCES
+        key = key_tpl.format(db_index_id)
+        self.driver.set(key, json_data, **kwargs)
+
+    def get_web_rendered_page(self, page_id):
+        key_tpl = data_model.WEB_RENDERED_PAGE
+        key = key_tpl.format(page_id)
+        return self.driver.get(key)
+
+    def set_web_rendered_page(
+        self,
+        page_id,
+        html: str,
+        **kwargs
+    ):
+        key_tpl = data_model.WEB_RENDERED_PAGE
+        key = key_tpl.format(page_id)
+        self.driver.set(key, html, **kwargs)
+
     def get_obsidian_inbox_item_id(self, source, category, item_id):
         key_tpl = data_model.OBSIDIAN_INBOX_ITEM_ID
         key = key_tpl.format(source, category, item_id)
@@ -1,16 +1,18 @@
 import os
 import re
+import hashlib
 
 import httpx
-import tiktoken
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda, RunnableParallel
 from langchain_openai import ChatOpenAI
 from langchain.chains.summarize import load_summarize_chain
 from langchain_community.chat_models import ChatOllama
 from langchain_community.document_loaders import YoutubeLoader
 from langchain_community.document_loaders import WebBaseLoader
+from langchain_community.document_loaders.web_base import default_header_template
 from langchain_community.document_loaders import ArxivLoader
 from langchain_community.utilities import ArxivAPIWrapper
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -25,6 +27,7 @@ except ImportError:
     markdown = None
 
 import llm_prompts
+from db_cli import DBClient
 
 
 def markdown_to_html(text: str) -> str:
@@ -57,12 +60,33 @@ def markdown_to_html(text: str) -> str:
 #######################################################################
 # Loaders
 #######################################################################
+def web_loader_headers() -> dict:
+    """
+    Browser-like headers of WebBaseLoader, it only sets them on the
+    sessions it creates, a shared session must carry them itself. A
+    real browser User-Agent is picked unless USER_AGENT is set
+    """
+    headers = dict(default_header_template)
+
+    if not os.getenv("USER_AGENT"):
+        try:
+            from fake_useragent import UserAgent
+            headers["User-Agent"] = UserAgent().random
+        except Exception as e:
+            print(f"[WARN] fake_useragent unavailable, keep the default User-Agent: {e}")
+
+    return headers
+
+
 class LLMWebLoader:
+    def __init__(self, session=None):
+        self.session = session
+
     def load(self, url: str) -> list:
         if not url:
             return []
 
-        loader = WebBaseLoader([url])
+        loader = WebBaseLoader([url], session=self.session)
         docs = loader.load()
         return docs
 
@@ -203,17 +227,38 @@ class LLMAgentBase:
     def __init__(self, api_key, model_name):
         self.api_key = api_key
         self.model_name = model_name
+        self.prompt = None
+        self.prompt_bytes = b""
         self.prompt_tpl = None
         self.llm = None
         self.llmchain = None
 
-    def _init_prompt(self, prompt=None):
-        prompt_tpl = PromptTemplate(
+        # provider:model resolved by init_llm, part of the cache key
+        self.llm_model = model_name
+
+        # Read once per agent, not on every invocation
+        self.cache_enabled = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+        self.cache_expire_time = int(os.getenv("LLM_CACHE_EXPIRE_TIME", 86400 * 14))
+        self._db = None
+
+    def _build_prompt(self, prompt):
+        # Single {content} hole: pre-split once, render by concatenation
+        render = llm_prompts.compile_prompt(prompt)
+
+        if render:
+            return RunnableLambda(lambda inputs: render(inputs["content"]))
+
+        return PromptTemplate(
             input_variables=["content"],
             template=prompt,
         )
 
+    def _init_prompt(self, prompt=None):
+        prompt_tpl = self._build_prompt(prompt)
+
         print(f"Initialized prompt: {prompt_tpl}")
+        self.prompt = prompt
+        self.prompt_bytes = (prompt or "").encode("utf-8")
         self.prompt_tpl = prompt_tpl
 
     def init_llm(
@@ -221,8 +266,14 @@ class LLMAgentBase:
         provider=None,
         model_name=None,
         temperature=0,
-        create_default_chain=True
+        create_default_chain=True,
+        json_mode=False,
+        json_schema=None,
     ):
+        """
+        json_mode: constrain the decoding to a JSON object (json_schema is
+                   used where the provider supports it)
+        """
         provider = provider or os.getenv("LLM_PROVIDER", "openai")
         llm = None
 
@@ -247,12 +298,22 @@ class LLMAgentBase:
                     # for fixed response format task, set temperature = 0
                     temperature=temperature)
 
+            if json_mode:
+                llm = llm.bind(**llm_prompts.CATEGORY_REQUEST_KWARGS)
+
         elif provider == "google":
             model_name = model_name or os.getenv("GOOGLE_MODEL", "gemini-pro")
 
+            json_kwargs = {}
+            if json_mode:
+                json_kwargs["response_mime_type"] = "application/json"
+                if json_schema:
+                    json_kwargs["response_schema"] = json_schema
+
             llm = ChatGoogleGenerativeAI(
                 model=model_name,
-                temperature=temperature)
+                temperature=temperature,
+                **json_kwargs)
 
         elif provider == "ollama":
             model_name = model_name or os.getenv("OLLAMA_MODEL", "llama3")
@@ -262,6 +323,7 @@ class LLMAgentBase:
                 base_url=ollama_url,
                 model=model_name,
                 temperature=temperature,
+                format="json" if json_mode else None,
             )
 
         else:
@@ -269,6 +331,7 @@ class LLMAgentBase:
             raise
 
         self.llm = llm
+        self.llm_model = f"{provider}:{model_name}"
 
         # Create a default chain using RunnableSequence pattern
         if create_default_chain:
@@ -276,12 +339,44 @@ class LLMAgentBase:
 
         print(f"LLM chain initalized, provider: {provider}, model_name: {model_name}, temperature: {temperature}")
 
+    def _invoke(self, text):
+        """
+        Invoke the default chain with {"content": text}. If LLM_CACHE_ENABLED,
+        responses are cached in redis keyed on hash(model, prompt, text), so
+        the same prompt over the same content skips the LLM call
+        """
+        if not self.cache_enabled:
+            return self.llmchain.invoke({"content": text})
+
+        name = self.__class__.__name__
+        # The static prompt is encoded once in _init_prompt, only the
+        # input is encoded per call
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{self.llm_model}\n".encode("utf-8"))
+        hasher.update(self.prompt_bytes)
+        hasher.update(b"\n")
+        hasher.update(text.encode("utf-8"))
+        item_id = hasher.hexdigest()
+
+        if self._db is None:
+            self._db = DBClient()
+
+        client = self._db
+        cached = client.get_llm_response_item_id(name, item_id)
+        if cached:
+            print(f"[LLM] Cache hit: {name}, {item_id}")
+            return cached.decode("utf-8") if isinstance(cached, bytes) else cached
+
+        response = self.llmchain.invoke({"content": text})
+
+        client.set_llm_response_item_id(
+            name, item_id, response, expired_time=self.cache_expire_time)
+
+        return response
+
     def get_num_tokens(self, text):
-        """Estimate token count using tiktoken."""
-        try:
-            encoding = tiktoken.encoding_for_model(self.model_name)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
+        """Estimate token count using tiktoken (encoding is cached per model)."""
+        encoding = llm_prompts.get_encoding(self.model_name)
         return len(encoding.encode(text))
 
 
@@ -293,6 +388,20 @@ class LLMAgentCategoryAndRanking(LLMAgentBase):
         prompt = prompt or llm_prompts.LLM_PROMPT_CATEGORY_AND_RANKING_TPL2
         self._init_prompt(prompt)
 
+    def init_llm(
+        self,
+        provider=None,
+        model_name=None,
+        temperature=0,
+    ):
+        # The response is always parsed as json, enforce it at decode time
+        super().init_llm(
+            provider,
+            model_name,
+            temperature,
+            json_mode=True,
+            json_schema=llm_prompts.CATEGORY_AND_RANKING_SCHEMA)
+
     def run(self, text: str):
         """
         @return something like below
@@ -308,7 +417,7 @@ class LLMAgentCategoryAndRanking(LLMAgentBase):
         tokens = self.get_num_tokens(text)
         print(f"[LLM] Category and Ranking, number of tokens: {tokens}")
 
-        response = self.llmchain.invoke({"content": text})
+        response = self._invoke(text)
         return response
 
 
@@ -317,6 +426,8 @@ class LLMAgentSummary(LLMAgentBase):
         super().__init__(api_key, model_name)
         self.target_lang = None
         self.render_html = False
+        self.chunk_size = int(os.getenv("TEXT_CHUNK_SIZE", 2048))
+        self.chunk_overlap = int(os.getenv("TEXT_CHUNK_OVERLAP", 256))
 
     def init_prompt(
         self,
@@ -332,14 +443,11 @@ class LLMAgentSummary(LLMAgentBase):
         if not self.combine_prompt:
             print(f"[LLMAgentSummary] target language: {self.target_lang}, translation_enabled: {translation_enabled}, render_html: {self.render_html}")
 
-            if self.target_lang and translation_enabled:
-                # Direct target language output (no English + translation separator)
-                prompt_tpl = llm_prompts.LLM_PROMPT_SUMMARY_TARGET_LANG.format(self.target_lang, self.target_lang, self.target_lang)
-            else:
-                # Default English summary
-                prompt_tpl = llm_prompts.LLM_PROMPT_SUMMARY_COMBINE_PROMPT3
-
-            self.combine_prompt = prompt_tpl
+            # Direct target language output (no English + translation
+            # separator), or default English summary
+            target_lang = self.target_lang if translation_enabled else None
+            self.combine_prompt = llm_prompts.build_summary_prompt(
+                style="analyst", target_lang=target_lang or None)
 
         self.combine_prompt_tpl = PromptTemplate(
             template=self.combine_prompt,
@@ -375,8 +483,8 @@ class LLMAgentSummary(LLMAgentBase):
         chunk_size=None,
         chunk_overlap=None,
     ):
-        chunk_size = chunk_size or int(os.getenv("TEXT_CHUNK_SIZE", 2048))
-        chunk_overlap = chunk_overlap or int(os.getenv("TEXT_CHUNK_OVERLAP", 256))
+        chunk_size = chunk_size or self.chunk_size
+        chunk_overlap = chunk_overlap or self.chunk_overlap
 
         print(f"[LLM] input text ({len(text)} chars), chunk_size: {chunk_size}, chunk_overlap: {chunk_overlap}, text: {text[:200]}")
 
@@ -420,7 +528,7 @@ class LLMAgentTitle(LLMAgentBase):
 
         if not prompt:
             if self.target_lang:
-                prompt = llm_prompts.LLM_PROMPT_TITLE_TARGET_LANG.format(self.target_lang)
+                prompt = llm_prompts.title_target_lang(self.target_lang)
             else:
                 prompt = llm_prompts.LLM_PROMPT_TITLE
 
@@ -434,7 +542,7 @@ class LLMAgentTitle(LLMAgentBase):
         tokens = self.get_num_tokens(text)
         print(f"[LLMAgentTitle] number of tokens: {tokens}")
 
-        response = self.llmchain.invoke({"content": text})
+        response = self._invoke(text)
         # Clean up the response - remove quotes, extra whitespace
         title = response.strip().strip('"\'')
         return title
@@ -455,20 +563,88 @@ class LLMAgentJournal(LLMAgentBase):
         tokens = self.get_num_tokens(text)
         print(f"[LLMAgentJournal] number of tokens: {tokens}")
 
-        response = self.llmchain.invoke({"content": text})
+        response = self._invoke(text)
         return response
 
 
+def _is_hangul(c):
+    return "\uac00" <= c <= "\ud7a3" or "\u1100" <= c <= "\u11ff" or "\u3130" <= c <= "\u318f"
+
+
+def _is_kana(c):
+    return "\u3040" <= c <= "\u30ff"
+
+
+def _is_cjk(c):
+    return "\u4e00" <= c <= "\u9fff" or _is_kana(c)
+
+
+def _is_cyrillic(c):
+    return "\u0400" <= c <= "\u04ff"
+
+
+def _is_japanese(letters):
+    # Kanji alone is also Chinese, kana is what tells them apart
+    kana = sum(map(_is_kana, letters))
+    return kana / len(letters) > 0.2 and sum(map(_is_cjk, letters)) / len(letters) > 0.5
+
+
+def _is_russian(letters):
+    return sum(map(_is_cyrillic, letters)) / len(letters) > 0.5 \
+        and not any(c in "іїєґІЇЄҐ" for c in letters)
+
+
+def _is_ukrainian(letters):
+    return sum(map(_is_cyrillic, letters)) / len(letters) > 0.5 \
+        and any(c in "іїєґІЇЄҐ" for c in letters) \
+        and not any(c in "ыэъёЫЭЪЁ" for c in letters)
+
+
+# Only the languages whose script alone identifies them, any other target
+# (including English, Latin scripts look alike) always goes to the LLM
+_SCRIPT_CHECKS = {
+    "korean": lambda letters: sum(map(_is_hangul, letters)) / len(letters) > 0.5,
+    "japanese": _is_japanese,
+    "russian": _is_russian,
+    "ukrainian": _is_ukrainian,
+}
+_SCRIPT_CHECKS.update({
+    "ko": _SCRIPT_CHECKS["korean"],
+    "ja": _SCRIPT_CHECKS["japanese"],
+    "ru": _SCRIPT_CHECKS["russian"],
+    "uk": _SCRIPT_CHECKS["ukrainian"],
+})
+
+
+def is_text_in_lang(text: str, lang: str, sample_size=200) -> bool:
+    """
+    Cheap script check on the head of the text, no language model
+
+    @return True only if the script of the text identifies lang, e.g.
+            Hangul for Korean, kana for Japanese
+    """
+    # "ja-JP", "zh_CN": only the language part matters
+    lang = (lang or "").strip().lower().replace("_", "-").split("-")[0]
+    check = _SCRIPT_CHECKS.get(lang)
+    letters = [c for c in text[:sample_size] if c.isalpha()]
+    if check is None or not letters:
+        return False
+
+    return check(letters)
+
+
 class LLMAgentTranslation(LLMAgentBase):
     def __init__(self, api_key="", model_name="gpt-3.5-turbo"):
         super().__init__(api_key, model_name)
+        self.translation_lang = ""
 
     def init_prompt(self, prompt=None, trans_lang=None):
         if not prompt:
             translation_lang = trans_lang or os.getenv("TRANSLATION_LANG")
             print(f"[LLMAgentTranslation] translation language: {translation_lang}")
+            self.translation_lang = translation_lang or ""
 
-            prompt = llm_prompts.LLM_PROMPT_TRANSLATION.format(translation_lang) + "{content}"
+            prompt = llm_prompts.translation_prefix(translation_lang) + "{content}"
             prompt = prompt.strip()
 
         self._init_prompt(prompt)
@@ -477,9 +653,42 @@ class LLMAgentTranslation(LLMAgentBase):
         tokens = self.get_num_tokens(text)
         print(f"[LLMAgentTranslation] number of tokens: {tokens}")
 
-        response = self.llmchain.invoke({"content": text})
+        if is_text_in_lang(text, self.translation_lang):
+            print(f"[LLMAgentTranslation] already in {self.translation_lang}, skip")
+            return text
+
+        response = self._invoke(text)
         return response
 
+    def run_batch(self, texts: list):
+        """
+        Translate several texts concurrently, empty texts are skipped
+        (returned as "") and texts already in the target language are
+        returned as is, to avoid a wasted call
+        """
+        responses = [""] * len(texts)
+        idxs = []
+
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+
+            if is_text_in_lang(text, self.translation_lang):
+                responses[i] = text
+            else:
+                idxs.append(i)
+
+        print(f"[LLMAgentTranslation] batch size: {len(idxs)}/{len(texts)}")
+
+        if not idxs:
+            return responses
+
+        results = self.llmchain.batch([{"content": texts[i]} for i in idxs])
+        for i, res in zip(idxs, results):
+            responses[i] = res
+
+        return responses
+
 
 class LLMAgentGeneric(LLMAgentBase):
     def __init__(self, api_key="", model_name="gpt-3.5-turbo"):
@@ -493,6 +702,47 @@ class LLMAgentGeneric(LLMAgentBase):
         tokens = self.get_num_tokens(text)
         print(f"[LLMAgentGeneric] number of tokens: {tokens}")
 
+        response = self._invoke(text)
+        return response
+
+
+class LLMAgentBundle(LLMAgentBase):
+    """
+    Run several independent prompts over the same content in one
+    concurrent batch, instead of one serial call per prompt
+    """
+    def __init__(self, api_key="", model_name="gpt-3.5-turbo"):
+        super().__init__(api_key, model_name)
+        self.prompts = {}
+
+    def init_prompt(self, prompts=None):
+        self.prompts = prompts or llm_prompts.ARTICLE_BUNDLE_PROMPTS
+        print(f"[LLMAgentBundle] Initialized prompts: {list(self.prompts.keys())}")
+
+    def init_llm(
+        self,
+        provider=None,
+        model_name=None,
+        temperature=0,
+    ):
+        super().init_llm(
+            provider,
+            model_name,
+            temperature,
+            create_default_chain=False)
+
+        self.llmchain = RunnableParallel({
+            name: self._build_prompt(prompt) | self.llm | StrOutputParser()
+            for name, prompt in self.prompts.items()
+        })
+
+    def run(self, text: str):
+        """
+        @return dict(<prompt name, response>)
+        """
+        tokens = self.get_num_tokens(text)
+        print(f"[LLMAgentBundle] number of tokens: {tokens}, prompts: {len(self.prompts)}")
+
         response = self.llmchain.invoke({"content": text})
         return response
 
@@ -1,18 +1,23 @@
 # All LLM prompts put here
+import functools
+import re
+import string
+import sys
+import textwrap
+from typing import List, Optional
+
+import tiktoken
+from pydantic import BaseModel, ValidationError
 
 LLM_PROMPT_CATEGORY_AND_RANKING_TPL = """
 You are a content review expert, you can analyze how many topics in a content, and be able to calculate a quality score of them (range 0 to 1).
 
 I’ll give u a content, and you will output a response with each topic, category and its score, and a overall score of the entire content.
 
-You should only respond in JSON format as described below without any Explanation
-Response format:
-{{
-  \"topics\": [ an array of dicts, each dict has 3 fields \"topic\", \"category\" and \"score\"],
-  \"overall_score\": 0.9
-}}
+Response format (JSON):
+{{"topics": [{{"topic": "...", "category": "...", "score": 0.8}}], "overall_score": 0.9}}
 
-Double check before respond, ensure the response can be parsed by Python json.loads. The content is {content}
+The content is {content}
 """
 
 
@@ -24,62 +29,114 @@ Constraints:
 - Classify the content into relevant topics and corresponding categories based on its content, and give the top 3 most relevant topics along with their categories.
 - Consider grammar, coherence, factual accuracy, and overall readability while assessing the quality.
 - Give higher scores to articles that reflect new trends and developments in global economic and technological macro-level dynamics.
+- Consider the presence of prescient, insightful, in-depth, philosophical expressions, etc. as factors in determining the quality score.
 - Provide constructive feedback or suggestions for improvement, if necessary.
 - Ensure objectivity and impartiality in the evaluation.
 
-Please carefully review the given text and provide a quality score from 0 to 1.
-Additionally, classify the content into relevant categories based on its content.
-Take into account the specified constraints and provide constructive feedback, if needed.
-Consider the presence of prescient, insightful, in-depth, philosophical expressions, etc. as factors in determining the quality score.
-Ensure your evaluation is objective and impartial.
-
-You should only respond in JSON format as described below, and put your feedback into the JSON data as well. Do not write any feedback/note/explanation out of the JSON data.
-Response format:
-{{
-  \"feedback\": "[feedbacks]",
-  \"topics\": [ an array of dicts, each dict has 2 fields \"topic\", \"category\"],
-  \"overall_score\": [Score from 0 to 1]
-}}
-
-Double check before responding, ensure the response can be parsed by Python json.loads and the score calculation is correct.
+Response format (JSON), put your feedback into the JSON data as well:
+{{"feedback": "[feedbacks]", "topics": [{{"topic": "...", "category": "..."}}], "overall_score": [Score from 0 to 1]}}
 
 The user input text: {content}
 """
 
 
-LLM_PROMPT_SUMMARY_COMBINE_PROMPT = """
-Write a concise summary of the following text delimited by triple backquotes.
-Summarize the main points and their comprehensive 
-explanations from below text, presenting them under appropriate headings. 
-Use various Emoji to symbolize different sections, and format the content as a cohesive paragraph under each heading. 
-Ensure the summary is clear, detailed, and informative, reflecting the executive summary style found in news articles. 
-Avoid using phrases that directly reference 'the script provides' to maintain a direct and objective tone.
+# JSON output is enforced by the API rather than by prompt instructions,
+# merged into the request of the category and ranking calls
+CATEGORY_REQUEST_KWARGS = {"response_format": {"type": "json_object"}}
 
 
-```{text}```
-NUMBERED LIST SUMMARY:
-"""
+# Response model of the category and ranking prompts, validated by the
+# pydantic (rust) core instead of json.loads plus manual checks
+class CategoryTopic(BaseModel):
+    topic: str
+    category: str
+    score: Optional[float] = None
 
 
-# With translation (Notes: use with suffix together)
-LLM_PROMPT_SUMMARY_COMBINE_PROMPT2 = """
+class CategoryResponse(BaseModel):
+    feedback: str = ""
+    topics: List[CategoryTopic]
+    overall_score: float
+
+
+def _inline_schema(schema, defs=None):
+    """
+    Resolve the $ref of a pydantic JSON schema and drop the keys outside
+    of the subset the providers accept ($defs, title, default), an
+    optional field (anyOf with null) becomes nullable
+    """
+    if defs is None:
+        defs = schema.get("$defs", {})
+
+    if "$ref" in schema:
+        return _inline_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        if len(options) == 1:
+            inlined = _inline_schema(options[0], defs)
+            if len(options) < len(schema["anyOf"]):
+                inlined["nullable"] = True
+            return inlined
+
+    inlined = {}
+    for key, val in schema.items():
+        if key in ("$defs", "title", "default"):
+            continue
+
+        if key == "properties":
+            val = {name: _inline_schema(prop, defs) for name, prop in val.items()}
+        elif key == "items":
+            val = _inline_schema(val, defs)
+        elif key == "anyOf":
+            val = [_inline_schema(option, defs) for option in val]
+
+        inlined[key] = val
+
+    return inlined
+
+
+# Response schema of CATEGORY_AND_RANKING_TPL2, enforced at decode time
+CATEGORY_AND_RANKING_SCHEMA = _inline_schema(CategoryResponse.model_json_schema())
+
+
+def parse_category_and_ranking(data):
+    """
+    Parse and validate the llm response (str/bytes) in one pass
+
+    @return dict or None if it is not a valid response
+    """
+    if not data:
+        return None
+
+    try:
+        return CategoryResponse.model_validate_json(data).model_dump()
+    except ValidationError as e:
+        print(f"[ERROR]: invalid category and ranking response: {data}, error: {e}")
+        return None
+
+
+######################################################################
+# Shared fragments (interned, so prompts built from them share the
+# exact same prefix bytes)
+######################################################################
+_SUMMARY_INSTRUCTIONS_BLOCK = sys.intern("""
 Write a concise summary of the following text delimited by triple backquotes.
 Summarize the main points and their comprehensive 
 explanations from below text, presenting them under appropriate headings. 
 Use various Emoji to symbolize different sections, and format the content as a cohesive paragraph under each heading. 
 Ensure the summary is clear, detailed, and informative, reflecting the executive summary style found in news articles. 
 Avoid using phrases that directly reference 'the script provides' to maintain a direct and objective tone.
+""")
 
-```{text}```
-"""
-
-LLM_PROMPT_SUMMARY_COMBINE_PROMPT2_SUFFIX = """
+_BILINGUAL_SUFFIX_BLOCK = sys.intern("""
 NUMBERED LIST SUMMARY IN BOTH ENGLISH AND {}, AFTER FINISHING ALL ENGLISH PART, THEN FOLLOW BY {} PART, USE '===' AS THE SEPARATOR:
-"""
+""")
 
-LLM_PROMPT_SUMMARY_COMBINE_PROMPT3 = """
-As an expert analyst, extract and summarize the core ideas and most valuable insights from the following text. Use Markdown formatting.
+_ANALYST_INTRO = sys.intern("""
+As an expert analyst, extract and summarize the core ideas and most valuable insights from the following text.""")
 
+_GUIDELINES_BLOCK = sys.intern("""
 Guidelines:
 - Start with a brief mention of the source/publication if identifiable from the text
 - Extract key innovations, breakthroughs, or novel perspectives
@@ -90,17 +147,25 @@ Guidelines:
 - Explain WHY this article might interest the reader (e.g., emerging trends, investment opportunities, career implications, or industry disruption)
 - Use **bold** for key terms and important points
 - Use separate paragraphs for different sections
+""")
 
+_AVOID_BLOCK = sys.intern("""
 Avoid:
 - Generic descriptions or background information that adds no value
 - Repetitive or redundant points
 - Surface-level observations without depth
+""")
 
+_OUTPUT_FORMAT_BLOCK = sys.intern("""
 Output Format (use Markdown):
 ## [Source: XXX]
+""")
 
+_WHY_READ_BLOCK = sys.intern("""
 **Why Read This:** [Brief explanation]
+""")
 
+_KEY_INSIGHTS_BLOCK = sys.intern("""
 ### Key Insights
 
 1. **[Key Point 1]**: [Explanation]
@@ -108,11 +173,41 @@ Output Format (use Markdown):
 2. **[Key Point 2]**: [Explanation]
 
 ... (3-7 points total, each substantive and insightful)
+""")
 
+_CONTENT_HEADER = sys.intern("""
 Content to analyze:
+""")
+
+# Everything before the first dynamic token is identical across calls and
+# languages; this is the prefix provider-side prompt caching can reuse.
+_ANALYST_STATIC_PREFIX = sys.intern(
+    _ANALYST_INTRO + " Use Markdown formatting.\n"
+    + _GUIDELINES_BLOCK + _AVOID_BLOCK + _OUTPUT_FORMAT_BLOCK
+    + _WHY_READ_BLOCK + _KEY_INSIGHTS_BLOCK
+)
+
+
+# Deprecated: the SUMMARY_COMBINE_PROMPT* constants below are kept for
+# compatibility, use build_summary_prompt() instead
+LLM_PROMPT_SUMMARY_COMBINE_PROMPT = _SUMMARY_INSTRUCTIONS_BLOCK + """
+
 ```{text}```
+NUMBERED LIST SUMMARY:
 """
 
+
+# With translation (Notes: use with suffix together)
+LLM_PROMPT_SUMMARY_COMBINE_PROMPT2 = _SUMMARY_INSTRUCTIONS_BLOCK + """
+```{text}```
+"""
+
+LLM_PROMPT_SUMMARY_COMBINE_PROMPT2_SUFFIX = _BILINGUAL_SUFFIX_BLOCK
+
+LLM_PROMPT_SUMMARY_COMBINE_PROMPT3 = (
+    _ANALYST_STATIC_PREFIX + _CONTENT_HEADER + "```{text}```\n"
+)
+
 LLM_PROMPT_SUMMARY_COMBINE_PROMPT4 = """
 As a professional summarizer, create a concise and comprehensive summary of the provided text, be it an article, post, conversation, or passage, while adhering to these guidelines:
 - Craft a summary that is detailed, thorough, in-depth, and complex, while maintaining clarity and conciseness.
@@ -122,9 +217,7 @@ As a professional summarizer, create a concise and comprehensive summary of the
 {text}
 """
 
-LLM_PROMPT_SUMMARY_COMBINE_PROMPT_SUFFIX = """
-NUMBERED LIST SUMMARY IN BOTH ENGLISH AND {}, AFTER FINISHING ALL ENGLISH PART, THEN FOLLOW BY {} PART, USE '===' AS THE SEPARATOR:
-"""
+LLM_PROMPT_SUMMARY_COMBINE_PROMPT_SUFFIX = _BILINGUAL_SUFFIX_BLOCK
 
 # One-liner summary
 LLM_PROMPT_SUMMARY_ONE_LINER = """
@@ -139,7 +232,8 @@ Your goal is to:
 - Make the journal entry more cohesive, polished, and organized while preserving the essence of the original content.
 """
 
-# In case need a translation
+# In case need a translation, the only language-dependent line, keep it
+# right after the static PREFIX
 LLM_PROMPT_JOURNAL_MIDDLE = """
 - For all the above goals, write one English version, then translate it to {} (including insights, takeaways, and action items), and use === as the delimiter.
 """
@@ -155,47 +249,12 @@ LLM_PROMPT_TRANSLATION = """
 Translate the below content into {}:
 """
 
-# Direct target language summary (no English, no separator)
-LLM_PROMPT_SUMMARY_TARGET_LANG = """
-As an expert analyst, extract and summarize the core ideas and most valuable insights from the following text. Write your summary in {} using Markdown formatting.
-
-Guidelines:
-- Start with a brief mention of the source/publication if identifiable from the text
-- Extract key innovations, breakthroughs, or novel perspectives
-- Highlight implications for global economic trends, technological developments, or scientific progress
-- Include actionable insights or strategic takeaways
-- Cite specific data, statistics, or concrete examples that support the main arguments
-- Note any counterintuitive findings or paradigm-shifting ideas
-- Explain WHY this article might interest the reader (e.g., emerging trends, investment opportunities, career implications, or industry disruption)
-- Use **bold** for key terms and important points
-- Use separate paragraphs for different sections
-
-Avoid:
-- Generic descriptions or background information that adds no value
-- Repetitive or redundant points
-- Surface-level observations without depth
-
-Output Format (use Markdown):
-## [Source: XXX]
-
-**Why Read This:** [Brief explanation in {}]
-
-### Key Insights
-
-1. **[Key Point 1]**: [Explanation]
-
-2. **[Key Point 2]**: [Explanation]
-
-... (3-7 points total, each substantive and insightful)
-
-Content to analyze:
-```{{text}}```
-"""
-
 # Generate title in target language
+# string.Template: substitute $target_lang, {content} is left for the agent
 LLM_PROMPT_TITLE_TARGET_LANG = """
-Generate a concise, SEO-optimized title in {} (at most 15 words) for the following content. Output ONLY the title, nothing else:
-{{content}}
+Generate a concise, SEO-optimized title (at most 15 words) for the following content. Output ONLY the title, nothing else.
+Write the title in $target_lang:
+{content}
 """
 
 LLM_PROMPT_TITLE = """
@@ -237,56 +296,97 @@ Analyze the below content carefully and generate concise 'Summary' without losin
 {content}
 """
 
+# Fused version of TITLE/KEY_INSIGHTS/TAKEAWAYS/ACTION_ITEM/SUMMARY_SIMPLE2,
+# the content is processed once instead of five times
+LLM_PROMPT_ARTICLE_BUNDLE = """
+Analyze the below content carefully and generate the following sections in one pass:
+- title: a concise SEO-optimized 'Title', which is at most eight words
+- key_insights: concise 'Critical Insights'
+- takeaways: concise 'Takeaways'
+- action_items: concise 'Action Items' at most eight words each, as a numbered list. DO NOT generate 'action item' unless necessary, avoid duplicated ones, and use "None" if no action items can be found
+- summary: a concise 'Summary' without losing any numbers, and English numbers need to convert to digital numbers
+
+You should only respond in JSON format as described below, without any explanation or code fences. Each field is a plain text string (use Markdown lists inside the string if needed):
+{{
+  "title": "...",
+  "key_insights": "...",
+  "takeaways": "...",
+  "action_items": "...",
+  "summary": "..."
+}}
+
+The content: {content}
+"""
+
 ######################################################################
 # AUTOGEN
+# Only needed by the autogen/deepdive flows, built on first access via the
+# module __getattr__ below
 ######################################################################
-AUTOGEN_COLLECTOR = """
+# Every role prompt starts with the same bytes, so the preamble can be
+# prefix-cached across the agents of one conversation. Role specific
+# parameters ({topic}) only appear in the role tail.
+_AUTOGEN_SHARED = sys.intern(
+    "You are an agent in a multi-agent blog writing pipeline. "
+    "Roles: Information Collector, Editor, Writer, Reviewer, Publisher.\n\n"
+)
+
+_AUTOGEN_ROLES = (
+    "AUTOGEN_COLLECTOR",
+    "AUTOGEN_EDITOR",
+    "AUTOGEN_WRITER",
+    "AUTOGEN_REVIEWER",
+    "AUTOGEN_PUBLISHER",
+)
+
+_RAW = {
+    "AUTOGEN_COLLECTOR": """
 Information Collector. For the given query, collect as much information as possible. You can get the data from the web search or Arxiv, then scrape the content; After collect all information, add TERMINATE to the end of the report.
-"""
+""",
 
-AUTOGEN_COLLECTOR2 = """
+    "AUTOGEN_COLLECTOR2": """
 Information Collector. For the given query, do a research on that.
 You can search from Internet to get top 3 most relevant articles and search papers from Arxiv, then scrape the content to generate detailed research report with loads of technique details and all reference links attached.
 After collect all information, add TERMINATE to the end of the report.
-"""
+""",
 
-AUTOGEN_EDITOR = """
+    "AUTOGEN_EDITOR": """
 You are a senior Editor.
 - You will define the structure based on the user's query and the provided material, then give it to the Writer to write the article.
 - Make sure have a 'References' section at the bottom.
 - After sending the structure to the writer, then stop replying.
-"""
+""",
 
-AUTOGEN_EDITOR2 = """
+    "AUTOGEN_EDITOR2": """
 You are a senior Editor.
 - You will define the structure based on the user's query, then give it to the Writer to write the article.
 - Make sure have a 'References' section at the bottom.
 - After sending the structure to the writer, then stop replying.
-"""
+""",
 
-# Parameter: {topic}
-AUTOGEN_EDITOR3 = """
+    # Parameter: {topic}
+    "AUTOGEN_EDITOR3": """
 You are a professional Editor.
 - You will define the most relevant structure based on the user query '{}', then give it to the Writer to write the article.
 - Make sure have a 'References' section at the bottom.
 - After sending the structure to the writer, then stop replying.
-"""
+""",
 
-AUTOGEN_WRITER = """
+    "AUTOGEN_WRITER": """
 You are a professional blogger.
 You will write an article with in-depth insights based on the structure provided by the Editor and the material provided.
 According to the feedback from the Checker or Reviewer, reply with the refined article.
-"""
+""",
 
-AUTOGEN_WRITER2 = """
+    "AUTOGEN_WRITER2": """
 You are an essay writer. You will need to do a detailed research the user's query, formulate a thesis statement, and create a persuasive piece of work that is both informative, detailed and engaging.
 - Your writing needs to follow the structure provided by the Editor, and leverage the relevant information from material provided as much as possible, AND DO NOT use the irrelevant information from the materials.
 - Emphasize the importance of statistical evidence, research findings, and concrete examples to support your narrative.
 According to the feedback from the Reviewer and the potential additional information provided, please explain the changes one by one with the reasoning first, then reply with the refined article.
-"""
+""",
 
-# Parameter: {topic}
-AUTOGEN_WRITER3 = """
+    # Parameter: {topic}
+    "AUTOGEN_WRITER3": """
 You are an AI writer tasked with creating a comprehensive article on '{}'.
 The user has provided some initial materials, including key points, relevant data, and specific themes they want addressed in the article.
 Your goal is to leverage this information and the Editor defined structure, generate an informative and engaging article.
@@ -295,62 +395,62 @@ If there are any uncertainties or gaps in the user-provided information, feel fr
 You can ask for diagram/screenshot, just add [screenshot] to where you think there should be one and I will add those later.
 Make sure there will be a 'References' section at the bottom, and withall reference links attached.
 According to the feedback from the Checker or Reviewer, focuing on REVISE the content by the most relevant information provided, DO NOT comment on the feedback, just reply with the latest full refined article.
-"""
+""",
 
-AUTOGEN_WRITER4 = """
+    "AUTOGEN_WRITER4": """
 You are a professional blogger. You will need to do a detailed research the user's query, formulate a thesis statement, and create a persuasive piece of work that is both informative, detailed and engaging.
 Your writing needs to follow the structure provided by the Editor, and leverage the relevant information from the material provided.
 Emphasize the importance of statistical evidence, research findings, and concrete examples and numbers to support your narrative.
 According to the feedback from the Reviewer and the potential additional information provided, please explain the changes one by one with the reasoning first, then reply with the refined article.
-"""
+""",
 
-AUTOGEN_REVIEWER = """
+    "AUTOGEN_REVIEWER": """
 You are a world-class blog content critic, you will review and critique the given article content (not the structure) and provide feedback to the Writer.
 - Critically assess the content, structure, and overall quality of the article.
 - If the content is missing the details, gaps or low-quality, leverage functions to search from Internet or search papers from Arxiv, then scrape to improve it.
 - Reply 'ALL PASSED' if everything looks great. Otherwise, provide the feedback to the writer.
 - After at most 15 rounds of reviewing iterations with the Writer, stop the review, and pass the latest full refined article from the Writer to the Publisher.
-"""
+""",
 
-AUTOGEN_REVIEWER2 = """
+    "AUTOGEN_REVIEWER2": """
 You are a world-class blog content critic, you will review and critique the given article content (not the structure) and provide feedback to the Writer.
 - Critically assess the content, structure, and overall quality of the article.
 - If there are any uncertainties, gaps, or low-quality part in the article, feel free to leverage functions to search from Internet and search papers from Arxiv, then send back to Writer for the further improvement.
 - After at most 15 rounds of reviewing iterations with the Writer, stop the review, and send the latest full refined article to the Publisher.
-"""
+""",
 
-AUTOGEN_REVIEWER3 = """
+    "AUTOGEN_REVIEWER3": """
 You are a world-class blog content critic, you will review and critique the given article content (not the structure) and provide feedback to the Writer.
 Critically assess the content, structure, and overall quality of the article, and offer specific suggestions for improvement and highlight both strengths and weaknesses. Ensure your feedback is detailed and geared towards enhancing the article's clarity, rigor, and impact within the field.
 After 2 rounds of reviewing iterations with the Writer, stop the review, and ask for the latest full refined article from the Writer, then pass it to the Publisher.
-"""
+""",
 
-AUTOGEN_PUBLISHER = """
+    "AUTOGEN_PUBLISHER": """
 Publisher. After reviewer's review, ask for the latest full refined article, then save the article to a file.
-"""
+""",
 
-AUTOGEN_PUBLISHER2 = """
+    "AUTOGEN_PUBLISHER2": """
 Publisher. You will get the article after the Reviewer's review, then save the article to a file.
-"""
+""",
 
-# Parameter: {topic}
-AUTOGEN_DEEPDIVE_COLLECTION = """
+    # Parameter: {topic}
+    "AUTOGEN_DEEPDIVE_COLLECTION": """
 Collect information for the topic: '{}'
-"""
+""",
 
-# Parameter: {topic}, {user-provided materials}
-AUTOGEN_DEEPDIVE_ARTICLE = """
+    # Parameter: {topic}, {user-provided materials}
+    "AUTOGEN_DEEPDIVE_ARTICLE": """
 Write an article for the user's query and the user has provided some initial materials.
 
 User's query: {}
 
 User-Provided Materials:
 {}
-"""
+""",
 
-# AUTOGEN additional iteration prompt
-# Parameter: {topic}, {article}, {user-provided materials}
-AUTOGEN_DEEPDIVE_FOLLOWUP = """
+    # AUTOGEN additional iteration prompt
+    # Parameter: {topic}, {article}, {user-provided materials}
+    "AUTOGEN_DEEPDIVE_FOLLOWUP": """
 Refine the article below based on the user query, and the user has provided the draft and some initial materials, improve the article with more details, examples and numbers to support:
 
 User's query: {}
@@ -359,4 +459,202 @@ User drafted article: {}
 
 User-Provided Materials: {}
 
-"""
+""",
+}
+
+######################################################################
+# Normalize once at import: dedent and collapse runs of blank lines, so
+# no padding tokens are sent on every call
+######################################################################
+def _normalize(tpl):
+    return re.sub(r"\n{3,}", "\n\n", textwrap.dedent(tpl).strip()) + "\n"
+
+
+for _name, _val in list(globals().items()):
+    if _name.startswith("LLM_PROMPT_") and isinstance(_val, str):
+        globals()[_name] = sys.intern(_normalize(_val))
+
+del _name, _val
+
+
+def __getattr__(name):
+    val = _RAW.get(name)
+    if val is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    val = _normalize(val)
+    if name.startswith(_AUTOGEN_ROLES):
+        val = _AUTOGEN_SHARED + val
+
+    val = sys.intern(val)
+    globals()[name] = val
+    return val
+
+
+######################################################################
+# Pre-compiled renderers
+######################################################################
+def split_prompt(tpl, field="content"):
+    """
+    Split a template with exactly one {field} hole into interned
+    (head, tail). Return None if the template has any other placeholders.
+    """
+    parts = list(string.Formatter().parse(tpl))
+    fields = [name for _, name, _, _ in parts if name is not None]
+    if fields != [field]:
+        return None
+
+    head, tail = [], []
+    seen = False
+    for literal, name, _, _ in parts:
+        (tail if seen else head).append(literal)
+        if name is not None:
+            seen = True
+
+    return sys.intern("".join(head)), sys.intern("".join(tail))
+
+
+def compile_prompt(tpl, field="content"):
+    """
+    Pre-split a single-hole template once, so rendering is a plain
+    concatenation instead of a str.format pass
+    """
+    parts = split_prompt(tpl, field)
+    if not parts:
+        return None
+
+    head, tail = parts
+
+    def render(content):
+        return head + content + tail
+
+    return render
+
+
+def compile_plan(tpl):
+    """
+    Parse a multi-placeholder template once into a rendering plan of
+    ("lit", text) / ("var", key) segments, positional {} holes become
+    0, 1, ... Rendering is then a single join, no format parsing
+    """
+    plan = []
+    auto_idx = 0
+
+    for literal, name, _, _ in string.Formatter().parse(tpl):
+        if literal:
+            plan.append(("lit", literal))
+
+        if name is None:
+            continue
+
+        if name == "":
+            name = auto_idx
+            auto_idx += 1
+        elif name.isdigit():
+            name = int(name)
+
+        plan.append(("var", name))
+
+    return tuple(plan)
+
+
+def render_plan(plan, *args, **kwargs):
+    return "".join(
+        val if kind == "lit" else str(args[val] if isinstance(val, int) else kwargs[val])
+        for kind, val in plan)
+
+
+@functools.lru_cache(maxsize=32)
+def _plan(name):
+    # Through the module object, so lazy AUTOGEN constants are resolved
+    return compile_plan(getattr(sys.modules[__name__], name))
+
+
+def render_deepdive_collection(topic):
+    return render_plan(_plan("AUTOGEN_DEEPDIVE_COLLECTION"), topic)
+
+
+def render_deepdive_article(topic, materials):
+    return render_plan(_plan("AUTOGEN_DEEPDIVE_ARTICLE"), topic, materials)
+
+
+def render_deepdive_followup(topic, article, materials):
+    return render_plan(_plan("AUTOGEN_DEEPDIVE_FOLLOWUP"), topic, article, materials)
+
+
+# Independent per-article prompts over the same content, sent as one batch
+ARTICLE_BUNDLE_PROMPTS = {
+    "title": LLM_PROMPT_TITLE,
+    "insights": LLM_PROMPT_KEY_INSIGHTS,
+    "takeaways": LLM_PROMPT_TAKEAWAYS,
+    "todo": LLM_PROMPT_ACTION_ITEM,
+    "summary": LLM_PROMPT_SUMMARY_SIMPLE2,
+}
+
+
+# Per-language renderings, only a handful of languages are ever used
+@functools.lru_cache(maxsize=32)
+def title_target_lang(lang):
+    return sys.intern(string.Template(LLM_PROMPT_TITLE_TARGET_LANG).safe_substitute(target_lang=lang))
+
+
+@functools.lru_cache(maxsize=32)
+def translation_prefix(lang):
+    return sys.intern(LLM_PROMPT_TRANSLATION.format(lang))
+
+
+######################################################################
+# Summary prompt builder, one canonical prompt per flag combination
+######################################################################
+@functools.lru_cache(maxsize=64)
+def build_summary_prompt(style="analyst", target_lang=None, with_why_read=True):
+    """
+    Build the combine prompt ({text} hole) of the summarize chain
+
+    style: analyst | numbered | professional | one_liner
+    target_lang: write the summary in this language, None for English
+    with_why_read: (analyst) include the 'Why Read This' section
+    """
+    if style == "analyst":
+        prompt = (
+            _ANALYST_INTRO + " Use Markdown formatting.\n"
+            + _GUIDELINES_BLOCK + _AVOID_BLOCK + _OUTPUT_FORMAT_BLOCK
+            + (_WHY_READ_BLOCK if with_why_read else "")
+            + _KEY_INSIGHTS_BLOCK
+        )
+
+        if target_lang:
+            including = ", including 'Why Read This'," if with_why_read else ""
+            prompt += f"\nWrite the whole summary{including} in {target_lang}.\n"
+
+        prompt += _CONTENT_HEADER + "```{text}```\n"
+
+    elif style == "numbered":
+        prompt = _SUMMARY_INSTRUCTIONS_BLOCK + "\n```{text}```\n"
+        prompt += _BILINGUAL_SUFFIX_BLOCK.format(target_lang, target_lang) if target_lang else "NUMBERED LIST SUMMARY:\n"
+
+    elif style == "professional":
+        prompt = LLM_PROMPT_SUMMARY_COMBINE_PROMPT4
+        if target_lang:
+            prompt += _BILINGUAL_SUFFIX_BLOCK.format(target_lang, target_lang)
+
+    elif style == "one_liner":
+        prompt = LLM_PROMPT_SUMMARY_ONE_LINER
+        if target_lang:
+            prompt = prompt.replace("one-liner summary", f"one-liner summary in {target_lang}", 1)
+
+    else:
+        raise ValueError(f"Unknown summary prompt style: {style}")
+
+    return sys.intern(_normalize(prompt))
+
+
+######################################################################
+# Token counting, the encoding is loaded once per model
+######################################################################
+@functools.lru_cache(maxsize=8)
+def get_encoding(model_name="gpt-4o"):
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
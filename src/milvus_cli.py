@@ -144,44 +144,94 @@ class MilvusClient:
         result = collection.insert([[emb], [item_id]])
         print(f"[Milvus Client] Inserted data into memory at primary key: {result.primary_keys[0]}:\n data: {text}, item_id: {item_id}")
 
-    def get(
+    def add_batch(
         self,
-        name: str,  # collection name
-        text: str,
-        topk=1,
-        fallback=None,
-        emb=None,
-        distance_metric="",
-        timeout=60,  # timeout (unit second)
+        name: str,    # collection name
+        item_ids: list,
+        embeds: list,
     ):
-        distance_metric = distance_metric or os.getenv("MILVUS_SIMILARITY_METRICS", "L2")
-        collection = None
+        """ Insert several embeddings (and their item ids) in one request
+        """
+        if not item_ids:
+            return
 
+        collection = self.getCollection(name)
+
+        result = collection.insert([embeds, item_ids])
+        print(f"[Milvus Client] Inserted {len(item_ids)} items into memory, primary keys: {result.primary_keys}")
+
+    def _get_search_collection(self, name, fallback=None):
+        """
+        @return the collection to search, or None if neither the
+                collection nor the fallback one is ready
+        """
         try:
-            collection = self.getCollection(name)
+            return self.getCollection(name)
 
         except exceptions.SchemaNotReadyException as e:
             print(f"[ERROR] Schema {name} is not ready yet: {e}")
 
             if fallback:
                 print(f"Using fallback collection: {fallback}")
-                return self.get(fallback, text, topk=topk, emb=emb)
+                return self._get_search_collection(fallback)
             else:
-                return []
+                return None
 
         except Exception as e:
             print(f"[ERROR] Failed to get collection: {e}")
+            return None
+
+    def get(
+        self,
+        name: str,  # collection name
+        text: str,
+        topk=1,
+        fallback=None,
+        emb=None,
+        distance_metric="",
+        timeout=60,  # timeout (unit second)
+    ):
+        collection = self._get_search_collection(name, fallback=fallback)
+        if collection is None:
+            return []
+
+        emb = emb or self.emb_agent.create(text)
+
+        return self._search(collection, [emb], topk, distance_metric, timeout)[0]
+
+    def get_batch(
+        self,
+        name: str,  # collection name
+        embs: list,
+        topk=1,
+        fallback=None,
+        distance_metric="",
+        timeout=60,  # timeout (unit second)
+    ):
+        """
+        Search all the embeddings in one request
+
+        @return [[{item_id, distance}, ...], ...], one list per embedding
+        """
+        if not embs:
             return []
 
+        collection = self._get_search_collection(name, fallback=fallback)
+        if collection is None:
+            return [[] for _ in embs]
+
+        return self._search(collection, embs, topk, distance_metric, timeout)
+
+    def _search(self, collection, embs: list, topk, distance_metric, timeout):
+        distance_metric = distance_metric or os.getenv("MILVUS_SIMILARITY_METRICS", "L2")
+
         search_params = {
             "metric_type": distance_metric,
             "params": {"nprobe": 8},
         }
 
-        emb = emb or self.emb_agent.create(text)
-
         result = collection.search(
-            [emb],
+            embs,
             "embeddings",
             search_params,
             topk,
@@ -191,10 +241,10 @@ class MilvusClient:
 
         print(f"[Milvus Client] get relevant results: {result}")
 
-        return [{
+        return [[{
             "item_id": hit.entity.get("item_id"),
             "distance": hit.distance
-        } for hit in result[0]]
+        } for hit in hits] for hits in result]
 
     def exist(self, name):
         return utility.has_collection(name)
@@ -2,8 +2,11 @@ import os
 import re
 import time
 import html
+import threading
 import traceback
+from collections import deque
 
+import httpx
 from notion_client import Client
 import llm_const
 
@@ -174,6 +177,70 @@ def markdown_to_notion_blocks(markdown_text):
     return blocks
 
 
+class NotionRateLimiter:
+    """
+    Sliding window limiter, at most `rate` requests per `period` seconds.
+    Callers only sleep when the window is full, instead of a fixed wait
+    after every query.
+    """
+    def __init__(self, rate=3, period=1.0):
+        self.rate = rate
+        self.period = period
+        self.stamps = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.stamps and now - self.stamps[0] >= self.period:
+                    self.stamps.popleft()
+
+                if len(self.stamps) < self.rate:
+                    self.stamps.append(now)
+                    return
+
+                wait_secs = self.period - (now - self.stamps[0])
+
+            time.sleep(wait_secs)
+
+
+# Notion allows an average of 3 requests per second per integration,
+# shared by all the agents in the process
+_rate_limiter = NotionRateLimiter(int(os.getenv("NOTION_API_RATE_LIMIT", 3)))
+
+
+class NotionRetryTransport(httpx.HTTPTransport):
+    """
+    Every request (and retry) takes a slot from the shared limiter.
+    Rate limited (429) requests are retried after Retry-After, and so
+    are transient gateway errors for GETs, instead of failing the call
+    """
+    def __init__(self, max_retries=3, **kwargs):
+        super().__init__(**kwargs)
+        self.max_retries = max_retries
+
+    def handle_request(self, request):
+        for attempt in range(self.max_retries + 1):
+            _rate_limiter.acquire()
+            response = super().handle_request(request)
+
+            retryable = response.status_code == 429 or (
+                request.method == "GET" and response.status_code in (502, 503, 504))
+
+            if not retryable or attempt == self.max_retries:
+                return response
+
+            try:
+                wait_secs = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                wait_secs = 2 ** attempt
+
+            response.close()
+            print(f"[NotionAgent] Got {response.status_code} for {request.method} {request.url.path}, retry in {wait_secs}s ({attempt + 1}/{self.max_retries})")
+            time.sleep(wait_secs)
+
+
 class NotionAgent:
     """
     A notion agent to operate page/database
@@ -185,7 +252,9 @@ class NotionAgent:
         self.databases = {}  # <source, {database_id}>
 
     def _init_client(self, api_key):
-        return Client(auth=api_key)
+        http_client = httpx.Client(transport=NotionRetryTransport())
+
+        return Client(auth=api_key, client=http_client)
 
     def addDatabase(self, source_name, database_id):
         self.databases[source_name] = {
@@ -401,21 +470,31 @@ class NotionAgent:
             "properties": page["properties"],
         }
 
-    def concatBlocksText(self, blocks, separator=''):
+    def concatBlocksText(self, blocks, separator='', max_length=0):
         """
         blocks: Converted internal blocks dict (not notion block
                 object). format: <block_id, block_data>
+        max_length: if > 0, stop collecting blocks once the text
+                    reaches it (the last block is kept whole)
 
         """
-        content = ""
+        if max_length <= 0:
+            return "".join(
+                block_data["text"] + separator
+                for block_data in blocks.values())
 
-        for block_id, block_data in blocks.items():
-            text = block_data["text"]
+        parts = []
+        total = 0
 
-            content += text
-            content += separator
+        for block_data in blocks.values():
+            part = block_data["text"] + separator
+            parts.append(part)
+            total += len(part)
 
-        return content
+            if total >= max_length:
+                break
+
+        return "".join(parts)
 
     def extractPage(
             self,
@@ -823,11 +902,33 @@ class NotionAgent:
     def queryDatabaseToRead(
         self,
         database_id,
-        source: str,
+        source,
         last_edited_time=None,
         extraction_interval=0,
         require_user_rating=True,
     ):
+        """
+        source: a source name, or a list of source names to pull them
+                all with one compound `or` query
+
+        """
+        if isinstance(source, (list, tuple)):
+            source_filter = {
+                "or": [{
+                    "property": "Source",
+                    "select": {
+                        "equals": s,
+                    }
+                } for s in source]
+            }
+        else:
+            source_filter = {
+                "property": "Source",
+                "select": {
+                    "equals": source,
+                }
+            }
+
         query_data = {
             "database_id": database_id,
             "sorts": [
@@ -839,12 +940,7 @@ class NotionAgent:
 
             "filter": {
                 "and": [
-                    {
-                        "property": "Source",
-                        "select": {
-                            "equals": source,
-                        }
-                    },
+                    source_filter,
                 ]
             }
         }
@@ -866,7 +962,17 @@ class NotionAgent:
                 }
             })
 
-        pages = self.api.databases.query(**query_data).get("results")
+        # Several sources share one query, so follow the cursor in case
+        # there are more results than one response holds
+        pages = []
+        while True:
+            res = self.api.databases.query(**query_data)
+            pages.extend(res.get("results"))
+
+            if not res.get("has_more"):
+                break
+
+            query_data["start_cursor"] = res["next_cursor"]
 
         extracted_pages = {}
         for page in pages:
@@ -876,6 +982,7 @@ class NotionAgent:
             props, blocks = self.extractPage(page_id)
 
             rating_prop = page["properties"]["User Rating"]["select"]
+            source_prop = page["properties"]["Source"]["select"]
 
             extracted_pages[page_id] = {
                 "id": page_id,
@@ -890,7 +997,7 @@ class NotionAgent:
 
                 # extract user rating (frequent used field)
                 "user_rating": rating_prop["name"] if rating_prop else None,
-                "source": source,
+                "source": source_prop["name"] if source_prop else source,
                 "tags": self.extractMultiSelect(page["properties"]["Tags"]),
 
                 "properties": props,
@@ -2258,10 +2365,23 @@ class NotionAgent:
         return self.createPage(parent, props, [])
 
     def createPage(self, parent, props, blocks):
+        """
+        Create a page, Notion accepts at most 100 children per request,
+        so the first batch goes with the page and the rest are appended
+        in batches afterwards. Appends stay sequential, concurrent ones
+        would land in arbitrary order.
+        """
+        batch_size = 100
+
         new_page = self.api.pages.create(
             parent=parent,
             properties=props,
-            children=blocks)
+            children=blocks[:batch_size])
+
+        for start in range(batch_size, len(blocks), batch_size):
+            self.api.blocks.children.append(
+                block_id=new_page["id"],
+                children=blocks[start:start + batch_size])
 
         return new_page
 
@@ -1,5 +1,4 @@
 import os
-import time
 from datetime import datetime, timedelta
 
 import utils
@@ -14,6 +13,16 @@ class OperatorBase:
     Operator Base class
     """
 
+    # Created on first use, then reused by the later stages (and
+    # repeated runs) of this operator
+    _db = None
+
+    def _get_db(self):
+        if self._db is None:
+            self._db = DBClient()
+
+        return self._db
+
     def pull(self):
         return None
 
@@ -211,6 +220,20 @@ class OperatorBase:
         client = db_client or DBClient()
         client.set_notion_toread_item_id(source, list_name, item_id)
 
+    def markVisitedBatch(
+        self,
+        items: list,
+        source="Article",
+        db_client=None
+    ):
+        """
+        Mark several notion toRead items as visited in one round-trip
+
+        items: [(list_name, item_id), ...]
+        """
+        client = db_client or DBClient()
+        return client.set_notion_toread_item_ids(source, items)
+
     def updateCreatedTime(
         self,
         last_created_time: str,
@@ -356,11 +379,6 @@ class OperatorBase:
                 print(f"Pulled {len(pages)} pages for source: {source}")
                 page_list.update(pages)
 
-                # Wait a moment to mitigate rate limiting
-                wait_for_secs = 5
-                print(f"Wait for a moment: {wait_for_secs}s")
-                time.sleep(wait_for_secs)
-
         print(f"Pulled total {len(page_list)} items")
         return page_list
 
@@ -415,10 +433,5 @@ class OperatorBase:
 
                 page_list.update(pages)
 
-                # Wait a moment to mitigate rate limiting
-                wait_for_secs = 5
-                print(f"Wait for a moment: {wait_for_secs}s")
-                time.sleep(wait_for_secs)
-
         print(f"Pulled total {len(page_list)} items")
         return page_list
@@ -1,7 +1,7 @@
 import os
-import copy
-import time
 import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 
 import utils
@@ -65,28 +65,30 @@ class OperatorCollection(OperatorBase):
 
         page_list = {}
 
-        for db_page in db_pages:
-            database_id = db_page["database_id"]
-            print(f"Pulling from database_id: {database_id}...")
-
-            for source in sources:
-                print(f"Querying source: {source} ...")
-                # The api will return the pages and sort by "created time" asc
-                # format dict(<page_id, page>)
-                pages = notion_agent.queryDatabaseToRead(
-                    database_id,
-                    source,
-                    last_edited_time=start_time.isoformat(),
-                    extraction_interval=0.1)
-
+        def _pull_one(database_id):
+            print(f"Pulling from database_id: {database_id}, sources: {sources} ...")
+            # One compound query for all sources, the api will return
+            # the pages and sort by "last edited time" asc
+            # format dict(<page_id, page>)
+            return notion_agent.queryDatabaseToRead(
+                database_id,
+                sources,
+                last_edited_time=start_time.isoformat(),
+                extraction_interval=0.1)
+
+        # Query the databases concurrently, the bounded number of workers
+        # keeps us within the Notion rate limit
+        concurrency = int(os.getenv("NOTION_PULL_CONCURRENCY", 3))
+        database_ids = [db_page["database_id"] for db_page in db_pages]
+        print(f"Querying {len(database_ids)} databases, concurrency: {concurrency}")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # map keeps the task order, so later databases still win on merge
+            for pages in executor.map(_pull_one, database_ids):
                 page_list.update(pages)
 
-                # Wait a moment to mitigate rate limiting
-                wait_for_secs = 5
-                print(f"Wait for a moment: {wait_for_secs}s")
-                time.sleep(wait_for_secs)
-
-        print(f"Pulled total {len(page_list)} items")
+        source_counts = Counter(page["source"] for page in page_list.values())
+        print(f"Pulled total {len(page_list)} items, per source: {dict(source_counts)}")
         return page_list
 
     def pre_filter(self, pages, **kwargs):
@@ -99,39 +101,34 @@ class OperatorCollection(OperatorBase):
         min_score = kwargs.setdefault("min_score", 4)
         print(f"input size: {len(pages)}, min_score: {min_score}")
 
-        notion_api_key = os.getenv("NOTION_TOKEN")
-        notion_agent = NotionAgent(notion_api_key)
-
-        # 1. filter all score >= min_score or contains take aways msg
-        filtered1 = []
-        for page_id, page in pages.items():
-            print(f"page: {page}")
-            user_rating = page["user_rating"]
+        # Every rated page passes, no need to look at ratings or take aways
+        if not pages or float(min_score) <= 0:
+            print(f"Filter output size: {len(pages)}")
+            return list(pages.values())
 
-            take_aways = notion_agent.extractRichText(
-                page["properties"]["properties"]["Take Aways"]["rich_text"])
+        # Dumping every page is only for debugging, and buffered so it
+        # is one write instead of one per page
+        if utils.str2bool(os.getenv("COLLECTION_VERBOSE", "False")):
+            print("\n".join(f"page: {page}" for page in pages.values()))
 
-            if user_rating >= min_score or take_aways:
-                filtered1.append(page)
+        # 1. filter all score >= min_score or contains take aways msg,
+        # take aways are only checked if the rating is not enough
+        filtered1 = [
+            page for page in pages.values()
+            if page["user_rating"] >= min_score or self._has_take_aways(page)
+        ]
 
         print(f"Filter output size: {len(filtered1)}")
         return filtered1
 
-    def get_takeaway_pages(self, pages, **kwargs):
-        notion_api_key = os.getenv("NOTION_TOKEN")
-        notion_agent = NotionAgent(notion_api_key)
-        takeaway_pages = []
-
-        for page in pages:
-            take_aways = notion_agent.extractRichText(
-                page["properties"]["properties"]["Take Aways"]["rich_text"])
+    def _has_take_aways(self, page):
+        # Same as a non-empty NotionAgent.extractRichText(), without
+        # building the string
+        rich_text = page["properties"]["properties"]["Take Aways"]["rich_text"]
+        return any(x["plain_text"] for x in rich_text)
 
-            if not take_aways:
-                continue
-
-            takeaway_pages.append(page)
-
-        return takeaway_pages
+    def get_takeaway_pages(self, pages, **kwargs):
+        return [page for page in pages if self._has_take_aways(page)]
 
     def post_filter(self, pages, **kwargs):
         """
@@ -145,14 +142,14 @@ class OperatorCollection(OperatorBase):
         print(f"k: {k}, input size: {len(pages)}, min_score: {min_score}")
 
         # 1. filter all score >= min_score
-        print("Filtering...===========================================")
+        log_lines = ["Filtering...==========================================="]
         filtered1 = []
         for page in pages:
             # Formula to calcualte the soring score
             score = float(page["user_rating"]) * 0.8 + float(page["__relevant_score"]) * 0.2
             page["__sorting_score"] = score
 
-            print(f"- Page_source: {page['source']}, score: {score}, min_score: {min_score}, user_rating: {page['user_rating']}, relevant_score: {page['__relevant_score']:.3f}, page_title: {page.get('name') or ''}")
+            log_lines.append(f"- Page_source: {page['source']}, score: {score}, min_score: {min_score}, user_rating: {page['user_rating']}, relevant_score: {page['__relevant_score']:.3f}, page_title: {page.get('name') or ''}")
 
             if score >= min_score:
                 filtered1.append(page)
@@ -160,12 +157,14 @@ class OperatorCollection(OperatorBase):
         # 2. get top k
         tops = sorted(filtered1, key=lambda page: page["__relevant_score"], reverse=True)
 
-        print("After sorting =========================================")
+        log_lines.append("After sorting =========================================")
         seq = 0
 
         for t in tops:
             seq += 1
-            print(f"{seq}: Page_source: {t['source']}, score: {t['__sorting_score']:.3f}, user_rating: {t['user_rating']}, relevant_score: {t['__relevant_score']:.3f}, min_score: {min_score}, page_title: {t.get('name') or ''}")
+            log_lines.append(f"{seq}: Page_source: {t['source']}, score: {t['__sorting_score']:.3f}, user_rating: {t['user_rating']}, relevant_score: {t['__relevant_score']:.3f}, min_score: {min_score}, page_title: {t.get('name') or ''}")
+
+        print("\n".join(log_lines))
 
         filtered2 = []
         for i in range(min(k, len(tops))):
@@ -190,6 +189,7 @@ class OperatorCollection(OperatorBase):
         notion_agent = NotionAgent(notion_api_key)
 
         scored_list = []
+        embedding_max_length = int(os.getenv("EMBEDDING_MAX_LENGTH", 5000))
 
         for page in data:
             try:
@@ -197,9 +197,11 @@ class OperatorCollection(OperatorBase):
                 title = page.get("name") or ""
                 source = page["source"]
 
+                # The embedding only looks at the first
+                # EMBEDDING_MAX_LENGTH chars, skip the rest of the blocks
                 page_text = notion_agent.concatBlocksText(
-                    page["blocks"], separator="\n")
-                # score_text = score_text[:2048]
+                    page["blocks"], separator="\n",
+                    max_length=embedding_max_length)
 
                 take_aways = notion_agent.extractRichText(
                     page["properties"]["properties"]["Take Aways"]["rich_text"])
@@ -220,7 +222,9 @@ class OperatorCollection(OperatorBase):
 
                 page_score = op_milvus.score(scoring_metadata)
 
-                scored_page = copy.deepcopy(page)
+                # Only top-level keys are added, a shallow copy is enough
+                # and skips copying all the page blocks
+                scored_page = dict(page)
                 scored_page["__relevant_score"] = page_score
 
                 scored_list.append(scored_page)
@@ -284,7 +288,7 @@ class OperatorCollection(OperatorBase):
                         title = page["name"]
                         source = page["source"]
 
-                        pushing_page = copy.deepcopy(page)
+                        pushing_page = dict(page)
                         pushing_page["list_name"] = source
                         pushing_page["source"] = collection_source_type
 
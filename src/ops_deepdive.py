@@ -104,7 +104,7 @@ class OperatorDeepDive(OperatorBase):
                     agent_autogen = LLMAgentAutoGen()
 
                     # query = f"For the topic \'{takeaways}\', search from Internet to get top 3 articles and search papers from Arxiv, scrape the content, then return the aggregated results with reference link attached."
-                    query = llm_prompts.AUTOGEN_DEEPDIVE_COLLECTION.format(takeaways)
+                    query = llm_prompts.render_deepdive_collection(takeaways)
 
                     print(f"Deep dive data collection query: {query}")
 
@@ -204,6 +204,10 @@ class OperatorDeepDive(OperatorBase):
         tot = 0
         err = 0
 
+        iter_max_cnt = int(os.getenv("ACTION_DEEPDIVE_ITERATIONS", 3))
+        translation_lang = os.getenv("TRANSLATION_LANG")
+        print(f"Iteration max count: {iter_max_cnt}, translation language: {translation_lang}")
+
         for page in extracted_pages:
             tot += 1
             print(f"======= [Generating DeepDive] page id: {page['id']}, title: {page['title']}")
@@ -221,9 +225,6 @@ class OperatorDeepDive(OperatorBase):
 
             # Start deepdive iterations
             try:
-                iter_max_cnt = int(os.getenv("ACTION_DEEPDIVE_ITERATIONS", 3))
-                print(f"Iteration max count: {iter_max_cnt}")
-
                 dd_page = copy.deepcopy(page)
 
                 latest_deepdive_content = ""
@@ -237,11 +238,11 @@ class OperatorDeepDive(OperatorBase):
                     query = ""
 
                     if iter_cnt == 0:
-                        query = llm_prompts.AUTOGEN_DEEPDIVE_ARTICLE.format(
+                        query = llm_prompts.render_deepdive_article(
                             content, collected_data)
 
                     else:
-                        query = llm_prompts.AUTOGEN_DEEPDIVE_FOLLOWUP.format(
+                        query = llm_prompts.render_deepdive_followup(
                             content,
                             latest_deepdive_content,
                             latest_collection_content)
@@ -261,7 +262,7 @@ class OperatorDeepDive(OperatorBase):
                     latest_collection_content = dd_page["__deepdive_collection_updated"]
 
                 # After all iterations, do translation if needed
-                if os.getenv("TRANSLATION_LANG"):
+                if translation_lang:
                     llm_translation_response = llm_agent_trans.run(dd_page["__deepdive"])
                     print(f"LLM: Translation response: {llm_translation_response}")
                     dd_page["__translation_deepdive"] = llm_translation_response
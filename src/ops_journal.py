@@ -1,5 +1,4 @@
 import os
-import time
 from datetime import date, datetime, timedelta
 
 import utils
@@ -12,6 +11,7 @@ from llm_agent import (
     LLMAgentJournal,
     LLMAgentTranslation,
     LLMAgentGeneric,
+    LLMAgentBundle,
 )
 
 
@@ -84,11 +84,6 @@ class OperatorJournal(OperatorBase):
 
                 page_list.update(pages)
 
-                # Wait a moment to mitigate rate limiting
-                wait_for_secs = 5
-                print(f"Wait for a moment: {wait_for_secs}s")
-                time.sleep(wait_for_secs)
-
         print(f"Pulled total {len(page_list)} items")
         return page_list
 
@@ -105,12 +100,16 @@ class OperatorJournal(OperatorBase):
         llm_agent.init_prompt()
         llm_agent.init_llm()
 
-        content = ""
+        # Collect the parts and join once, instead of re-copying the
+        # growing string for every page
+        parts = []
         last_created_time = ""
         for page_id, page in pages.items():
-            content += f"{page['title']} {page['content']}" + "\n"
+            parts.append(f"{page['title']} {page['content']}\n")
             last_created_time = page["created_time"]
 
+        content = "".join(parts)
+
         print(f"Journal input content: [{content}]")
 
         if not content:
@@ -128,44 +127,20 @@ class OperatorJournal(OperatorBase):
         llm_response = llm_agent.run(content)
         print(f"Refine content llm response: {llm_response}")
 
-        # Generate title
-        llm_agent_title = LLMAgentGeneric()
-        llm_agent_title.init_prompt(llm_prompts.LLM_PROMPT_TITLE)
-        llm_agent_title.init_llm()
-
-        title = llm_agent_title.run(llm_response)
-        print(f"Journal Title: {title}")
+        # Generate title, insights, takeaways, action items and summary
+        # in one fused call
+        bundle = self._generate_sections(llm_response)
 
-        # Generate insights
-        llm_agent_insights = LLMAgentGeneric()
-        llm_agent_insights.init_prompt(llm_prompts.LLM_PROMPT_KEY_INSIGHTS)
-        llm_agent_insights.init_llm()
+        title = bundle["title"]
+        insights = bundle["insights"]
+        takeaways = bundle["takeaways"]
+        todo_list = bundle["todo"]
+        summary = bundle["summary"]
 
-        insights = llm_agent_insights.run(llm_response)
+        print(f"Journal Title: {title}")
         print(f"Journal insights: {insights}")
-
-        # Generate takeaways
-        llm_agent_takeaways = LLMAgentGeneric()
-        llm_agent_takeaways.init_prompt(llm_prompts.LLM_PROMPT_TAKEAWAYS)
-        llm_agent_takeaways.init_llm()
-
-        takeaways = llm_agent_takeaways.run(llm_response)
         print(f"Journal takeaways: {takeaways}")
-
-        # Generate action items
-        llm_agent_todo = LLMAgentGeneric()
-        llm_agent_todo.init_prompt(llm_prompts.LLM_PROMPT_ACTION_ITEM)
-        llm_agent_todo.init_llm()
-
-        todo_list = llm_agent_todo.run(llm_response)
         print(f"Journal TODO list: {todo_list}")
-
-        # Generate action items
-        llm_agent_summary = LLMAgentGeneric()
-        llm_agent_summary.init_prompt(llm_prompts.LLM_PROMPT_SUMMARY_SIMPLE2)
-        llm_agent_summary.init_llm()
-
-        summary = llm_agent_summary.run(llm_response)
         print(f"Journal summary: {summary}")
 
         # Combine all sections together
@@ -181,10 +156,11 @@ class OperatorJournal(OperatorBase):
         llm_agent_trans.init_prompt()
         llm_agent_trans.init_llm()
 
-        llm_translation_response = llm_agent_trans.run(full_content)
-        print(f"Translation llm response: {llm_translation_response}")
+        # Both translations are independent, run them concurrently
+        llm_translation_response, llm_translation_response_todo = \
+            llm_agent_trans.run_batch([full_content, todo_list])
 
-        llm_translation_response_todo = llm_agent_trans.run(todo_list)
+        print(f"Translation llm response: {llm_translation_response}")
         print(f"Translation llm response (todo): {llm_translation_response_todo}")
 
         journal_pages = []
@@ -204,6 +180,39 @@ class OperatorJournal(OperatorBase):
         print(f"journal pages: {journal_pages}")
         return journal_pages
 
+    def _generate_sections(self, content):
+        """
+        One fused LLM call for all sections, fallback to the concurrent
+        per-section batch if the response cannot be parsed
+
+        @return dict with title, insights, takeaways, todo, summary
+        """
+        llm_agent = LLMAgentGeneric()
+        llm_agent.init_prompt(llm_prompts.LLM_PROMPT_ARTICLE_BUNDLE)
+        llm_agent.init_llm()
+
+        llm_response = llm_agent.run(content)
+        res = utils.fix_and_parse_json(llm_response) or {}
+
+        fields = {
+            "title": "title",
+            "insights": "key_insights",
+            "takeaways": "takeaways",
+            "todo": "action_items",
+            "summary": "summary",
+        }
+
+        if isinstance(res, dict) and all(isinstance(res.get(v), str) for v in fields.values()):
+            return {k: res[v] for k, v in fields.items()}
+
+        print("[WARN] Cannot parse fused sections response, fallback to per-section batch")
+
+        llm_agent_bundle = LLMAgentBundle()
+        llm_agent_bundle.init_prompt()
+        llm_agent_bundle.init_llm()
+
+        return llm_agent_bundle.run(content)
+
     def push(self, pages, targets, **kwargs):
         print("#####################################################")
         print("# Push Journal Pages")
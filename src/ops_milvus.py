@@ -161,6 +161,49 @@ class OperatorMilvus:
             collection_name, text, topk=topk,
             fallback=fallback, emb=embedding)
 
+        return self._get_relevant_page_metas(response_arr, topk, max_distance, client)
+
+    def get_relevant_batch(
+        self,
+        start_date,
+        texts: list,
+        topk: int = 2,
+        max_distance: float = 0.45,
+        db_client=None,
+        fallback=None
+    ):
+        """
+        Same as get_relevant, but for a list of texts: the embedding
+        agent and milvus client are created once, and all the
+        embeddings are searched in one request
+
+        @return [relevant page metas, ...], one list per text
+        """
+        emb_agent = EmbeddingAgent()
+
+        collection_name = emb_agent.getname(start_date)
+        print(f"[get_relevant_batch] collection_name: {collection_name}, texts: {len(texts)}")
+
+        client = db_client or DBClient()
+        milvus_client = MilvusClient(emb_agent=emb_agent)
+
+        if not fallback:
+            yesterday = (date.fromisoformat(start_date) - timedelta(days=1)).isoformat()
+            fallback = emb_agent.getname(yesterday)
+
+        embeddings = self._get_or_create_embeddings(emb_agent, texts, client)
+
+        responses = milvus_client.get_batch(
+            collection_name, embeddings, topk=topk, fallback=fallback)
+
+        return [self._get_relevant_page_metas(response_arr, topk, max_distance, client)
+                for response_arr in responses]
+
+    def _get_relevant_page_metas(self, response_arr, topk, max_distance, client):
+        """
+        Filter the raw search response, and load the page metadata of
+        the valid ones
+        """
         # filter by distance (similiarity value) according to the
         # metrics type
         metric_type = os.getenv("MILVUS_SIMILARITY_METRICS", "L2")
@@ -190,6 +233,86 @@ class OperatorMilvus:
 
         return res
 
+    def getIdsByContentBatch(
+        self,
+        texts: list,
+        start_date="",
+        threshold=None,
+        db_client=None
+    ):
+        """
+        Look up (near) identical items of the texts in the collection of
+        start_date, all the texts are searched in one request
+
+        @param threshold - similarity threshold of a duplicate, passed
+               to emb_utils.similarity_topk (default: 0.1 for L2,
+               0.95 for IP/COSINE)
+
+        @return [item_id or None, ...], one per text
+        """
+        if not texts:
+            return []
+
+        start_date = start_date or date.today().isoformat()
+        metric_type = os.getenv("MILVUS_SIMILARITY_METRICS", "L2")
+        if threshold is None:
+            threshold = 0.1 if metric_type == "L2" else 0.95
+
+        emb_agent = EmbeddingAgent()
+        collection_name = emb_agent.getname(start_date)
+
+        client = db_client or DBClient()
+        milvus_client = MilvusClient(emb_agent=emb_agent)
+
+        embeddings = self._get_or_create_embeddings(emb_agent, texts, client)
+        responses = milvus_client.get_batch(collection_name, embeddings, topk=1)
+
+        item_ids = []
+        for response_arr in responses:
+            valid_embs = emb_utils.similarity_topk(response_arr, metric_type, threshold, 1)
+            item_ids.append(valid_embs[0]["item_id"] if valid_embs else None)
+
+        return item_ids
+
+    def addItemsBatch(self, texts: list, start_date="", db_client=None):
+        """
+        Insert the texts (item_id: md5 of the text) into the collection
+        of start_date in one request, the collection is created if needed
+        """
+        if not texts:
+            return
+
+        start_date = start_date or date.today().isoformat()
+
+        emb_agent = EmbeddingAgent()
+        collection_name = emb_agent.getname(start_date)
+
+        client = db_client or DBClient()
+        milvus_client = MilvusClient(emb_agent=emb_agent)
+
+        if not milvus_client.exist(collection_name):
+            milvus_client.createCollection(
+                collection_name,
+                desc=f"Collection end by {start_date}, dim: {emb_agent.dim()}",
+                dim=emb_agent.dim())
+
+            print(f"[INFO] No collection {collection_name} found, created a new one")
+
+        embeddings = self._get_or_create_embeddings(emb_agent, texts, client)
+        item_ids = [utils.hashcode_md5(text.encode('utf-8')) for text in texts]
+
+        milvus_client.add_batch(collection_name, item_ids, embeddings)
+
+    def _get_or_create_embeddings(self, emb_agent, texts: list, client):
+        key_ttl = 86400 * 30  # 30 days
+
+        return [emb_agent.get_or_create(
+            text,
+            source="default",
+            page_id=utils.hashcode_md5(text.encode('utf-8')),
+            db_client=client,
+            key_ttl=key_ttl) for text in texts]
+
     def score(self, relevant_page_metas: list):
         """
         K-Mean score
@@ -1,6 +1,8 @@
 import os
+
 from notion import NotionAgent
 from mysql_cli import MySQLClient
+import utils
 
 
 class OperatorNotion:
@@ -231,6 +233,9 @@ class OperatorNotion:
         """
         Get database id of index - toread
         """
+        if cached := utils.get_notion_index_cache(("toread_dbid", "notion")):
+            return cached
+
         db_cli = MySQLClient()
         indexes = db_cli.index_pages_table_load()
         print(f"loaded indexes: {indexes}")
@@ -239,7 +244,9 @@ class OperatorNotion:
             if category != "notion":
                 continue
 
-            return metadata["index_toread_db_id"]["index_id"]
+            db_index_id = metadata["index_toread_db_id"]["index_id"]
+            utils.set_notion_index_cache(("toread_dbid", "notion"), db_index_id)
+            return db_index_id
 
         print("[WARN] Cannot find database id for index - toread")
         return ""
@@ -404,6 +404,7 @@ class OperatorReddit(OperatorBase):
         client = DBClient()
         redis_key_expire_time = os.getenv(
             "BOT_REDIS_KEY_EXPIRE_TIME", 604800)
+        openai_fallback = os.getenv("LLM_PROVIDER", "") != "openai"
 
         summarized_pages = {}
 
@@ -449,7 +450,7 @@ class OperatorReddit(OperatorBase):
                     except Exception as e:
                         print(f"[ERROR] Exception from llm_agent.run(): {e}")
 
-                    if not summary and os.getenv("LLM_PROVIDER", "") != "openai":
+                    if not summary and openai_fallback:
                         try:
                             print("Fallback to OpenAI")
                             fallback_agent = LLMAgentSummary()
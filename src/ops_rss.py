@@ -1,10 +1,15 @@
+import io
 import os
 import time
-import copy
+import json
+import heapq
+import itertools
+import threading
 import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from operator import itemgetter
-from datetime import date, datetime
-from time import mktime
+from datetime import date
 
 from notion import NotionAgent
 from llm_agent import (
@@ -13,15 +18,80 @@ from llm_agent import (
     LLMAgentTitle,
 )
 import utils
+import llm_prompts
 try:
     from ops_web_base import WebCollectorBase
 except ImportError:
     from ops_base import OperatorBase as WebCollectorBase
-from db_cli import DBClient
 from ops_milvus import OperatorMilvus
 from ops_notion import OperatorNotion
 
 import feedparser
+import requests
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+# Keep feed validators (ETag / Last-Modified) for a week
+RSS_FEED_VALIDATORS_TTL = 86400 * 7
+
+# Parsed feeds of this process, keyed by url and tagged with their
+# validators, so a 304 can reuse the parse (e.g. the same feed listed in
+# both ToRead databases, or under two list names). Least recently used
+# feeds are evicted first
+_FEED_CACHE = OrderedDict()
+_FEED_CACHE_MAXSIZE = 512
+_FEED_CACHE_LOCK = threading.Lock()
+
+
+_ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+
+# Notion multi-select options can't contain commas, and line breaks
+# don't belong in them either
+_TAG_TRANS = str.maketrans({",": " ", "\n": " ", "\r": " ", "\t": " "})
+
+
+def _parse_first_entries(body: bytes, count, response_headers):
+    """
+    Parse only the first `count` RSS 2.0 items / Atom entries: lxml
+    iterparse stops at the count-th one and each element is handed to
+    feedparser wrapped in a minimal document, so the parse time follows
+    count instead of the feed size
+
+    @return feed with the entries, or None to fallback to a full parse
+    """
+    entries = []
+
+    try:
+        for _, el in etree.iterparse(
+                io.BytesIO(body), events=("end",),
+                tag=("item", _ATOM_ENTRY),
+                resolve_entities=False, no_network=True):
+            item = etree.tostring(el)
+
+            if el.tag == "item":
+                doc = b'<rss version="2.0"><channel>' + item + b'</channel></rss>'
+            else:
+                doc = b'<feed xmlns="http://www.w3.org/2005/Atom">' + item + b'</feed>'
+
+            parsed = feedparser.parse(doc, response_headers=response_headers)
+            entries.extend(parsed.entries[:1])
+
+            if len(entries) >= count:
+                break
+
+    except etree.XMLSyntaxError as e:
+        print(f"[parse_feed] Stream parse failed, fallback to feedparser: {e}")
+        return None
+
+    # Nothing recognized, e.g. RSS 1.0 (RDF) items
+    if not entries:
+        return None
+
+    return feedparser.FeedParserDict(entries=entries, bozo=0)
 
 
 class OperatorRSS(WebCollectorBase):
@@ -36,6 +106,40 @@ class OperatorRSS(WebCollectorBase):
     - publish
     """
 
+    def __init__(self):
+        super().__init__()
+
+        # Article ids produced by the current pull, shared by the fetch
+        # threads so overlapping feeds don't build (or fetch the full
+        # content of) the same article twice
+        self._seen_ids = set()
+        self._seen_lock = threading.Lock()
+
+        # Created on first use, then reused by the later stages (and
+        # repeated runs) of this operator
+        self._notion_agent = None
+        self._llm_agents = {}
+
+    def _get_notion_agent(self):
+        if self._notion_agent is None:
+            self._notion_agent = NotionAgent(os.getenv("NOTION_TOKEN"))
+
+        return self._notion_agent
+
+    def _get_llm_agent(self, agent_cls):
+        """
+        @return the agent_cls instance with prompt and llm initialized
+        """
+        agent = self._llm_agents.get(agent_cls)
+
+        if agent is None:
+            agent = agent_cls()
+            agent.init_prompt()
+            agent.init_llm()
+            self._llm_agents[agent_cls] = agent
+
+        return agent
+
     def _fetch_articles(self, list_name, feed_url, count=3, rss_config=None):
         """
         Fetch articles from feed url (pull last n)
@@ -61,17 +165,19 @@ class OperatorRSS(WebCollectorBase):
             })
 
         # Parse the RSS feed
-        feed = feedparser.parse(feed_url)
-        pulled_cnt = 0
+        stream_parse = (rss_config or {}).get("stream_parse", True)
+        feed, validators = self._parse_feed(
+            feed_url, count=count if stream_parse else None, list_name=list_name)
+        if feed is None:
+            print(f"[fetch_articles] Feed not modified since last pull, skip: {list_name}")
+            return []
 
-        articles = []
-        for entry in feed.entries:
-            pulled_cnt += 1
-
-            if pulled_cnt > count:
-                print(f"[fetch_articles] Stop pulling, reached count: {count}")
-                break
+        # The list name part of the article hash key is the same for
+        # every entry, encode it once
+        hash_key_prefix = f"{list_name}_".encode('utf-8')
 
+        articles = []
+        for pulled_cnt, entry in enumerate(itertools.islice(feed.entries, count), 1):
             # Extract relevant information from each entry
             title = entry.title
             link = entry.link
@@ -81,27 +187,45 @@ class OperatorRSS(WebCollectorBase):
             published_parsed = entry.get("published_parsed")
             published_key = published
 
-            # Convert above struct_time object to datetime
+            # Format the struct_time fields directly, the mktime +
+            # fromtimestamp round-trip gave back the same fields
             created_time = date.today().isoformat()
             if published_parsed:
-                dt = datetime.fromtimestamp(mktime(published_parsed))
-                created_time = dt.isoformat()
+                y, m, d, H, M, S = published_parsed[:6]
+                created_time = f"{y:04d}-{m:02d}-{d:02d}T{H:02d}:{M:02d}:{S:02d}"
 
                 # Notes: The feedparser returns unreliable dates, e.g.
                 # sometimes 2023-05-25T16:09:00.004-07:00
                 # sometimes 2023-05-25T16:09:00.003-07:00
                 # It leads the inconsistent md5 hash result which
                 # causes duplicate result, so use YYYY-MM-DD instead
-                published_key = dt.strftime("%Y-%m-%d")
+                published_key = created_time[:10]
 
-            hash_key = f"{list_name}_{title}_{published_key}".encode('utf-8')
-            article_id = utils.hashcode_md5(hash_key)
+            # Same digest as md5(f"{list_name}_{title}_{published_key}"),
+            # keep it stable, it is the dedup key of pushed articles
+            article_id = utils.hashcode_md5(
+                hash_key_prefix,
+                title.encode('utf-8'),
+                b"_",
+                published_key.encode('utf-8'))
 
             print(f"[fetch_articles] pulled_cnt: {pulled_cnt}, list_name: {list_name}, title: {title}, published: {created_time}, article_id: {article_id}")
 
+            with self._seen_lock:
+                seen = article_id in self._seen_ids
+                self._seen_ids.add(article_id)
+
+            if seen:
+                print(f"[fetch_articles] Already pulled from another feed, skip: {article_id}")
+                continue
+
             # Get content - check if full article fetch is enabled
             content = ""
-            summary = entry.get("summary") or ""
+
+            # Only the first 1024 chars are used (for scoring), the tags
+            # are only needed by their terms
+            summary = (entry.get("summary") or "")[:1024]
+            tags = [tag.get("term", "") for tag in entry.get("tags") or []]
 
             if rss_config and rss_config.get("fetch_full_article") and hasattr(self, 'extract_web_content'):
                 print(f"[fetch_articles] Fetching full article from: {link}")
@@ -125,8 +249,7 @@ class OperatorRSS(WebCollectorBase):
                 'created_time': created_time,
                 "summary": summary,
                 "content": content,
-                "tags": entry.get("tags") or [],
-                "published": published,
+                "tags": tags,
                 "published_key": published_key,
             }
 
@@ -137,8 +260,123 @@ class OperatorRSS(WebCollectorBase):
         if hasattr(self, 'stop_playwright'):
             self.stop_playwright()
 
+        # Keep the pulled article ids with the validators, a 304 is only
+        # trusted once all of them were pushed (marked visited)
+        if validators:
+            validators["ids"] = [article["id"] for article in articles]
+            self._get_db().set_rss_feed_validators(
+                utils.hashcode_md5(feed_url.encode("utf-8")),
+                json.dumps(validators),
+                expired_time=RSS_FEED_VALIDATORS_TTL)
+
         return articles
 
+    def _all_visited(self, list_name, article_ids):
+        """
+        Whether all the articles were pushed (marked visited) already
+        """
+        client = self._get_db()
+        visited = client.get_notion_toread_item_ids(
+            "rss", [(list_name, article_id) for article_id in article_ids])
+
+        return all(visited)
+
+    def _parse_feed(self, feed_url, count=None, list_name="", conditional=True):
+        """
+        Download the feed through the pooled session with a conditional
+        GET, and let feedparser read the response stream directly instead
+        of fetching (and copying) the whole body itself
+
+        count: if set (and lxml is available), only the first count
+               entries are parsed
+        list_name: name of the feed, the visited markers of the last
+                   pulled articles are checked under it on a 304
+        conditional: send the stored validators
+
+        @return (parsed feed, validators to store once the articles are
+                pulled), the feed is None if it is not modified (304),
+                was not parsed by this process before, and all its last
+                pulled articles were pushed
+        """
+        client = self._get_db()
+        feed_id = utils.hashcode_md5(feed_url.encode("utf-8"))
+        validators = {}
+        if conditional:
+            validators = json.loads(utils.bytes2str(client.get_rss_feed_validators(feed_id)) or "{}")
+
+        headers = {"User-Agent": feedparser.USER_AGENT}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("modified"):
+            headers["If-Modified-Since"] = validators["modified"]
+
+        try:
+            # The shared session, connections to the same hosts are
+            # reused across feeds (and fetch threads)
+            resp = utils.HTTP_SESSION.get(feed_url, headers=headers, stream=True, timeout=(5, 30))
+        except requests.exceptions.RequestException as e:
+            print(f"[parse_feed] Request failed, fallback to feedparser: {feed_url}, error: {e}")
+            return feedparser.parse(feed_url), None
+
+        with resp:
+            if resp.status_code == 304:
+                with _FEED_CACHE_LOCK:
+                    cached = _FEED_CACHE.get(feed_url)
+                    if cached:
+                        _FEED_CACHE.move_to_end(feed_url)
+
+                # A partial parse can only serve up to the same count
+                if cached and cached[0] == (validators.get("etag"), validators.get("modified")) \
+                        and (cached[1] is None or (count and count <= cached[1])):
+                    print(f"[parse_feed] Not modified, reuse the parsed feed: {feed_url}")
+                    return cached[2], None
+
+                # The last pull may not have made it to the push (failed
+                # or not run yet), the validators were saved by the pull.
+                # Validators stored without the ids are not trusted either
+                if "ids" not in validators or not self._all_visited(list_name, validators["ids"]):
+                    print(f"[parse_feed] Not modified, but the last pulled articles were not pushed, fetch again: {feed_url}")
+                    return self._parse_feed(feed_url, count, list_name, conditional=False)
+
+                return None, None
+
+            response_headers = {
+                **resp.headers,
+                "content-location": resp.url,
+            }
+
+            resp.raw.decode_content = True
+            feed = None
+
+            if count and etree is not None:
+                body = resp.raw.read()
+                feed = _parse_first_entries(body, count, response_headers)
+
+                if feed is None:
+                    count = None
+                    feed = feedparser.parse(body, response_headers=response_headers)
+                else:
+                    print(f"[parse_feed] Parsed the first {len(feed.entries)} entries: {feed_url}")
+            else:
+                count = None
+                feed = feedparser.parse(resp.raw, response_headers=response_headers)
+
+        etag = resp.headers.get("ETag")
+        modified = resp.headers.get("Last-Modified")
+
+        validators = None
+        if resp.ok and feed.entries and (etag or modified):
+            validators = {"etag": etag, "modified": modified}
+
+            with _FEED_CACHE_LOCK:
+                _FEED_CACHE[feed_url] = ((etag, modified), count, feed)
+                _FEED_CACHE.move_to_end(feed_url)
+
+                if len(_FEED_CACHE) > _FEED_CACHE_MAXSIZE:
+                    _FEED_CACHE.popitem(last=False)
+
+        return feed, validators
+
     def pull(self):
         """
         Pull RSS
@@ -149,8 +387,7 @@ class OperatorRSS(WebCollectorBase):
         print("# Pulling RSS")
         print("#####################################################")
         # 1. prepare notion agent and db connection
-        notion_api_key = os.getenv("NOTION_TOKEN")
-        notion_agent = NotionAgent(notion_api_key)
+        notion_agent = self._get_notion_agent()
         op_notion = OperatorNotion()
 
         # 2. get inbox database indexes
@@ -178,9 +415,11 @@ class OperatorRSS(WebCollectorBase):
             rss_list.extend(rss)
 
         # 3. Fetch articles from rss list
-        pages = {}
+        self._seen_ids.clear()
+        fetch_tasks = []
+        enhanced_tasks = []
 
-        for rss in rss_list:
+        for idx, rss in enumerate(rss_list):
             name = rss["name"]
             url = rss["url"]
 
@@ -200,37 +439,84 @@ class OperatorRSS(WebCollectorBase):
             ])
 
             if has_enhanced:
-                print(f"Fetching RSS (enhanced): {name}, url: {url}, config: {rss_config}")
+                enhanced_tasks.append((idx, name, url, rss_config))
             else:
-                print(f"Fetching RSS: {name}, url: {url}")
-
-            articles = self._fetch_articles(name, url, count=3, rss_config=rss_config if has_enhanced else None)
-            print(f"Fetched {len(articles)} articles")
+                fetch_tasks.append((idx, name, url, None))
+
+        # Plain feeds are I/O bound, fetch them concurrently. Enhanced
+        # feeds reconfigure this collector (and may drive Playwright,
+        # which is not thread-safe), so they run serially afterwards
+        results = [[] for _ in rss_list]
+        workers = int(os.getenv("RSS_FETCH_WORKERS", 8))
+        print(f"Fetching {len(fetch_tasks)} RSS feeds with {workers} workers, {len(enhanced_tasks)} enhanced feeds serially")
+
+        if fetch_tasks:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._fetch_feed, *task[1:]): task[0]
+                    for task in fetch_tasks
+                }
+
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+        for idx, name, url, rss_config in enhanced_tasks:
+            results[idx] = self._fetch_feed(name, url, rss_config)
+
+        # Merge in the rss list order, so duplicates resolve the same
+        # way as a serial pull
+        pages = {}
 
+        for articles in results:
             for article in articles:
                 page_id = article["id"]
                 pages[page_id] = article
 
         return pages
 
+    def _fetch_feed(self, name, url, rss_config):
+        """
+        Fetch one feed, errors are logged and skipped so one bad feed
+        does not fail the whole pull
+
+        @return articles
+        """
+        if rss_config:
+            print(f"Fetching RSS (enhanced): {name}, url: {url}, config: {rss_config}")
+        else:
+            print(f"Fetching RSS: {name}, url: {url}")
+
+        try:
+            articles = self._fetch_articles(name, url, count=3, rss_config=rss_config)
+        except Exception as e:
+            print(f"[ERROR] Fetching RSS failed, skip: {name}, url: {url}, error: {e}")
+            traceback.print_exc()
+            return []
+
+        print(f"Fetched {len(articles)} articles, list_name: {name}")
+        return articles
+
     def dedup(self, extractedPages, target="inbox"):
         print("#####################################################")
         print("# Dedup RSS")
         print("#####################################################")
         print(f"Number of pages: {len(extractedPages)}")
 
-        client = DBClient()
+        client = self._get_db()
         deduped_pages = []
 
-        for page_id, page in extractedPages.items():
+        # Check all the pages against the visited markers in one round-trip
+        visited = client.get_notion_toread_item_ids(
+            "rss", [(page["list_name"], page_id) for page_id, page in extractedPages.items()])
+
+        for (page_id, page), is_visited in zip(extractedPages.items(), visited):
             title = page["title"]
             list_name = page["list_name"]
             created_time = page["created_time"]
 
             print(f"Dedupping page, title: {title}, list_name: {list_name}, created_time: {created_time}, page_id: {page_id}")
 
-            if not client.get_notion_toread_item_id(
-                    "rss", list_name, page_id):
+            if not is_visited:
                 deduped_pages.append(page)
                 print(f" - No duplicate RSS article found, move to next. title: {title}, page_id: {page_id}")
 
@@ -245,20 +531,14 @@ class OperatorRSS(WebCollectorBase):
         print(f"k: {k}, input size: {len(pages)}, min_score: {min_score}")
 
         # 1. filter all score >= min_score
-        filtered1 = []
-        for page in pages:
-            relevant_score = page["__relevant_score"]
+        filtered1 = (
+            page for page in pages
+            if page["__relevant_score"] < 0 or page["__relevant_score"] >= min_score
+        )
 
-            if relevant_score < 0 or relevant_score >= min_score:
-                filtered1.append(page)
-
-        # 2. get top k
-        tops = sorted(filtered1, key=lambda page: page["__relevant_score"], reverse=True)
-        print(f"After sorting: {tops}")
-
-        filtered2 = []
-        for i in range(min(k, len(tops))):
-            filtered2.append(tops[i])
+        # 2. get top k, same order as a full sort (ties keep input order)
+        filtered2 = heapq.nlargest(k, filtered1, key=itemgetter("__relevant_score"))
+        print(f"After sorting: {filtered2}")
 
         print(f"Filter output size: {len(filtered2)}")
         return filtered2
@@ -272,27 +552,43 @@ class OperatorRSS(WebCollectorBase):
         print(f"start_date: {start_date}, max_distance: {max_distance}")
 
         op_milvus = OperatorMilvus()
-        client = DBClient()
+        client = self._get_db()
 
         scored_list = []
 
-        for page in data:
+        def _score_text(page):
+            # Get a summary text (at most 1024 chars)
+            score_text = f"{page['title']} - {page['list_name']} - {page['summary']}"
+            return score_text[:1024]
+
+        # Search the relevant pages of all the articles in one batch,
+        # fallback to one by one if the batch fails
+        batch_metas = None
+        try:
+            batch_metas = op_milvus.get_relevant_batch(
+                start_date, [_score_text(page) for page in data], topk=2,
+                max_distance=max_distance, db_client=client)
+        except Exception as e:
+            print(f"[WARN]: Batch scoring failed, fallback to score page by page: {e}")
+
+        for idx, page in enumerate(data):
             try:
                 title = page["title"]
-
-                # Get a summary text (at most 1024 chars)
-                score_text = f"{page['title']} - {page['list_name']} - {page['summary']}"
-                score_text = score_text[:1024]
+                score_text = _score_text(page)
                 print(f"Scoring page: {title}, score_text: {score_text}")
 
-                relevant_metas = op_milvus.get_relevant(
-                    start_date, score_text, topk=2,
-                    max_distance=max_distance, db_client=client)
+                if batch_metas is not None:
+                    relevant_metas = batch_metas[idx]
+                else:
+                    relevant_metas = op_milvus.get_relevant(
+                        start_date, score_text, topk=2,
+                        max_distance=max_distance, db_client=client)
 
                 page_score = op_milvus.score(relevant_metas)
 
-                scored_page = copy.deepcopy(page)
-                scored_page["__relevant_score"] = page_score
+                # Stages only add top-level "__" keys, a shallow copy
+                # keeps the input page untouched
+                scored_page = {**page, "__relevant_score": page_score}
 
                 scored_list.append(scored_page)
                 print(f"RSS article scored {page_score}")
@@ -301,8 +597,7 @@ class OperatorRSS(WebCollectorBase):
                 print(f"[ERROR]: Score page failed, assigning default score -1: {e}")
                 traceback.print_exc()
                 # Still add page with default score so it passes through filter
-                scored_page = copy.deepcopy(page)
-                scored_page["__relevant_score"] = -1
+                scored_page = {**page, "__relevant_score": -1}
                 scored_list.append(scored_page)
 
         print(f"Scored_pages ({len(scored_list)}): {scored_list}")
@@ -318,24 +613,29 @@ class OperatorRSS(WebCollectorBase):
         print(f"Summary max length: {SUMMARY_MAX_LENGTH}")
         print(f"Translation language: {TRANSLATION_LANG}")
 
-        llm_agent = LLMAgentSummary()
-        llm_agent.init_prompt()
-        llm_agent.init_llm()
+        llm_agent = self._get_llm_agent(LLMAgentSummary)
 
         # Initialize title agent if translation is enabled
         title_agent = None
         if TRANSLATION_LANG:
-            title_agent = LLMAgentTitle()
-            title_agent.init_prompt()
-            title_agent.init_llm()
+            title_agent = self._get_llm_agent(LLMAgentTitle)
 
-        client = DBClient()
+        client = self._get_db()
         redis_key_expire_time = os.getenv(
             "BOT_REDIS_KEY_EXPIRE_TIME", 604800)
+        llm_workers = int(os.getenv("LLM_WORKERS", 4))
+
+        # Look up all the cached summaries (and localized titles) in one
+        # round-trip each, instead of one per page
+        cached_summaries = client.get_notion_summary_item_ids(
+            "rss", [(page["list_name"], page["id"]) for page in pages])
 
-        summarized_pages = []
+        cached_titles = [None] * len(pages)
+        if title_agent:
+            cached_titles = client.get_notion_summary_item_ids(
+                "rss", [(page["list_name"], f"title_{page['id']}") for page in pages])
 
-        for page in pages:
+        def _summarize_one(page, llm_summary_resp, cached_title):
             page_id = page["id"]
             title = page["title"]
             content = page["content"]
@@ -346,9 +646,6 @@ class OperatorRSS(WebCollectorBase):
 
             st = time.time()
 
-            llm_summary_resp = client.get_notion_summary_item_id(
-                "rss", list_name, page_id)
-
             if not llm_summary_resp:
                 # Double check the content, if empty, load it from
                 # the source url. For RSS, we will load content
@@ -365,7 +662,7 @@ class OperatorRSS(WebCollectorBase):
 
                     if not content:
                         print("[ERROR] Empty Web page loaded via WebBaseLoader, skip it")
-                        continue
+                        return None
 
                 content = content[:SUMMARY_MAX_LENGTH]
                 # Prepend source name for LLM to include in summary
@@ -385,8 +682,6 @@ class OperatorRSS(WebCollectorBase):
             localized_title = title
             if title_agent:
                 title_cache_key = f"title_{page_id}"
-                cached_title = client.get_notion_summary_item_id(
-                    "rss", list_name, title_cache_key)
 
                 if not cached_title:
                     # Use summary or content for title generation
@@ -402,12 +697,20 @@ class OperatorRSS(WebCollectorBase):
                     print(f"Found cached localized title: {localized_title}")
 
             # assemble summary into page
-            summarized_page = copy.deepcopy(page)
-            summarized_page["__summary"] = summary
-            summarized_page["__localized_title"] = localized_title
+            summarized_page = {
+                **page,
+                "__summary": summary,
+                "__localized_title": localized_title,
+            }
 
             print(f"Used {time.time() - st:.3f}s, Summarized page_id: {page_id}, summary: {summary[:200]}...")
-            summarized_pages.append(summarized_page)
+            return summarized_page
+
+        # LLM calls dominate this stage and are network bound, run the
+        # pages concurrently. map keeps the input order
+        with ThreadPoolExecutor(max_workers=llm_workers) as executor:
+            results = executor.map(_summarize_one, pages, cached_summaries, cached_titles)
+            summarized_pages = [page for page in results if page]
 
         return summarized_pages
 
@@ -421,18 +724,31 @@ class OperatorRSS(WebCollectorBase):
         ENABLED = utils.str2bool(os.getenv("RSS_ENABLE_CLASSIFICATION", "False"))
         print(f"Number of pages: {len(pages)}, enabled: {ENABLED}")
 
-        llm_agent = LLMAgentCategoryAndRanking()
-        llm_agent.init_prompt()
-        llm_agent.init_llm()
+        # Classification disabled, no LLM agent, cache or worker is
+        # needed, just assign the default rating
+        if not ENABLED:
+            ranked = [{
+                **page,
+                "__topics": [],
+                "__categories": [],
+                "__rate": -0.02,
+            } for page in pages]
+
+            print(f"Ranked pages: {ranked}")
+            return ranked
 
-        client = DBClient()
+        llm_agent = self._get_llm_agent(LLMAgentCategoryAndRanking)
+
+        client = self._get_db()
         redis_key_expire_time = os.getenv(
             "BOT_REDIS_KEY_EXPIRE_TIME", 604800)
+        llm_workers = int(os.getenv("LLM_WORKERS", 4))
 
-        # array of ranged pages
-        ranked = []
+        # One round-trip for all the cached rankings
+        cached_rankings = client.get_notion_ranking_item_ids(
+            "rss", [(page["list_name"], page["id"]) for page in pages])
 
-        for page in pages:
+        def _rank_one(page, llm_ranking_resp):
             title = page["title"]
             page_id = page["id"]
             list_name = page["list_name"]
@@ -443,32 +759,23 @@ class OperatorRSS(WebCollectorBase):
             st = time.time()
 
             # Parse LLM response and assemble category and rank
-            ranked_page = copy.deepcopy(page)
-
-            if not ENABLED:
-                ranked_page["__topics"] = []
-                ranked_page["__categories"] = []
-                ranked_page["__rate"] = -0.02
-
-                ranked.append(ranked_page)
-                continue
-
-            llm_ranking_resp = client.get_notion_ranking_item_id(
-                "rss", list_name, page_id)
+            ranked_page = dict(page)
 
             category_and_rank_str = None
+            category_and_rank = None
             need_rerank = False
 
             if llm_ranking_resp:
                 # Check if cached ranking has empty topics (from when classification was disabled)
                 cached_str = utils.bytes2str(llm_ranking_resp)
-                cached_data = utils.fix_and_parse_json(cached_str)
-                if cached_data and not cached_data.get("topics"):
-                    print("Cached ranking has empty topics, will re-rank")
+                cached_data = llm_prompts.parse_category_and_ranking(cached_str)
+                if not cached_data or not cached_data.get("topics"):
+                    print("Cached ranking is invalid or has empty topics, will re-rank")
                     need_rerank = True
                 else:
                     print("Found category_and_rank_str from cache")
                     category_and_rank_str = cached_str
+                    category_and_rank = cached_data
 
             if not llm_ranking_resp or need_rerank:
                 print("Not found category_and_rank_str in cache or need re-rank, calling llm_agent")
@@ -480,9 +787,9 @@ class OperatorRSS(WebCollectorBase):
                     category_and_rank_str,
                     expired_time=int(redis_key_expire_time))
 
-            print(f"Used {time.time() - st:.3f}s, Category and Rank: text: {text}, rank_resp: {category_and_rank_str}")
+                category_and_rank = llm_prompts.parse_category_and_ranking(category_and_rank_str)
 
-            category_and_rank = utils.fix_and_parse_json(category_and_rank_str)
+            print(f"Used {time.time() - st:.3f}s, Category and Rank: text: {text}, rank_resp: {category_and_rank_str}")
             print(f"LLM ranked result (json parsed): {category_and_rank}")
 
             if not category_and_rank:
@@ -496,7 +803,11 @@ class OperatorRSS(WebCollectorBase):
                 ranked_page["__rate"] = category_and_rank["overall_score"]
                 ranked_page["__feedback"] = category_and_rank.get("feedback") or ""
 
-            ranked.append(ranked_page)
+            return ranked_page
+
+        # Same as summarize, the LLM calls run concurrently in order
+        with ThreadPoolExecutor(max_workers=llm_workers) as executor:
+            ranked = list(executor.map(_rank_one, pages, cached_rankings))
 
         print(f"Ranked pages: {ranked}")
         return ranked
@@ -505,8 +816,7 @@ class OperatorRSS(WebCollectorBase):
         """
         items: [(name, score), ...]
         """
-        tops = sorted(items, key=itemgetter(1), reverse=True)
-        return tops[:k]
+        return heapq.nlargest(k, items, key=itemgetter(1))
 
     def push(self, pages, targets, topk=3):
         print("#####################################################")
@@ -525,8 +835,7 @@ class OperatorRSS(WebCollectorBase):
             print(f"Pushing data to target: {target} ...")
 
             if target == "notion":
-                notion_api_key = os.getenv("NOTION_TOKEN")
-                notion_agent = NotionAgent(notion_api_key)
+                notion_agent = self._get_notion_agent()
                 op_notion = OperatorNotion()
 
                 # Get the latest toread database id from index db
@@ -540,12 +849,14 @@ class OperatorRSS(WebCollectorBase):
                     print("[ERROR] no index db pages found... skip")
                     break
 
-                for page in pages:
-                    stat["total"] += 1
+                client = self._get_db()
+                push_workers = int(os.getenv("NOTION_PUSH_WORKERS", 5))
 
+                def _push_one(page):
+                    """
+                    @return True if pushed, False on error
+                    """
                     try:
-                        page_id = page["id"]
-                        list_name = page["list_name"]
                         title = page["title"]
                         tags = page["tags"]
 
@@ -553,13 +864,13 @@ class OperatorRSS(WebCollectorBase):
 
                         # Use ranked topics if available, fallback to RSS tags
                         if page.get("__topics"):
-                            topics_topk = [x[0][:20] for x in page["__topics"]][:topk]
+                            topics_topk = [x[0].translate(_TAG_TRANS)[:20] for x in page["__topics"]][:topk]
                         else:
-                            topics_topk = [x["term"].replace(",", " ")[:20] for x in tags][:topk]
+                            topics_topk = [x.translate(_TAG_TRANS)[:20] for x in tags][:topk]
 
                         # Use ranked categories if available
                         if page.get("__categories"):
-                            categories_topk = [x[0][:20] for x in page["__categories"]][:topk]
+                            categories_topk = [x[0].translate(_TAG_TRANS)[:20] for x in page["__categories"]][:topk]
                         else:
                             categories_topk = []
 
@@ -572,12 +883,25 @@ class OperatorRSS(WebCollectorBase):
                             categories_topk,
                             rating)
 
-                        self.markVisited(page_id, source="rss", list_name=list_name)
+                        return True
 
                     except Exception as e:
                         print(f"[ERROR]: Push to notion failed, skip: {e}")
-                        stat["error"] += 1
                         traceback.print_exc()
+                        return False
+
+                # Notion calls are network bound, push pages concurrently,
+                # the request rate is still capped by the notion client
+                with ThreadPoolExecutor(max_workers=push_workers) as executor:
+                    results = list(executor.map(_push_one, pages))
+
+                stat["total"] += len(results)
+                stat["error"] += results.count(False)
+
+                # Mark all the pushed pages visited in one round-trip
+                visited = [(page["list_name"], page["id"]) for page, ok in zip(pages, results) if ok]
+                if visited and not self.markVisitedBatch(visited, source="rss", db_client=client):
+                    print(f"[ERROR]: Mark {len(visited)} pushed pages visited failed")
 
             else:
                 print(f"[ERROR]: Unknown target {target}, skip")
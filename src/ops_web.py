@@ -10,21 +10,28 @@ Supports:
 - Proxy support
 """
 
+import gzip
+import json
 import os
 import traceback
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
 from operator import itemgetter
 
+import orjson
+
 from notion import NotionAgent
 from llm_agent import (
     LLMAgentCategoryAndRanking,
     LLMAgentSummary,
 )
+import llm_prompts
 import utils
-from ops_web_base import WebCollectorBase
+from ops_web_base import DEFAULT_HEADERS, WebCollectorBase
 from db_cli import DBClient
 from ops_milvus import OperatorMilvus
 from ops_notion import OperatorNotion
+from playwright_manager import get_browser_pool
 
 
 class OperatorWeb(WebCollectorBase):
@@ -52,6 +59,7 @@ class OperatorWeb(WebCollectorBase):
         - Browser Mode: checkbox (optional)
         - Digest Splitting: checkbox (optional)
         - Digest Limit: number (optional)
+        - Digest Same Host: checkbox (optional)
         - Proxy: text (optional)
         """
         query_data = {
@@ -105,6 +113,8 @@ class OperatorWeb(WebCollectorBase):
             if props.get("Digest Limit", {}).get("number"):
                 digest_limit = int(props["Digest Limit"]["number"])
 
+            digest_same_host = props.get("Digest Same Host", {}).get("checkbox", False)
+
             proxy = ""
             if props.get("Proxy", {}).get("rich_text"):
                 proxy = props["Proxy"]["rich_text"][0]["text"]["content"]
@@ -118,6 +128,7 @@ class OperatorWeb(WebCollectorBase):
                 "browser_mode": browser_mode,
                 "digest_splitting": digest_splitting,
                 "digest_limit": digest_limit,
+                "digest_same_host": digest_same_host,
                 "proxy": proxy,
                 "created_time": page["created_time"],
                 "last_edited_time": page["last_edited_time"],
@@ -125,6 +136,84 @@ class OperatorWeb(WebCollectorBase):
 
         return sources
 
+    def _sources_changed(self, notion_agent, database_ids, since):
+        """
+        Check whether any page of the source databases was edited (or
+        created) since the given time, one light query per database
+        """
+        for database_id in database_ids:
+            resp = notion_agent.api.databases.query(
+                database_id=database_id,
+                page_size=1,
+                filter={
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {
+                        "on_or_after": since,
+                    },
+                })
+
+            if resp.get("results"):
+                return True
+
+        return False
+
+    def _load_web_sources(self, notion_agent, db_index_id):
+        """
+        List the enabled web sources of the latest inbox databases.
+
+        The listing is kept in redis for WEB_SOURCES_CACHE_TTL seconds,
+        and reused as long as no source page was edited since then
+
+        @return sources list
+        """
+        client = self._get_db()
+        cache_ttl = int(os.getenv("WEB_SOURCES_CACHE_TTL", 600))
+
+        cached = json.loads(utils.bytes2str(client.get_web_sources(db_index_id)) or "{}")
+
+        if cached:
+            try:
+                if not self._sources_changed(
+                        notion_agent, cached["database_ids"], cached["since"]):
+                    print(f"[OperatorWeb] Reuse the cached web sources since {cached['since']}")
+                    return cached["sources"]
+
+            except Exception as e:
+                print(f"[OperatorWeb] Failed to check the cached web sources: {e}")
+
+        # Notion timestamps are minute precision, an edit in the same
+        # minute as this listing would only cause one more refresh
+        since = datetime.now(timezone.utc).replace(second=0, microsecond=0).isoformat()
+
+        db_pages = utils.get_notion_database_pages_inbox(
+            notion_agent, db_index_id, "Web")
+
+        if not db_pages:
+            print("[OperatorWeb] No Web inbox databases found")
+            return []
+
+        print(f"[OperatorWeb] Found {len(db_pages)} Web inbox databases")
+
+        database_ids = [db_page["database_id"] for db_page in db_pages[:2]]  # Latest 2 databases
+        web_sources = []
+
+        for database_id in database_ids:
+            print(f"[OperatorWeb] Querying database: {database_id}")
+
+            sources = self._query_web_sources(notion_agent, database_id)
+            web_sources.extend(sources)
+
+        client.set_web_sources(
+            db_index_id,
+            json.dumps({
+                "since": since,
+                "database_ids": database_ids,
+                "sources": web_sources,
+            }),
+            expired_time=cache_ttl)
+
+        return web_sources
+
     def _fetch_web_content(self, source: dict) -> list[dict]:
         """
         Fetch content from a web source.
@@ -143,6 +232,11 @@ class OperatorWeb(WebCollectorBase):
         # Configure collector from source
         self.configure_from_source(source)
 
+        # The Playwright manager of a previous source is reused with the
+        # proxy and headers of this one, pull() releases it at the end
+        if self.browser_mode:
+            self.reuse_playwright()
+
         articles = []
 
         try:
@@ -164,8 +258,10 @@ class OperatorWeb(WebCollectorBase):
             traceback.print_exc()
 
         finally:
-            # Cleanup Playwright if used
-            self.stop_playwright()
+            # Reset the per-source request settings, the browser (if
+            # any) is kept for the next source
+            self.set_proxies(None)
+            self.headers = dict(DEFAULT_HEADERS)
 
         return articles
 
@@ -209,32 +305,49 @@ class OperatorWeb(WebCollectorBase):
         # 2. Get inbox database indexes
         db_index_id = op_notion.get_index_inbox_dbid()
 
-        db_pages = utils.get_notion_database_pages_inbox(
-            notion_agent, db_index_id, "Web")
+        # 3. Get web sources from databases
+        web_sources = self._load_web_sources(notion_agent, db_index_id)
 
-        if not db_pages:
-            print("[OperatorWeb] No Web inbox databases found")
-            return {}
+        print(f"[OperatorWeb] Found {len(web_sources)} enabled web sources")
 
-        print(f"[OperatorWeb] Found {len(db_pages)} Web inbox databases")
+        # 4. Fetch articles from each source. The source config lives on
+        # the collector, so each source is fetched concurrently by its own
+        # collector. Without a browser pool, the browser mode ones run
+        # here serially
+        browser_pool = get_browser_pool()
+        results = [[] for _ in web_sources]
 
-        # 3. Get web sources from databases
-        web_sources = []
-        for db_page in db_pages[:2]:  # Latest 2 databases
-            database_id = db_page["database_id"]
-            print(f"[OperatorWeb] Querying database: {database_id}")
+        def _fetch_one(source):
+            collector = OperatorWeb()
+            try:
+                return collector._fetch_web_content(source)
+            finally:
+                # Release the Playwright manager of this collector
+                collector.stop_playwright()
 
-            sources = self._query_web_sources(notion_agent, database_id)
-            web_sources.extend(sources)
+        try:
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+                futures = {
+                    executor.submit(_fetch_one, source): idx
+                    for idx, source in enumerate(web_sources)
+                    if browser_pool or not source["browser_mode"]
+                }
 
-        print(f"[OperatorWeb] Found {len(web_sources)} enabled web sources")
+                for idx, source in enumerate(web_sources):
+                    if source["browser_mode"] and not browser_pool:
+                        results[idx] = self._fetch_web_content(source)
 
-        # 4. Fetch articles from each source
-        pages = {}
+                for future, idx in futures.items():
+                    results[idx] = future.result()
+
+        finally:
+            # The shared browser itself keeps running for the next pulls
+            self.stop_playwright()
 
-        for source in web_sources:
-            articles = self._fetch_web_content(source)
+        # Merge in source order
+        pages = {}
 
+        for articles in results:
             for article in articles:
                 page_id = article["id"]
                 pages[page_id] = article
@@ -254,19 +367,27 @@ class OperatorWeb(WebCollectorBase):
         op_milvus = OperatorMilvus()
         client = DBClient()
 
+        # Look up all the titles in Milvus in one batch
+        titles = [page.get("title", "") for page in pages.values()]
+        hits = op_milvus.getIdsByContentBatch(titles, db_client=client)
+
         data = {}
-        for page_id, page in pages.items():
-            title = page.get("title", "")
+        new_titles = []
+        seen = set()
 
-            # Check if exists in Milvus
-            if op_milvus.getIdByContent(title):
+        for (page_id, page), title, hit in zip(pages.items(), titles, hits):
+            # Exists in Milvus, or repeated in this batch
+            if hit or title in seen:
                 print(f"[Dedup] Skip duplicate: {title[:50]}...")
                 continue
 
-            # Add to Milvus for future dedup
-            op_milvus.addItem(title)
+            seen.add(title)
+            new_titles.append(title)
             data[page_id] = page
 
+        # Add to Milvus for future dedup, in one batch
+        op_milvus.addItemsBatch(new_titles, db_client=client)
+
         print(f"[Dedup] {len(data)}/{len(pages)} pages after dedup")
         return data
 
@@ -278,19 +399,42 @@ class OperatorWeb(WebCollectorBase):
         print("# Summarize Web content")
         print("#####################################################")
 
-        data = {}
-        for page_id, page in pages.items():
+        llm_agent = LLMAgentSummary()
+        llm_agent.init_prompt()
+        llm_agent.init_llm()
+
+        client = DBClient()
+        redis_key_expire_time = os.getenv(
+            "BOT_REDIS_KEY_EXPIRE_TIME", 604800)
+        llm_workers = int(os.getenv("LLM_WORKERS", 4))
+
+        def _summarize_one(page):
             title = page.get("title", "")
             content = page.get("content", "")
 
             if not content:
                 print(f"[Summarize] Skip empty content: {title[:50]}...")
-                data[page_id] = page
-                continue
+                return
 
             try:
-                llm_agent = LLMAgentSummary()
-                summary = llm_agent.run(content[:4000])  # Limit content length
+                text = content[:4000]  # Limit content length
+                list_name = page.get("list_name", "default")
+
+                # The same content gets the same summary, cache the llm
+                # response by content hash
+                text_hash = utils.hashcode_md5(text.encode("utf-8"))
+                summary = utils.bytes2str(
+                    client.get_notion_summary_item_id("web", list_name, text_hash))
+
+                if not summary:
+                    summary = llm_agent.run(text)
+
+                    if summary:
+                        client.set_notion_summary_item_id(
+                            "web", list_name, text_hash, summary,
+                            expired_time=int(redis_key_expire_time))
+                else:
+                    print(f"[Summarize] Found llm summary from cache: {title[:50]}...")
 
                 if summary:
                     page["summary"] = summary
@@ -302,9 +446,12 @@ class OperatorWeb(WebCollectorBase):
                 print(f"[Summarize] Error: {e}")
                 page["summary"] = content[:500]
 
-            data[page_id] = page
+        # LLM calls are network bound, run the pages concurrently.
+        # Pages are updated in place, no need to rebuild the dict
+        with ThreadPoolExecutor(max_workers=llm_workers) as executor:
+            list(executor.map(_summarize_one, pages.values()))
 
-        return data
+        return pages
 
     def rank(self, pages):
         """
@@ -314,18 +461,42 @@ class OperatorWeb(WebCollectorBase):
         print("# Rank Web content")
         print("#####################################################")
 
-        data = {}
-        for page_id, page in pages.items():
+        llm_agent = LLMAgentCategoryAndRanking()
+        llm_agent.init_prompt()
+        llm_agent.init_llm()
+
+        client = DBClient()
+        redis_key_expire_time = os.getenv(
+            "BOT_REDIS_KEY_EXPIRE_TIME", 604800)
+        llm_workers = int(os.getenv("LLM_WORKERS", 4))
+
+        def _rank_one(page):
             title = page.get("title", "")
             summary = page.get("summary", "")
 
             try:
-                llm_agent = LLMAgentCategoryAndRanking()
-                result = llm_agent.run(title, summary)
+                text = f"{title}\n{summary}"
+                list_name = page.get("list_name", "default")
+
+                # Cache the llm response by the hash of the ranked text
+                text_hash = utils.hashcode_md5(text.encode("utf-8"))
+                resp = utils.bytes2str(
+                    client.get_notion_ranking_item_id("web", list_name, text_hash))
+
+                if not resp:
+                    resp = llm_agent.run(text)
+
+                    if resp:
+                        client.set_notion_ranking_item_id(
+                            "web", list_name, text_hash, resp,
+                            expired_time=int(redis_key_expire_time))
+
+                result = llm_prompts.parse_category_and_ranking(resp)
 
                 if result:
-                    page["category"] = result.get("category", "")
-                    page["ranking"] = result.get("ranking", 3)
+                    topics = result.get("topics") or []
+                    page["category"] = topics[0]["category"] if topics else ""
+                    page["ranking"] = result.get("overall_score", 3)
                     print(f"[Rank] {title[:30]}... -> {page['category']}, score={page['ranking']}")
                 else:
                     page["category"] = ""
@@ -336,9 +507,11 @@ class OperatorWeb(WebCollectorBase):
                 page["category"] = ""
                 page["ranking"] = 3
 
-            data[page_id] = page
+        # LLM calls are network bound, run the pages concurrently
+        with ThreadPoolExecutor(max_workers=llm_workers) as executor:
+            list(executor.map(_rank_one, pages.values()))
 
-        return data
+        return pages
 
     def push(self, pages, target_sources=None):
         """
@@ -382,6 +555,9 @@ class OperatorWeb(WebCollectorBase):
                 pushed_count += 1
                 print(f"[Push] Pushed: {page['title'][:50]}...")
 
+                self.set_last_modified(
+                    page["url"], page.get("published") or page["created_time"])
+
             except Exception as e:
                 print(f"[Push] Error pushing {page['title'][:30]}...: {e}")
 
@@ -389,27 +565,37 @@ class OperatorWeb(WebCollectorBase):
 
     def save(self, pages, data_folder, target_sources=None):
         """
-        Save pages to JSON file.
+        Save pages to a gzipped JSON file.
         """
-        import json
-        filepath = f"{data_folder}/web_pages.json"
+        filepath = f"{data_folder}/web_pages.json.gz"
+
+        payload = orjson.dumps(
+            pages, default=str, option=orjson.OPT_NON_STR_KEYS)
 
-        with open(filepath, 'w') as f:
-            json.dump(pages, f, indent=2, default=str)
+        with gzip.open(filepath, "wb", compresslevel=4) as f:
+            f.write(payload)
 
         print(f"[OperatorWeb] Saved {len(pages)} pages to {filepath}")
         return filepath
 
     def restore(self, data_folder, target_sources=None):
         """
-        Restore pages from JSON file.
+        Restore pages from the gzipped JSON file, or the plain JSON
+        file saved by the previous versions.
         """
-        import json
-        filepath = f"{data_folder}/web_pages.json"
+        filepath = f"{data_folder}/web_pages.json.gz"
+        legacy_filepath = f"{data_folder}/web_pages.json"
 
         try:
-            with open(filepath, 'r') as f:
-                pages = json.load(f)
+            if os.path.exists(filepath):
+                with gzip.open(filepath, "rb") as f:
+                    payload = f.read()
+            else:
+                filepath = legacy_filepath
+                with open(filepath, "rb") as f:
+                    payload = f.read()
+
+            pages = orjson.loads(payload)
             print(f"[OperatorWeb] Restored {len(pages)} pages from {filepath}")
             return pages
         except FileNotFoundError:
@@ -12,23 +12,96 @@ Extends OperatorBase with web collection utilities including:
 """
 
 import hashlib
+import io
 import json
+import multiprocessing
 import os
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
 from typing import Any, Literal
 from urllib.parse import urljoin, urlparse
 
-import dateutil.parser as dateparser
+import lxml.etree
 import lxml.html
 import requests
-from bs4 import BeautifulSoup, Tag
-from trafilatura import extract, extract_metadata
 
 from ops_base import OperatorBase
-from playwright_manager import PlaywrightManager
+from playwright_manager import PlaywrightManager, get_browser_pool
+from web_extractor import (
+    extract_meta,
+    parse_article,
+    xpath_extraction,
+)
 import utils
 
 
+DEFAULT_HEADERS = {"User-Agent": "Auto-News/1.0"}
+
+# Content types worth reading as article pages
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Hrefs that don't navigate to another page
+NON_PAGE_HREF_PREFIXES = ("#", "javascript:", "mailto:", "tel:", "data:")
+
+# Links to these are never articles, don't fetch them from digests
+ASSET_EXTENSIONS = (
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".ico",
+    ".css", ".js", ".pdf", ".zip", ".mp3", ".mp4",
+)
+
+
+@lru_cache(maxsize=4096)
+def _content_hash(author: str, title: str, clean_url: str) -> str:
+    """
+    Dedup hash of a news item, the same article is usually hashed again
+    by retries and overlapping digests
+    """
+    return hashlib.sha256(f"{author}{title}{clean_url}".encode()).hexdigest()
+
+
+# Keep the per-page last modified time (If-Modified-Since) for 4 weeks
+WEB_LAST_MODIFIED_TTL = 86400 * 28
+
+# Extracted articles of this process, keyed by (url, xpath, browser):
+# retries and overlapping digests ask for the same pages again. Entries
+# expire after WEB_EXTRACT_CACHE_TTL seconds, least recently used ones
+# are evicted first
+_EXTRACT_CACHE = OrderedDict()
+_EXTRACT_CACHE_MAXSIZE = 1024
+_EXTRACT_CACHE_LOCK = threading.Lock()
+WEB_EXTRACT_CACHE_TTL = 3600
+
+# Process pool for the article extraction (CPU bound), shared by all the
+# collectors and created on first use, None if WEB_PARSE_WORKERS is 0
+_PARSE_POOL = None
+_PARSE_POOL_LOCK = threading.Lock()
+
+
+def _get_parse_pool():
+    global _PARSE_POOL
+
+    workers = int(os.getenv("WEB_PARSE_WORKERS", 0))
+    if workers <= 0:
+        return None
+
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            # spawn: the fetch threads may be running, and the workers
+            # only need to import the light web_extractor module
+            _PARSE_POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"))
+
+        return _PARSE_POOL
+
+
 class NoChangeError(Exception):
     """Raised when content has not changed (HTTP 304)"""
     pass
@@ -44,7 +117,9 @@ class WebCollectorBase(OperatorBase):
         super().__init__()
         self.proxies: dict | None = None
         self.timeout: int = 60
-        self.headers: dict = {"User-Agent": "Auto-News/1.0"}
+        # Fail fast on unreachable hosts, self.timeout bounds the reads
+        self.connect_timeout: int = 10
+        self.headers: dict = dict(DEFAULT_HEADERS)
         self.last_attempted: datetime | None = None
 
         # Browser mode settings
@@ -57,8 +132,22 @@ class WebCollectorBase(OperatorBase):
         # Digest splitting settings
         self.digest_splitting: bool = False
         self.digest_splitting_limit: int = 30
+        self.digest_same_host: bool = False
         self.split_digest_urls: list = []
 
+        # Pooled keep-alive connections shared by all the collectors,
+        # can be replaced by a dedicated session
+        self.session: requests.Session = utils.HTTP_SESSION
+
+        # Max concurrent HTTP fetches (browser mode always fetches serially)
+        self.fetch_workers: int = int(os.getenv("WEB_FETCH_WORKERS", 5))
+
+        # Pages larger than this are not read beyond it
+        self.max_bytes: int = int(os.getenv("WEB_MAX_BYTES", 5 * 1024 * 1024))
+
+        # Max seconds to wait for an article extraction in the parse pool
+        self.parse_timeout: int = int(os.getenv("WEB_PARSE_TIMEOUT", 15))
+
     def set_proxies(self, proxy_server: str | None):
         """Set proxy server for HTTP requests"""
         if proxy_server:
@@ -91,7 +180,8 @@ class WebCollectorBase(OperatorBase):
     def send_get_request(
         self,
         url: str,
-        modified_since: datetime | None = None
+        modified_since: datetime | None = None,
+        stream: bool = False
     ) -> requests.Response:
         """
         Send a GET request to url with self.headers using self.proxies.
@@ -99,6 +189,7 @@ class WebCollectorBase(OperatorBase):
         Args:
             url: Target URL
             modified_since: If provided, make conditional request with If-Modified-Since
+            stream: If True, the body is not downloaded yet (see read_html)
 
         Returns:
             Response object
@@ -111,19 +202,19 @@ class WebCollectorBase(OperatorBase):
 
         # Add If-Modified-Since header for conditional requests
         if modified_since:
-            request_headers["If-Modified-Since"] = modified_since.strftime(
-                "%a, %d %b %Y %H:%M:%S GMT"
-            )
+            request_headers["If-Modified-Since"] = format_datetime(
+                modified_since.replace(tzinfo=timezone.utc), usegmt=True)
 
         print(f"[WebCollectorBase] GET {url}")
-        response = requests.get(
+        response = self.session.get(
             url,
             headers=request_headers,
             proxies=self.proxies,
-            timeout=self.timeout
+            timeout=(self.connect_timeout, self.timeout),
+            stream=stream
         )
 
-        if response.status_code == 200 and not response.content:
+        if response.status_code == 200 and not stream and not response.content:
             print(f"[WebCollectorBase] Response 200 OK but no content: {url}")
 
         if response.status_code == 304:
@@ -140,7 +231,11 @@ class WebCollectorBase(OperatorBase):
     def get_last_modified(self, response: requests.Response) -> datetime | None:
         """Extract Last-Modified datetime from response headers"""
         if last_modified := response.headers.get("Last-Modified"):
-            return dateparser.parse(last_modified, ignoretz=True)
+            # HTTP-date is always GMT, keep it as a naive utc datetime
+            try:
+                return parsedate_to_datetime(last_modified).replace(tzinfo=None)
+            except (TypeError, ValueError):
+                print(f"[WebCollectorBase] Invalid Last-Modified: {last_modified}")
         return None
 
     def init_playwright(self):
@@ -148,9 +243,23 @@ class WebCollectorBase(OperatorBase):
         if self.browser_mode and not self.playwright_manager:
             self.playwright_manager = PlaywrightManager(
                 proxies=self.proxies,
-                headers=self.headers
+                headers=self.headers,
+                pool=get_browser_pool(),
+                persistent=utils.str2bool(os.getenv("WEB_BROWSER_PERSISTENT", "false")),
+                user_data_dir=os.getenv("WEB_BROWSER_DATA_DIR") or None,
+                # Off unless WEB_BROWSER_CACHE_TTL is set
+                cache_enabled=True,
+                ttl_seconds=int(os.getenv("WEB_BROWSER_CACHE_TTL", 0))
             )
 
+    def reuse_playwright(self):
+        """
+        Keep the manager for the next source, with the current proxy
+        and headers (every fetch gets a fresh browser context anyway)
+        """
+        if self.playwright_manager:
+            self.playwright_manager.configure(self.proxies, self.headers)
+
     def stop_playwright(self):
         """Stop Playwright browser if running"""
         if self.playwright_manager:
@@ -160,8 +269,9 @@ class WebCollectorBase(OperatorBase):
     def fetch_article_content(
         self,
         url: str,
-        xpath: str = ""
-    ) -> tuple[str, datetime | None]:
+        xpath: str = "",
+        browser: bool | None = None
+    ) -> tuple[str | None, datetime | None]:
         """
         Fetch article content from URL.
 
@@ -170,27 +280,114 @@ class WebCollectorBase(OperatorBase):
         Args:
             url: Article URL
             xpath: Optional XPath to wait for/extract specific element
+            browser: Override browser_mode for this url
 
         Returns:
-            Tuple of (html_content, published_date)
+            Tuple of (html_content, published_date), html_content is
+            None if the page was not modified since the last fetch, ""
+            if nothing readable was fetched
         """
-        if self.browser_mode:
+        if browser is None:
+            browser = self.browser_mode
+
+        if browser:
             self.init_playwright()
             if self.playwright_manager:
                 content = self.playwright_manager.fetch_content_with_js(url, xpath)
                 return content, None
 
-        response = self.send_get_request(url, self.last_attempted)
+        # Conditional request with the last modified time stored from
+        # the previous fetch of this page
+        client = self._get_db()
+        url_id = utils.hashcode_md5(self.clean_url(url).encode("utf-8"))
+        modified_since = self.last_attempted
+        if last_modified := utils.bytes2str(client.get_web_last_modified(url_id)):
+            modified_since = datetime.fromisoformat(last_modified)
+
+        try:
+            response = self.send_get_request(url, modified_since, stream=True)
+        except NoChangeError:
+            print(f"[WebCollectorBase] Not modified since {modified_since}, skip: {url}")
+            return None, None
+
+        html_content = self.read_html(response)
 
-        if not response.text:
+        if not html_content:
             return "", None
 
-        published_date = self.get_last_modified(response)
-        return response.text, published_date
+        return html_content, self.get_last_modified(response)
+
+    def set_last_modified(self, url: str, modified: datetime | str):
+        """
+        Store the last modified time of a page for the conditional
+        request of its next fetch. Only called once the page is pushed,
+        a page stored at fetch time would be skipped (304) by the next
+        pull even if this one failed before the push.
+
+        Args:
+            url: Article URL
+            modified: Last-Modified of the page, or the time it was fetched
+        """
+        if isinstance(modified, datetime):
+            modified = modified.isoformat()
+
+        url_id = utils.hashcode_md5(self.clean_url(url).encode("utf-8"))
+        self._get_db().set_web_last_modified(
+            url_id, modified, expired_time=WEB_LAST_MODIFIED_TTL)
+
+    def read_html(self, response: requests.Response) -> str:
+        """
+        Read the body of a streamed response as html text.
+
+        Non-html responses (e.g. pdf, video links) and ones declared
+        larger than max_bytes are dropped without downloading them, other
+        bodies are read up to max_bytes.
+
+        Returns:
+            Decoded html, or "" if skipped
+        """
+        url = response.url
+        content_type = response.headers.get("Content-Type", "")
+
+        if content_type and not content_type.lower().startswith(HTML_CONTENT_TYPES):
+            print(f"[WebCollectorBase] Skip non-html content ({content_type}): {url}")
+            response.close()
+            return ""
+
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            print(f"[WebCollectorBase] Skip large content ({content_length} bytes): {url}")
+            response.close()
+            return ""
+
+        chunks = []
+        total = 0
+
+        for chunk in response.iter_content(65536):
+            chunks.append(chunk)
+            total += len(chunk)
+
+            if total >= self.max_bytes:
+                print(f"[WebCollectorBase] Content truncated at {total} bytes: {url}")
+                break
+
+        response.close()
+        body = b"".join(chunks)
+
+        if not body:
+            print(f"[WebCollectorBase] Response 200 OK but no content: {url}")
+            return ""
+
+        # Same decoding as response.text
+        encoding = response.encoding or requests.compat.chardet.detect(body)["encoding"]
+        try:
+            return str(body, encoding or "utf-8", errors="replace")
+        except LookupError:
+            return str(body, errors="replace")
 
     def xpath_extraction(
         self,
-        html_content: str,
+        html_content: str | lxml.html.HtmlElement,
         xpath: str,
         get_text: bool = True
     ) -> str | None:
@@ -198,105 +395,123 @@ class WebCollectorBase(OperatorBase):
         Extract content using XPath.
 
         Args:
-            html_content: HTML string
+            html_content: HTML string or already parsed tree
             xpath: XPath expression
             get_text: If True, return text content; otherwise return HTML
 
         Returns:
             Extracted content or None if not found
         """
-        print(f"[WebCollectorBase] XPath extraction: {xpath}")
-        try:
-            document = lxml.html.fromstring(html_content)
-            elements = document.xpath(xpath)
-
-            if not elements:
-                print(f"[WebCollectorBase] No content found for XPath: {xpath}")
-                return None
-
-            first_element = elements[0]
-            if get_text:
-                return first_element.text_content()
+        return xpath_extraction(html_content, xpath, get_text)
 
-            return lxml.html.tostring(first_element, encoding='unicode')
-
-        except Exception as e:
-            print(f"[WebCollectorBase] XPath extraction error: {e}")
-            return None
-
-    def extract_meta(self, html_content: str, url: str) -> tuple[str, str]:
+    def extract_meta(self, html_content: str | lxml.html.HtmlElement, url: str) -> tuple[str, str]:
         """
         Extract metadata (author, title) from HTML using trafilatura.
 
         Args:
-            html_content: HTML string
+            html_content: HTML string or already parsed tree
             url: Source URL
 
         Returns:
             Tuple of (author, title)
         """
-        metadata = extract_metadata(html_content, default_url=url)
-        if metadata is None:
-            return "", ""
+        return extract_meta(html_content, url)
 
-        meta_dict = metadata.as_dict()
-        author = meta_dict.get("author", "") or ""
-        title = meta_dict.get("title", "") or ""
-
-        return author, title
-
-    def extract_web_content(self, url: str, xpath: str = "") -> dict[str, Any]:
+    def extract_web_content(
+        self,
+        url: str,
+        xpath: str = "",
+        browser: bool | None = None
+    ) -> dict[str, Any]:
         """
         Extract full article content from URL using trafilatura.
 
         Args:
             url: Article URL
             xpath: Optional XPath for content extraction
+            browser: Override browser_mode for this url
 
         Returns:
-            Dict with keys: author, title, content, published_date, language
+            Dict with keys: author, title, content, published_date,
+            language, not_modified (empty content, the page did not
+            change since the last fetch)
         """
-        html_content, published_date = self.fetch_article_content(url)
+        if browser is None:
+            browser = self.browser_mode
 
-        if not html_content:
-            return {
-                "author": "",
-                "title": "",
-                "content": "",
-                "published_date": None,
-                "language": ""
-            }
+        key = (url, xpath, browser)
+        with _EXTRACT_CACHE_LOCK:
+            cached = _EXTRACT_CACHE.get(key)
+            if cached and time.monotonic() - cached[0] < WEB_EXTRACT_CACHE_TTL:
+                _EXTRACT_CACHE.move_to_end(key)
+                print(f"[WebCollectorBase] Found extracted article from cache: {url}")
+                return dict(cached[1])
 
-        # Extract content using XPath or trafilatura
-        content = ""
-        if xpath:
-            content = self.xpath_extraction(html_content, xpath) or ""
-        else:
-            content = extract(html_content, url=url) or ""
+        html_content, published_date = self.fetch_article_content(url, browser=browser)
 
-        if not content:
+        if not html_content:
             return {
                 "author": "",
                 "title": "",
                 "content": "",
-                "published_date": published_date,
-                "language": ""
+                "published_date": None,
+                "language": "",
+                "not_modified": html_content is None
             }
 
-        # Extract metadata
-        author, title = self.extract_meta(html_content, url)
+        article = self.parse_article(html_content, url, xpath)
 
-        return {
-            "author": author,
-            "title": title,
-            "content": content,
+        result = {
+            "author": article["author"],
+            "title": article["title"],
+            "content": article["content"],
             "published_date": published_date,
-            "language": ""
+            "language": "",
+            "not_modified": False
         }
 
+        if result["content"]:
+            with _EXTRACT_CACHE_LOCK:
+                _EXTRACT_CACHE[key] = (time.monotonic(), result)
+                _EXTRACT_CACHE.move_to_end(key)
+
+                if len(_EXTRACT_CACHE) > _EXTRACT_CACHE_MAXSIZE:
+                    _EXTRACT_CACHE.popitem(last=False)
+
+        return dict(result)
+
+    def parse_article(self, html_content: str, url: str, xpath: str = "") -> dict[str, str]:
+        """
+        Extract article content and metadata from the fetched html.
+
+        The extraction is CPU bound and holds the GIL, with
+        WEB_PARSE_WORKERS > 0 it runs in a shared process pool instead,
+        so concurrent fetches are not serialized on it.
+
+        Returns:
+            Dict with keys: author, title, content
+        """
+        pool = _get_parse_pool()
+        if pool is None:
+            return parse_article(html_content, url, xpath)
+
+        try:
+            future = pool.submit(parse_article, html_content, url, xpath)
+            return future.result(timeout=self.parse_timeout)
+
+        except FuturesTimeoutError:
+            future.cancel()
+            print(f"[WebCollectorBase] Parsing {url} timed out after {self.parse_timeout}s, skip")
+            return {"author": "", "title": "", "content": ""}
+
+        except BrokenProcessPool as e:
+            print(f"[WebCollectorBase] Parse pool is broken, parsing {url} in process: {e}")
+            return parse_article(html_content, url, xpath)
+
     def clean_url(self, url: str) -> str:
         """Remove query params and fragments from URL"""
-        return url.split("?")[0].split("#")[0]
+        # partition doesn't build the list of all the parts
+        return url.partition("?")[0].partition("#")[0]
 
     def get_urls_from_html(self, base_url: str, html_content: str) -> list[str]:
         """
@@ -309,34 +524,98 @@ class WebCollectorBase(OperatorBase):
         Returns:
             List of absolute URLs
         """
-        soup = BeautifulSoup(html_content, "html.parser")
+        # Index pages repeat the same hrefs a lot (nav, "read more"),
+        # join each distinct one only once
+        joined = {}
         urls = []
 
-        for a in soup.find_all("a", href=True):
-            if isinstance(a, Tag) and a.has_attr("href"):
-                href = a["href"]
-                if isinstance(href, str):
-                    absolute_url = urljoin(base_url, href)
-                    urls.append(absolute_url)
+        # Streamed: every element is dropped once parsed, so the memory
+        # stays flat on big index pages instead of holding their tree
+        events = lxml.etree.iterparse(
+            io.BytesIO(html_content.encode("utf-8")),
+            events=("end",),
+            html=True,
+            encoding="utf-8",
+            remove_comments=True,
+            collect_ids=False)
+
+        try:
+            for _, el in events:
+                if el.tag == "a":
+                    href = (el.get("href") or "").strip()
+
+                    if href and not href.startswith(NON_PAGE_HREF_PREFIXES):
+                        absolute_url = joined.get(href)
+                        if absolute_url is None:
+                            absolute_url = joined[href] = urljoin(base_url, href)
+
+                        urls.append(absolute_url)
+
+                el.clear(keep_tail=True)
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+
+        except lxml.etree.LxmlError as e:
+            print(f"[WebCollectorBase] Failed to parse html from {base_url}: {e}")
 
         return urls
 
-    def create_news_item(self, url: str, xpath: str = "") -> dict[str, Any]:
+    def filter_digest_urls(self, index_url: str, urls: list[str]) -> list[str]:
+        """
+        Drop the digest links not worth fetching: repeated ones (same
+        url without query/fragment, the first one is kept), assets, and
+        off-host ones if digest_same_host is enabled.
+
+        Args:
+            index_url: URL of the index/digest page
+            urls: Absolute URLs found in the index page
+
+        Returns:
+            Filtered URLs, in order
+        """
+        index_host = urlparse(index_url).netloc
+        seen = set()
+        filtered = []
+
+        for url in urls:
+            key = self.clean_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            parsed = urlparse(url)
+            if parsed.path.lower().endswith(ASSET_EXTENSIONS):
+                continue
+
+            if self.digest_same_host and parsed.netloc != index_host:
+                continue
+
+            filtered.append(url)
+
+        return filtered
+
+    def create_news_item(
+        self,
+        url: str,
+        xpath: str = "",
+        browser: bool | None = None
+    ) -> dict[str, Any]:
         """
         Create a news item dict from URL.
 
         Args:
             url: Article URL
             xpath: Optional XPath for content extraction
+            browser: Override browser_mode for this url
 
         Returns:
             News item dict
         """
-        web_content = self.extract_web_content(url, xpath)
+        web_content = self.extract_web_content(url, xpath, browser=browser)
 
         # Generate hash for dedup
-        for_hash = f"{web_content['author']}{web_content['title']}{self.clean_url(url)}"
-        content_hash = hashlib.sha256(for_hash.encode()).hexdigest()
+        content_hash = _content_hash(
+            web_content["author"], web_content["title"], self.clean_url(url))
 
         return {
             "id": content_hash,
@@ -347,6 +626,7 @@ class WebCollectorBase(OperatorBase):
             "url": url,
             "published_date": web_content["published_date"],
             "language": web_content["language"],
+            "not_modified": web_content["not_modified"],
         }
 
     def parse_digests(self, index_url: str, xpath: str = "") -> list[dict]:
@@ -374,22 +654,59 @@ class WebCollectorBase(OperatorBase):
             return []
 
         # Extract URLs from index page
-        self.split_digest_urls = self.get_urls_from_html(index_url, html_content)
+        self.split_digest_urls = self.filter_digest_urls(
+            index_url, self.get_urls_from_html(index_url, html_content))
         print(f"[WebCollectorBase] Found {len(self.split_digest_urls)} URLs in digest")
 
         # Fetch each article
-        news_items = []
         max_items = min(len(self.split_digest_urls), self.digest_splitting_limit)
+        urls = self.split_digest_urls[:max_items]
 
-        for url in self.split_digest_urls[:max_items]:
+        def _create_one(url, browser=None):
             try:
-                news_item = self.create_news_item(url, xpath)
+                news_item = self.create_news_item(url, xpath, browser=browser)
                 if news_item["content"]:  # Only add if content was extracted
-                    news_items.append(news_item)
                     print(f"[WebCollectorBase] Extracted: {news_item['title'][:50]}...")
+                    return news_item
+
+                # Unchanged (304) since the last pull, kept out of the
+                # browser fallback and of the results below
+                if news_item["not_modified"]:
+                    return news_item
             except Exception as e:
                 print(f"[WebCollectorBase] Failed to parse {url}: {e}")
-                continue
+
+            return None
+
+        # The linked articles are independent, fetch them concurrently
+        # (in order)
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            results = list(executor.map(
+                lambda url: _create_one(url, browser=False), urls))
+
+        # Most linked articles are static even if the index page needs a
+        # browser, only the ones a plain request got nothing from (not
+        # the unchanged ones) are loaded again with it. As many as the browser pool takes at
+        # once, serially without a pool
+        retry = [i for i, item in enumerate(results) if not item]
+
+        if self.browser_mode and retry:
+            for i in retry:
+                print(f"[WebCollectorBase] Fallback to browser mode: {urls[i]}")
+
+            self.init_playwright()
+            pool = self.playwright_manager and self.playwright_manager.pool
+
+            if pool:
+                with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                    retried = list(executor.map(_create_one, [urls[i] for i in retry]))
+            else:
+                retried = [_create_one(urls[i]) for i in retry]
+
+            for i, item in zip(retry, retried):
+                results[i] = item
+
+        news_items = [item for item in results if item and item["content"]]
 
         print(f"[WebCollectorBase] Extracted {len(news_items)} articles from digest")
         return news_items
@@ -405,6 +722,7 @@ class WebCollectorBase(OperatorBase):
             "browser_mode": True,
             "digest_splitting": True,
             "digest_limit": 30,
+            "digest_same_host": False,
             "proxy": "http://proxy:8080",
             "user_agent": "Custom/1.0",
             "headers": {"Authorization": "Bearer xxx"}
@@ -414,6 +732,7 @@ class WebCollectorBase(OperatorBase):
         self.browser_mode = source.get("browser_mode", False)
         self.digest_splitting = source.get("digest_splitting", False)
         self.digest_splitting_limit = source.get("digest_limit", 30)
+        self.digest_same_host = source.get("digest_same_host", False)
 
         if proxy := source.get("proxy"):
             self.set_proxies(proxy)
@@ -164,6 +164,7 @@ class OperatorYoutube(OperatorBase):
         client = DBClient()
         redis_key_expire_time = os.getenv(
             "BOT_REDIS_KEY_EXPIRE_TIME", 604800)
+        openai_fallback = os.getenv("LLM_PROVIDER", "") != "openai"
 
         summarized_pages = []
 
@@ -202,7 +203,7 @@ class OperatorYoutube(OperatorBase):
                 except Exception as e:
                     print(f"[ERROR] Exception during llm_agent.run(): {e}")
 
-                if not summary and os.getenv("LLM_PROVIDER", "") != "openai":
+                if not summary and openai_fallback:
                     print("Fallback to OpenAI")
                     fallback_agent = LLMAgentSummary()
                     fallback_agent.init_prompt()
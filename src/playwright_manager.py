@@ -4,14 +4,252 @@ Playwright browser automation manager for web scraping.
 Ported from Taranis AI's playwright_manager.py with adaptations for Auto-News.
 """
 
+import atexit
+import hashlib
+import os
+import queue
+import re
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
 from urllib.parse import urlparse
 
-from playwright.sync_api import BrowserContext, TimeoutError, sync_playwright
+from playwright.sync_api import Browser, BrowserContext, TimeoutError, sync_playwright
+
+from db_cli import DBClient
+import utils
+
+
+# Subresources which never contribute to the article text
+DEFAULT_BLOCK_RESOURCES = frozenset({"image", "media", "font"})
+
+# Extra wait after DOMContentLoaded, for the rendering scripts
+PAGE_SETTLE_MS = 500
+
+# Nodes removed from the rendered page before it is serialized, they
+# never hold article text (json-ld scripts are kept for the metadata)
+DEFAULT_STRIP_SELECTORS = (
+    "script:not([type='application/ld+json'])",
+    "style",
+    "noscript",
+    "iframe",
+    "svg",
+)
+
+_STRIP_NODES_JS = "sels => sels.forEach(s => document.querySelectorAll(s).forEach(n => n.remove()))"
+
+# Serialized in the page, page.content() also walks the frames to
+# check the document is settled, which costs a round-trip on big pages
+_OUTER_HTML_JS = "() => document.documentElement.outerHTML"
+
+# Trackers and ads, blocked whatever their resource type
+BLOCK_HOSTS_RE = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net|"
+    r"googlesyndication\.com|hotjar\.com|segment\.(?:io|com)|"
+    r"facebook\.net|scorecardresearch\.com"
+)
+
+# The browser is launched once and shared by all the managers. Objects
+# of the sync API belong to the thread that created them, so each
+# thread launches (and reuses) its own
+_local = threading.local()
+
+
+def _get_browser() -> Browser:
+    """Launch the browser of the calling thread on first use."""
+    browser = getattr(_local, "browser", None)
+    if browser is not None and browser.is_connected():
+        return browser
+
+    if getattr(_local, "playwright", None) is None:
+        _local.playwright = sync_playwright().start()
+
+    _local.browser = _local.playwright.chromium.launch(headless=True)
+    print("[PlaywrightManager] Browser launched")
+
+    return _local.browser
+
+
+def _get_persistent_context(user_data_dir: str, proxy: dict | None = None) -> BrowserContext:
+    """
+    Launch (on first use) the browser of the calling thread with a
+    persistent profile, one per proxy, its HTTP cache is kept across
+    fetches and runs.
+    """
+    contexts = getattr(_local, "contexts", None)
+    if contexts is None:
+        contexts = _local.contexts = {}
+
+    server = proxy["server"] if proxy else ""
+    if context := contexts.get(server):
+        return context
+
+    if getattr(_local, "playwright", None) is None:
+        _local.playwright = sync_playwright().start()
+
+    # A profile can't be opened by two browsers, nor be shared by
+    # different proxies
+    profile = hashlib.md5(f"{threading.current_thread().name}|{server}".encode("utf-8")).hexdigest()
+
+    options = {"headless": True}
+    if proxy:
+        options["proxy"] = proxy
+
+    context = _local.playwright.chromium.launch_persistent_context(
+        os.path.join(user_data_dir, profile), **options)
+    print(f"[PlaywrightManager] Browser launched with profile: {profile}")
+
+    contexts[server] = context
+    return context
+
+
+def stop_browser() -> None:
+    """Close the browser (and Playwright) of the calling thread."""
+    browser = getattr(_local, "browser", None)
+    contexts = getattr(_local, "contexts", None) or {}
+    playwright = getattr(_local, "playwright", None)
+    _local.browser = _local.contexts = _local.playwright = None
+    _local.context_headers = {}
+
+    for context in contexts.values():
+        try:
+            context.close()
+            print("[PlaywrightManager] Persistent context closed")
+        except Exception as e:
+            print(f"[PlaywrightManager] Error closing persistent context: {e}")
+
+    try:
+        if browser:
+            browser.close()
+            print("[PlaywrightManager] Browser closed")
+    except Exception as e:
+        print(f"[PlaywrightManager] Error closing browser: {e}")
+
+    try:
+        if playwright:
+            playwright.stop()
+            print("[PlaywrightManager] Playwright stopped")
+    except Exception as e:
+        print(f"[PlaywrightManager] Error stopping playwright: {e}")
+
+
+atexit.register(stop_browser)
+
+
+class PlaywrightBrowserPool:
+    """
+    A fixed set of worker threads, each owning a browser (launched on
+    its first fetch), which run the fetches handed to them. This lets
+    several threads fetch JavaScript-rendered pages concurrently, the
+    sync API objects never leave the worker that created them.
+
+    The workers are only started by the first fetch, a pool that is
+    never used costs nothing.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._jobs = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._workers:
+                return
+
+            self._workers = [
+                threading.Thread(target=self._work, name=f"playwright-{i}", daemon=True)
+                for i in range(self.size)
+            ]
+
+            for worker in self._workers:
+                worker.start()
+
+    def _work(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                stop_browser()
+                return
+
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def run(self, fn, *args):
+        """Run fn(*args) on the next free worker and wait for the result."""
+        if not self._workers:
+            self._start()
+
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future.result()
+
+    def close(self) -> None:
+        """Close the browsers and stop the workers."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+
+        for _ in workers:
+            self._jobs.put(None)
+
+        for worker in workers:
+            worker.join(timeout=30)
+
+
+# Shared by all the managers and created on first use, None if
+# WEB_BROWSER_WORKERS is 0 (each thread then uses its own browser)
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> PlaywrightBrowserPool | None:
+    global _browser_pool
+
+    workers = int(os.getenv("WEB_BROWSER_WORKERS", 2))
+    if workers <= 0:
+        return None
+
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = PlaywrightBrowserPool(workers)
+            atexit.register(_browser_pool.close)
+
+        return _browser_pool
+
+
+@lru_cache(maxsize=32)
+def _parse_proxy_url(http_proxy: str) -> dict:
+    """
+    Playwright proxy settings of a proxy url, parsed once per url (the
+    managers of the sources sharing a proxy reuse it). Don't mutate it.
+    """
+    parsed_url = urlparse(http_proxy)
+    username = parsed_url.username or ""
+    password = parsed_url.password or ""
+
+    print(f"[PlaywrightManager] Setting up proxy: {parsed_url.hostname}")
+
+    return {
+        "server": http_proxy,
+        "username": username,
+        "password": password
+    }
 
 
 class PlaywrightManager:
     """
-    Manages Playwright browser instance for JavaScript-rendered page scraping.
+    Fetches JavaScript-rendered pages with the shared browser. By
+    default every fetch runs in a fresh context (no cookies/storage
+    leak between pages), closed right after. With persistent, pages
+    are opened in a persistent context instead, so the assets cached
+    by a page are reused by the next ones.
 
     Usage:
         manager = PlaywrightManager()
@@ -19,27 +257,129 @@ class PlaywrightManager:
         manager.stop_playwright_if_needed()
     """
 
-    def __init__(self, proxies: dict | None = None, headers: dict | None = None) -> None:
+    def __init__(
+        self,
+        proxies: dict | None = None,
+        headers: dict | None = None,
+        pool: PlaywrightBrowserPool | None = None,
+        persistent: bool = False,
+        user_data_dir: str | None = None,
+        block_resources: set[str] | None = None,
+        cache_enabled: bool = False,
+        ttl_seconds: int = 3600
+    ) -> None:
         """
         Initialize Playwright with optional proxy and headers.
 
         Args:
             proxies: Dict with http/https proxy URLs, e.g. {"http": "http://proxy:8080"}
             headers: Additional HTTP headers to send with requests
+            pool: Run the fetches on the browsers of this pool, instead
+                of the browser of the calling thread
+            persistent: Fetch in a persistent context (user data dir),
+                the HTTP cache and cookies are kept across fetches,
+                sources and runs
+            user_data_dir: Root folder of the persistent profiles
+            block_resources: Resource types not loaded by the pages
+                (stylesheets are also dropped when no XPath is waited
+                for), defaults to DEFAULT_BLOCK_RESOURCES
+            cache_enabled: Keep the rendered pages in redis, a page
+                fetched again is not rendered again (until ttl_seconds,
+                even if it changed meanwhile)
+            ttl_seconds: How long the rendered pages are kept
+        """
+        self.pool = pool
+        self.persistent = persistent
+        self.user_data_dir = user_data_dir or "/tmp/auto-news-pw"
+        self.block_resources = set(
+            DEFAULT_BLOCK_RESOURCES if block_resources is None else block_resources)
+        self.cache_enabled = cache_enabled and ttl_seconds > 0
+        self.ttl_seconds = ttl_seconds
+        self._db = None
+        self.configure(proxies, headers)
+
+    def configure(self, proxies: dict | None = None, headers: dict | None = None) -> None:
+        """
+        Set the proxy and headers of the next fetches.
+
+        Args:
+            proxies: Dict with http/https proxy URLs
+            headers: Additional HTTP headers to send with requests
+        """
+        self.proxies = proxies
+        self.headers = headers
+        self._proxy = self._parse_proxies(proxies)
+
+        # Unset headers are left out, the others are still sent
+        self._extra_headers = {
+            k: v for k, v in (headers or {}).items() if v is not None
+        }
+
+    def _setup_context(self) -> BrowserContext:
+        """Create browser context with the proxy and optional extra headers."""
+        options = {}
+        if self._proxy:
+            options["proxy"] = self._proxy
+        if self._extra_headers:
+            options["extra_http_headers"] = self._extra_headers
+
+        return _get_browser().new_context(**options)
+
+    def _open_page(
+        self,
+        xpath: str = "",
+        load_media: bool = False,
+        load_stylesheets: bool | None = None
+    ):
+        """
+        Open a page for one fetch, see fetch_content_with_js for the
+        resource options.
+
+        Returns:
+            Tuple of (page, what to close after the fetch)
         """
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=True,
-            proxy=self._parse_proxies(proxies)
-        )
-        self.context = self._setup_context(headers)
-        self.page = self.context.new_page()
-
-    def _setup_context(self, headers: dict | None = None) -> BrowserContext:
-        """Create browser context with optional extra headers."""
-        if headers and None not in headers.values():
-            return self.browser.new_context(extra_http_headers=headers)
-        return self.browser.new_context()
+        page = owner = None
+
+        if self.persistent:
+            try:
+                context = _get_persistent_context(self.user_data_dir, self._proxy)
+            except Exception as e:
+                print(f"[PlaywrightManager] Persistent context unavailable, use a fresh one: {e}")
+            else:
+                # The context is shared by the managers of this thread,
+                # only update its headers when they differ, the next
+                # navigation carries them
+                applied = _local.__dict__.setdefault("context_headers", {})
+                if applied.get(id(context)) != self._extra_headers:
+                    context.set_extra_http_headers(self._extra_headers)
+                    applied[id(context)] = self._extra_headers
+
+                page = owner = context.new_page()
+
+        if page is None:
+            owner = self._setup_context()
+            page = owner.new_page()
+
+        blocked = set(self.block_resources)
+        if load_media:
+            blocked -= DEFAULT_BLOCK_RESOURCES
+
+        # Stylesheets may decide whether the awaited element is visible
+        if load_stylesheets is None:
+            load_stylesheets = bool(xpath)
+
+        if not load_stylesheets:
+            blocked.add("stylesheet")
+
+        def _route(route):
+            request = route.request
+            if request.resource_type in blocked or BLOCK_HOSTS_RE.search(request.url):
+                route.abort()
+            else:
+                route.continue_()
+
+        page.route("**/*", _route)
+        return page, owner
 
     def _parse_proxies(self, proxies: dict | None = None) -> dict | None:
         """Parse proxy dict into Playwright proxy format."""
@@ -47,19 +387,20 @@ class PlaywrightManager:
         if not http_proxy:
             return None
 
-        parsed_url = urlparse(http_proxy)
-        username = parsed_url.username or ""
-        password = parsed_url.password or ""
-
-        print(f"[PlaywrightManager] Setting up proxy: {parsed_url.hostname}")
+        return _parse_proxy_url(http_proxy)
 
-        return {
-            "server": http_proxy,
-            "username": username,
-            "password": password
-        }
-
-    def fetch_content_with_js(self, url: str, xpath: str = "", timeout: int = 30000) -> str:
+    def fetch_content_with_js(
+        self,
+        url: str,
+        xpath: str = "",
+        timeout: int = 30000,
+        wait_until: str = "domcontentloaded",
+        return_subtree: bool = False,
+        strip_selectors: tuple[str, ...] | None = DEFAULT_STRIP_SELECTORS,
+        use_fast_content: bool = True,
+        load_media: bool = False,
+        load_stylesheets: bool | None = None
+    ) -> str:
         """
         Fetch page content after JavaScript execution.
 
@@ -67,56 +408,116 @@ class PlaywrightManager:
             url: The URL to fetch
             xpath: Optional XPath to wait for specific element
             timeout: Page load timeout in milliseconds
+            wait_until: Load state to wait for without XPath, pages
+                which keep polling never reach "networkidle"
+            return_subtree: With xpath, return only the html of the
+                matched element instead of the whole page
+            strip_selectors: CSS selectors of the nodes removed from the
+                page before it is serialized
+            use_fast_content: Serialize the document with outerHTML
+                (no doctype) instead of page.content()
+            load_media: Load the images, media and fonts blocked by
+                default (see block_resources)
+            load_stylesheets: Load the stylesheets, by default only
+                when an XPath is waited for
 
         Returns:
-            HTML content of the page
+            HTML content of the page (or of the XPath element)
         """
+        args = (url, xpath, timeout, wait_until, return_subtree,
+                tuple(strip_selectors or ()), use_fast_content,
+                load_media, load_stylesheets)
+
+        if self.cache_enabled:
+            if self._db is None:
+                self._db = DBClient()
+
+            # Every argument, the proxy (geo-dependent pages) and the
+            # headers (e.g. cookies, language) change the rendered page
+            page_id = hashlib.sha256(repr((
+                args,
+                (self._proxy or {}).get("server"),
+                sorted(self._extra_headers.items()),
+            )).encode("utf-8")).hexdigest()
+            if content := utils.bytes2str(self._db.get_web_rendered_page(page_id)):
+                print(f"[PlaywrightManager] Found rendered page from cache: {url}")
+                return content
+
+        if self.pool:
+            content = self.pool.run(self._fetch_content, *args)
+        else:
+            content = self._fetch_content(*args)
+
+        if self.cache_enabled and content:
+            self._db.set_web_rendered_page(
+                page_id, content, expired_time=self.ttl_seconds)
+
+        return content
+
+    def _fetch_content(
+        self,
+        url: str,
+        xpath: str,
+        timeout: int,
+        wait_until: str,
+        return_subtree: bool,
+        strip_selectors: tuple[str, ...],
+        use_fast_content: bool,
+        load_media: bool,
+        load_stylesheets: bool | None
+    ) -> str:
         print(f"[PlaywrightManager] Fetching with JS: {url}, xpath={xpath}")
 
-        try:
-            self.page.goto(url, timeout=timeout)
+        page, owner = self._open_page(xpath, load_media, load_stylesheets)
+        page.set_default_timeout(timeout)
 
+        try:
             if xpath:
                 # Wait for specific element if XPath provided
-                locator = self.page.locator(f"xpath={xpath}")
-                locator.wait_for(state="visible", timeout=timeout)
+                page.goto(url, wait_until="domcontentloaded")
+                locator = page.locator(f"xpath={xpath}").first
+                locator.wait_for(state="visible")
+
+                if return_subtree:
+                    # The element itself is kept, so the same XPath
+                    # still matches in the returned html
+                    return locator.evaluate("node => node.outerHTML") or ""
             else:
-                # Wait for network to be idle
-                self.page.wait_for_load_state("networkidle", timeout=timeout)
+                page.goto(url, wait_until=wait_until)
+                if wait_until != "networkidle":
+                    # Short settle for the scripts rendering the content
+                    page.wait_for_timeout(PAGE_SETTLE_MS)
+
+            if strip_selectors:
+                page.evaluate(_STRIP_NODES_JS, list(strip_selectors))
 
-            return self.page.content() or ""
+            if use_fast_content:
+                return page.evaluate(_OUTER_HTML_JS) or ""
+
+            return page.content() or ""
 
         except TimeoutError as e:
             print(f"[PlaywrightManager] Timeout fetching {url}: {e}")
             # Return whatever content we have
-            return self.page.content() or ""
+            return page.content() or ""
 
         except Exception as e:
             print(f"[PlaywrightManager] Error fetching {url}: {e}")
             return ""
 
-    def stop_playwright_if_needed(self) -> None:
-        """Clean up Playwright resources."""
-        try:
-            if self.context:
-                self.context.close()
-                print("[PlaywrightManager] Context closed")
-        except Exception as e:
-            print(f"[PlaywrightManager] Error closing context: {e}")
-
-        try:
-            if self.browser:
-                self.browser.close()
-                print("[PlaywrightManager] Browser closed")
-        except Exception as e:
-            print(f"[PlaywrightManager] Error closing browser: {e}")
+        finally:
+            try:
+                owner.close()
+            except Exception as e:
+                print(f"[PlaywrightManager] Error closing page: {e}")
 
-        try:
-            if self.playwright:
-                self.playwright.stop()
-                print("[PlaywrightManager] Playwright stopped")
-        except Exception as e:
-            print(f"[PlaywrightManager] Error stopping playwright: {e}")
+    def stop_playwright_if_needed(self) -> None:
+        """
+        Release the manager. The shared browser keeps running for the
+        next managers, it is closed at exit (see stop_browser).
+        """
+        self.proxies = self.headers = self._proxy = None
+        self._extra_headers = {}
 
     def __enter__(self):
         """Context manager entry."""
@@ -27,6 +27,22 @@ class RedisClient:
 
         return data
 
+    def mget(self, keys: list):
+        """
+        Get several keys in one round-trip
+
+        @return values in the order of keys, None for missing ones
+        """
+        if not keys:
+            return []
+
+        try:
+            return self.api.mget(keys)
+        except Exception as e:
+            print(f"[ERROR]: Redis client failed to mget {len(keys)} keys: {e}")
+
+        return [None] * len(keys)
+
     def set(self, key: str, val: str, **kwargs):
         """
         expired_time: the key will be expired after expired_time seconds
@@ -48,3 +64,35 @@ class RedisClient:
         except Exception as e:
             print(f"[ERROR]: Redis client failed to set key {key} and val {val}: {e}")
             return False
+
+    def mset(self, pairs: list, **kwargs):
+        """
+        Set several keys in one round-trip (pipelined, not a
+        transaction), with the same options as set()
+
+        pairs: [(key, val), ...]
+        """
+        if not pairs:
+            return True
+
+        expired_time = kwargs.setdefault("expired_time", 0)
+        overwrite = kwargs.setdefault("overwrite", False)
+        print(f"[Redis Client] Set {len(pairs)} keys, expired_time: {expired_time}, overwrite: {overwrite}")
+
+        try:
+            pipe = self.api.pipeline(transaction=False)
+
+            for key, val in pairs:
+                if expired_time <= 0:
+                    if overwrite:
+                        pipe.set(key, val)
+                    else:
+                        pipe.setnx(key, val)
+                else:
+                    pipe.setex(key, int(expired_time), val)
+
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"[ERROR]: Redis client failed to set {len(pairs)} keys: {e}")
+            return False
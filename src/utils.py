@@ -4,21 +4,59 @@ import time
 import hashlib
 import traceback
 import subprocess
+import threading
 from datetime import datetime
 from operator import itemgetter
 
 import pytz
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import orjson
 
 from db_cli import DBClient
 from llm_agent import (
     LLMWebLoader,
-    LLMYoutubeLoader
+    LLMYoutubeLoader,
+    web_loader_headers
 )
 
 from ops_audio2text import OperatorAudioToText
 
 
+# Shared HTTP session, keep-alive connections are reused across calls.
+# Besides connection errors, idempotent requests are retried (with
+# backoff) on transient gateway errors, the last response is returned.
+# The timeout applies per attempt, so a request may take up to about
+# 3x its timeout (plus 0.6s of backoff) before it fails
+_HTTP_RETRY = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("http://", HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=_HTTP_RETRY))
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=_HTTP_RETRY))
+
+# Same pooling for load_web, with the browser-like headers of the web
+# loader (a bare requests User-Agent gets blocked by many sites). Built
+# on first use, picking the User-Agent is not free
+_web_loader_session = None
+_web_loader_session_lock = threading.Lock()
+
+
+def get_web_loader_session():
+    global _web_loader_session
+
+    with _web_loader_session_lock:
+        if _web_loader_session is None:
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=_HTTP_RETRY))
+            session.mount("https://", HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=_HTTP_RETRY))
+            session.headers.update(web_loader_headers())
+            _web_loader_session = session
+
+    return _web_loader_session
+
+
 def str2bool(v):
     if isinstance(v, bool):
         return v
@@ -38,14 +76,29 @@ def gen_filename(data_folder, filename):
 
 
 def save_data_json(full_path, data):
-    with open(full_path, "w") as out_file:
-        json.dump(data, out_file)
+    try:
+        payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # e.g. integers beyond 64-bit, let the stdlib handle it
+        with open(full_path, "w") as out_file:
+            json.dump(data, out_file)
+        return
+
+    with open(full_path, "wb") as out_file:
+        out_file.write(payload)
 
 
 def read_data_json(full_path):
     if not os.path.exists(full_path):
         return {}
 
+    with open(full_path, "rb") as f:
+        try:
+            return orjson.loads(f.read())
+        except orjson.JSONDecodeError:
+            # e.g. NaN written by the stdlib encoder
+            pass
+
     f = open(full_path, "r")
     data = json.load(f)
     f.close()
@@ -91,10 +144,17 @@ def fix_and_parse_json(data):
 
     res = None
 
+    # Well-formed payloads (the common case) parse directly, the
+    # repair pass only runs when that fails
+    try:
+        return orjson.loads(data)
+    except (orjson.JSONDecodeError, TypeError):
+        # TypeError: not str/bytes, the repair pass reports it
+        pass
+
     try:
         data = bytes2str(data)
-        fixed = fix_json_str(data)
-        res = json.loads(fixed)
+        res = orjson.loads(fix_json_str(data))
         return res
     except Exception as e:
         print(f"[ERROR]: cannot parse json string: {data}, error: {e}")
@@ -138,7 +198,7 @@ def urlGet(url, timeout=3):
         return False, {}
 
     try:
-        resp = requests.get(url, timeout=timeout)
+        resp = HTTP_SESSION.get(url, timeout=timeout)
         return True, resp
     except Exception as e:
         print(f"[ERROR] urlGet failed: {e}")
@@ -150,7 +210,7 @@ def urlHead(url, timeout=3, allow_redirects=True):
         return False, {}
 
     try:
-        resp = requests.head(url, timeout=timeout, allow_redirects=allow_redirects)
+        resp = HTTP_SESSION.head(url, timeout=timeout, allow_redirects=allow_redirects)
         return True, resp
     except Exception as e:
         print(f"[ERROR] urlHead failed: {e}")
@@ -215,12 +275,47 @@ def get_notion_database_pages_inbox(
     return db_pages
 
 
+# Notion index lookups rarely change within a run, keep them for a while
+# instead of hitting MySQL/Notion for every push
+NOTION_INDEX_CACHE_TTL = int(os.getenv("NOTION_INDEX_CACHE_TTL", 300))
+_notion_index_cache = {}
+
+
+def get_notion_index_cache(key):
+    """
+    @return the value cached under key, None if missing or older than
+            NOTION_INDEX_CACHE_TTL seconds
+    """
+    cached = _notion_index_cache.get(key)
+    if cached and time.time() - cached[1] < NOTION_INDEX_CACHE_TTL:
+        return cached[0]
+
+    return None
+
+
+def set_notion_index_cache(key, value):
+    _notion_index_cache[key] = (value, time.time())
+
+
 def get_notion_database_pages_toread(notion_agent, db_index_id):
+    """
+    Query the ToRead index database, the result is cached for
+    NOTION_INDEX_CACHE_TTL seconds to save Notion API round-trips
+
+    @return a copy of the cached page list
+    """
+    cached = get_notion_index_cache(("toread_pages", db_index_id))
+    if cached:
+        return list(cached)
+
     db_pages = notion_agent.queryDatabaseIndex_ToRead(db_index_id)
 
     print(f"Query index db (toread): {db_index_id}, the database pages founded: {db_pages}")
 
-    return db_pages
+    if db_pages:
+        set_notion_index_cache(("toread_pages", db_index_id), db_pages)
+
+    return list(db_pages)
 
 
 def get_notion_database_id_toread(notion_agent, db_index_id):
@@ -248,17 +343,25 @@ def run_shell_command(cmd):
         return False, str(err)
 
 
-def hashcode_md5(data: bytes):
+def hashcode_md5(data: bytes, *parts: bytes):
     """
     Notes: the update() should only be applied to the
            current hash_key, repeat/sequatial call
            means update(a + b + c + ...), which lead
            incorrect/inconsistent hash result
 
+    Extra parts are fed in order, hashcode_md5(a, b, c) equals
+    hashcode_md5(a + b + c) without building the joined bytes, so
+    callers can pre-encode the fixed parts of a key once
+
     Ref: https://docs.python.org/3/library/hashlib.html
     """
     hash_obj = hashlib.md5()
     hash_obj.update(data)
+
+    for part in parts:
+        hash_obj.update(part)
+
     return hash_obj.hexdigest()
 
 
@@ -298,13 +401,10 @@ def load_web(url):
     landing_page = urlUnshorten(url)
     print(f"[load_web] origin url: {url}, landing page: {landing_page}")
 
-    loader = LLMWebLoader()
+    loader = LLMWebLoader(session=get_web_loader_session())
     docs = loader.load(landing_page)
 
-    content = ""
-    for doc in docs:
-        content += doc.page_content
-        content += "\n"
+    content = "".join(doc.page_content + "\n" for doc in docs)
 
     content = refine_content(content)
     print(f"[load_web] finished, content (post refinement): {content[:200]}...")
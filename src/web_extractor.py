@@ -0,0 +1,168 @@
+"""
+Article extraction helpers for web collectors.
+
+Pure functions over html (no network, no collector state), kept in a
+light module so they can also run in worker processes, see
+WebCollectorBase.extract_web_content.
+"""
+
+import threading
+from functools import lru_cache
+
+import lxml.etree
+import lxml.html
+from trafilatura import bare_extraction, extract_metadata, load_html
+from trafilatura.utils import normalize_unicode
+
+
+# lxml parsers can't be shared between threads, keep one per thread
+_parsers = threading.local()
+
+
+def get_html_parser() -> lxml.html.HTMLParser:
+    """
+    Lenient html parser for read-only use: comments are dropped and
+    ids are not indexed, which saves work and memory on big pages
+    """
+    parser = getattr(_parsers, "html", None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(
+            recover=True,
+            remove_comments=True,
+            collect_ids=False,
+            huge_tree=False)
+        _parsers.html = parser
+
+    return parser
+
+
+@lru_cache(maxsize=128)
+def compile_xpath(expr: str) -> lxml.etree.XPath:
+    """
+    Compile an XPath expression once, a source's xpath is evaluated
+    against every page it fetches (e.g. all the digest articles)
+    """
+    return lxml.etree.XPath(expr)
+
+
+def xpath_extraction(
+    html_content: str | lxml.html.HtmlElement,
+    xpath: str,
+    get_text: bool = True
+) -> str | None:
+    """
+    Extract content using XPath.
+
+    Args:
+        html_content: HTML string or already parsed tree
+        xpath: XPath expression
+        get_text: If True, return text content; otherwise return HTML
+
+    Returns:
+        Extracted content or None if not found
+    """
+    print(f"[WebCollectorBase] XPath extraction: {xpath}")
+    try:
+        document = html_content
+        if not isinstance(document, lxml.html.HtmlElement):
+            document = lxml.html.fromstring(html_content, parser=get_html_parser())
+
+        elements = compile_xpath(xpath)(document)
+
+        if not elements:
+            print(f"[WebCollectorBase] No content found for XPath: {xpath}")
+            return None
+
+        first_element = elements[0]
+        if get_text:
+            return first_element.text_content()
+
+        return lxml.html.tostring(first_element, encoding='unicode')
+
+    except Exception as e:
+        print(f"[WebCollectorBase] XPath extraction error: {e}")
+        return None
+
+
+def extract_meta(html_content: str | lxml.html.HtmlElement, url: str) -> tuple[str, str]:
+    """
+    Extract metadata (author, title) from HTML using trafilatura.
+
+    Args:
+        html_content: HTML string or already parsed tree
+        url: Source URL
+
+    Returns:
+        Tuple of (author, title)
+    """
+    metadata = extract_metadata(html_content, default_url=url)
+    if metadata is None:
+        return "", ""
+
+    meta_dict = metadata.as_dict()
+    author = meta_dict.get("author", "") or ""
+    title = meta_dict.get("title", "") or ""
+
+    return author, title
+
+
+def parse_article(html_content: str, url: str, xpath: str = "") -> dict[str, str]:
+    """
+    Extract the article content (XPath or trafilatura) and metadata.
+
+    Args:
+        html_content: HTML string
+        url: Article URL
+        xpath: Optional XPath for content extraction
+
+    Returns:
+        Dict with keys: author, title, content (all empty if no content)
+    """
+    # Parse the page once, the tree is shared by the content and
+    # metadata extraction (trafilatura works on a copy of it). Keep
+    # the raw html if trafilatura refuses to load it
+    document = load_html(html_content)
+    if document is None:
+        document = html_content
+
+    if not xpath:
+        # trafilatura gets the content and the metadata in one pass
+        return _extract_with_meta(document, url)
+
+    # Extract content using XPath
+    content = xpath_extraction(document, xpath) or ""
+
+    if not content:
+        return {"author": "", "title": "", "content": ""}
+
+    # Extract metadata
+    author, title = extract_meta(document, url)
+
+    return {"author": author, "title": title, "content": content}
+
+
+def _extract_with_meta(document: str | lxml.html.HtmlElement, url: str) -> dict[str, str]:
+    """
+    Same content as trafilatura.extract() (text output, comments
+    appended), plus the author and title found along the way
+    """
+    result = bare_extraction(document, url=url, with_metadata=True)
+    if result is None:
+        return {"author": "", "title": "", "content": ""}
+
+    # trafilatura 1.x returns a dict, 2.x a Document
+    if not isinstance(result, dict):
+        result = {key: getattr(result, key, None) for key in ("text", "comments", "author", "title")}
+
+    content = result.get("text")
+    if not content:
+        return {"author": "", "title": "", "content": ""}
+
+    if result.get("comments"):
+        content = f"{content}\n{result['comments']}".strip()
+
+    return {
+        "author": result.get("author") or "",
+        "title": result.get("title") or "",
+        "content": normalize_unicode(content),
+    }
@@ -0,0 +1,35 @@
+"""
+Shared helpers of the test scripts run over and over by hand
+"""
+
+import json
+import os
+import time
+
+
+def index_pages_table_load_cached(db_cli, ttl=300, path="/tmp/auto_news_index.json"):
+    """
+    db_cli.index_pages_table_load() kept in a json file for `ttl`
+    seconds. Dates come back as strings from the file
+    """
+    try:
+        if time.time() - os.path.getmtime(path) < ttl:
+            with open(path) as f:
+                return json.load(f)
+
+    except FileNotFoundError:
+        pass
+
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Index pages cache not loaded: {e}")
+
+    ret = db_cli.index_pages_table_load()
+
+    try:
+        with open(path, "w") as f:
+            json.dump(ret, f, default=str)
+
+    except OSError as e:
+        print(f"[WARN] Index pages cache not saved: {e}")
+
+    return ret
@@ -3,6 +3,9 @@
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -60,6 +63,7 @@ def test_imports():
     return True
 
 
+@pytest.mark.network
 def test_rss_fetch():
     """Test RSS feed parsing with a public feed"""
     print("\n" + "="*60)
@@ -76,11 +80,19 @@ def test_rss_fetch():
         # ("BBC News", "http://feeds.bbci.co.uk/news/technology/rss.xml"),
     ]
 
-    for name, url in test_feeds:
+    # Feeds are fetched concurrently (network bound), then reported in order
+    def _fetch(feed):
+        name, url = feed
         print(f"\nFetching from: {name} ({url})")
+        return op._fetch_articles(name, url, count=2)
+
+    with ThreadPoolExecutor(max_workers=min(16, len(test_feeds))) as executor:
+        futures = [executor.submit(_fetch, feed) for feed in test_feeds]
+
+    for (name, url), future in zip(test_feeds, futures):
         try:
-            articles = op._fetch_articles(name, url, count=2)
-            print(f"  Fetched {len(articles)} articles")
+            articles = future.result()
+            print(f"  {name}: fetched {len(articles)} articles")
 
             if articles:
                 article = articles[0]
@@ -118,6 +130,7 @@ def test_utils():
     return True
 
 
+@pytest.mark.network
 def test_llm_summary():
     """Test LLM summary agent"""
     print("\n" + "="*60)
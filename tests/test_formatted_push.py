@@ -2,7 +2,9 @@
 """Push formatted content to Notion with User Rating - using direct API"""
 
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -11,6 +13,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import httpx
+import orjson
 
 TOKEN = os.getenv("NOTION_TOKEN")
 HEADERS = {
@@ -19,11 +22,19 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
+# Shared client, the keep-alive connections to the Notion API are
+# reused by all the calls (and the push threads)
+CLIENT = httpx.Client(
+    base_url="https://api.notion.com/v1",
+    headers=HEADERS,
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=20),
+)
+
 
 def api_post(endpoint, data):
     """POST to Notion API"""
-    url = f"https://api.notion.com/v1{endpoint}"
-    response = httpx.post(url, headers=HEADERS, json=data, timeout=30)
+    response = CLIENT.post(endpoint, content=orjson.dumps(data))
     result = response.json()
     if response.status_code != 200:
         print(f"API Error: {result}")
@@ -32,8 +43,7 @@ def api_post(endpoint, data):
 
 def api_get(endpoint):
     """GET from Notion API"""
-    url = f"https://api.notion.com/v1{endpoint}"
-    response = httpx.get(url, headers=HEADERS, timeout=30)
+    response = CLIENT.get(endpoint)
     return response.json()
 
 
@@ -76,15 +86,70 @@ def create_database(parent_page_id, name):
 
     if "id" in result:
         print(f"   ✓ Database created: {result['id']}")
-        # Verify properties
-        db_info = api_get(f"/databases/{result['id']}")
-        print(f"   Properties: {list(db_info.get('properties', {}).keys())}")
+        # The created database (with its properties) is returned,
+        # only read it back again when debugging
+        properties = result.get("properties", {})
+        if os.getenv("DEBUG_NOTION"):
+            properties = api_get(f"/databases/{result['id']}").get("properties", {})
+        print(f"   Properties: {list(properties.keys())}")
         return result["id"]
     else:
         print(f"   ✗ Failed: {result}")
         return None
 
 
+# Summary line markup: "1. " / "- " prefixes and **bold** spans
+_LEAD_RE = re.compile(r"^(?:\d{1,2}\.\s*|- )")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+
+# Annotations shared by all the rich text parts (never mutated)
+_ITALIC = {"italic": True}
+_BOLD_ITALIC = {"bold": True, "italic": True}
+_SPAN_ANNOTATIONS = ({"bold": False}, {"bold": True})
+
+# Blocks every article starts / ends with
+_HEADER_BLOCK = {
+    "object": "block",
+    "type": "heading_2",
+    "heading_2": {
+        "rich_text": [{"type": "text", "text": {"content": "📰 Summary"}}]
+    }
+}
+
+_DIVIDER_BLOCK = {"object": "block", "type": "divider", "divider": {}}
+
+_RATING_QUOTE_BLOCK = {
+    "object": "block",
+    "type": "quote",
+    "quote": {
+        "rich_text": [
+            {"type": "text", "text": {"content": "👆 Please rate this article using "}, "annotations": _ITALIC},
+            {"type": "text", "text": {"content": "User Rating"}, "annotations": _BOLD_ITALIC},
+            {"type": "text", "text": {"content": " property above!"}, "annotations": _ITALIC},
+        ]
+    }
+}
+
+
+def summary_bullet(line):
+    """Bulleted list item of a summary line, odd split parts were between **"""
+    parts = _BOLD_RE.split(_LEAD_RE.sub("", line))
+    rich_text = [
+        {
+            "type": "text",
+            "text": {"content": part},
+            "annotations": _SPAN_ANNOTATIONS[i % 2]
+        }
+        for i, part in enumerate(parts) if part
+    ]
+
+    return {
+        "object": "block",
+        "type": "bulleted_list_item",
+        "bulleted_list_item": {"rich_text": rich_text}
+    }
+
+
 def push_article(database_id, article):
     """Push article with formatted content"""
     print(f"\n   📤 Pushing: {article['title'][:40]}...")
@@ -99,67 +164,22 @@ def push_article(database_id, article):
         "Read": {"checkbox": False},
     }
 
-    # Build formatted blocks
-    blocks = []
-
-    # Header
-    blocks.append({
-        "object": "block",
-        "type": "heading_2",
-        "heading_2": {
-            "rich_text": [{"type": "text", "text": {"content": "📰 Summary"}}]
-        }
-    })
+    # Build formatted blocks: header, link, divider, then the summary
+    # points as bullet list (one per non-empty line)
+    summary_lines = [
+        line for line in map(str.strip, article.get("summary", "").splitlines()) if line
+    ]
 
-    # Link
-    blocks.append({
-        "object": "block",
-        "type": "bookmark",
-        "bookmark": {"url": article.get("url", "")}
-    })
-
-    # Divider
-    blocks.append({"object": "block", "type": "divider", "divider": {}})
-
-    # Summary points as bullet list
-    summary_lines = article.get("summary", "").strip().split("\n")
-    for line in summary_lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # Remove leading numbers like "1. " or "- "
-        if line[0].isdigit() and "." in line[:3]:
-            line = line[line.find(".")+1:].strip()
-        elif line.startswith("- "):
-            line = line[2:]
-
-        # Check for bold markers
-        if "**" in line:
-            # Split by ** to create bold sections
-            parts = line.split("**")
-            rich_text = []
-            for i, part in enumerate(parts):
-                if part:
-                    rich_text.append({
-                        "type": "text",
-                        "text": {"content": part},
-                        "annotations": {"bold": i % 2 == 1}  # Odd indices were between **
-                    })
-
-            blocks.append({
-                "object": "block",
-                "type": "bulleted_list_item",
-                "bulleted_list_item": {"rich_text": rich_text}
-            })
-        else:
-            blocks.append({
-                "object": "block",
-                "type": "bulleted_list_item",
-                "bulleted_list_item": {
-                    "rich_text": [{"type": "text", "text": {"content": line}}]
-                }
-            })
+    blocks = [
+        _HEADER_BLOCK,
+        {
+            "object": "block",
+            "type": "bookmark",
+            "bookmark": {"url": article.get("url", "")}
+        },
+        _DIVIDER_BLOCK,
+    ]
+    blocks += [summary_bullet(line) for line in summary_lines]
 
     # Callout for insight
     if article.get("insight"):
@@ -184,17 +204,7 @@ def push_article(database_id, article):
         })
 
     # Quote reminder
-    blocks.append({
-        "object": "block",
-        "type": "quote",
-        "quote": {
-            "rich_text": [
-                {"type": "text", "text": {"content": "👆 Please rate this article using "}, "annotations": {"italic": True}},
-                {"type": "text", "text": {"content": "User Rating"}, "annotations": {"bold": True, "italic": True}},
-                {"type": "text", "text": {"content": " property above!"}, "annotations": {"italic": True}},
-            ]
-        }
-    })
+    blocks.append(_RATING_QUOTE_BLOCK)
 
     # Create page
     data = {
@@ -220,8 +230,9 @@ def main():
 
     # Get ToRead page ID from MySQL
     from mysql_cli import MySQLClient
+    from helpers import index_pages_table_load_cached
     db_cli = MySQLClient()
-    indexes = db_cli.index_pages_table_load()
+    indexes = index_pages_table_load_cached(db_cli)
     toread_page_id = indexes["notion"]["toread_page_id"]["index_id"]
 
     # Create database
@@ -266,8 +277,9 @@ await $\`node dist/main.js\`;""",
     ]
 
     print("\n📤 Pushing articles...")
-    for article in articles:
-        push_article(database_id, article)
+    # Notion allows ~3 requests per second
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(lambda article: push_article(database_id, article), articles))
 
     print("\n" + "="*60)
     print("✅ Done! Go to Notion and:")
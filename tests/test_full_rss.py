@@ -3,6 +3,7 @@
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -19,6 +20,7 @@ if os.path.exists(other_mcp_env):
 
 load_dotenv()
 
+import utils
 from ops_rss import OperatorRSS
 
 
@@ -35,11 +37,22 @@ def main():
         ("HackerNews", "https://hnrss.org/frontpage"),
     ]
 
+    # Feeds are fetched concurrently (network bound), merged in order.
+    # summarize() and rank() already run their LLM calls concurrently
+    with ThreadPoolExecutor(max_workers=min(16, len(test_feeds))) as executor:
+        results = list(executor.map(
+            lambda feed: op._fetch_articles(feed[0], feed[1], count=3), test_feeds))
+
+    # Key by title + url, the same story cross-posted in several feeds
+    # is summarized (one LLM call) only once
     pages = {}
-    for feed_name, feed_url in test_feeds:
-        articles = op._fetch_articles(feed_name, feed_url, count=3)
+    for articles in results:
         for article in articles:
-            pages[article["id"]] = article
+            key = utils.hashcode_md5(article["title"].encode(), article["url"].encode())
+            if key in pages:
+                continue
+
+            pages[key] = article
             print(f"   ✓ {article['title'][:50]}...")
 
     print(f"\n   Total: {len(pages)} articles")
@@ -63,8 +76,9 @@ def main():
 
     # Get ToRead page and create a simple database
     from mysql_cli import MySQLClient
+    from helpers import index_pages_table_load_cached
     db_cli = MySQLClient()
-    indexes = db_cli.index_pages_table_load()
+    indexes = index_pages_table_load_cached(db_cli)
     toread_page_id = indexes["notion"]["toread_page_id"]["index_id"]
 
     from datetime import datetime
@@ -4,6 +4,8 @@
 import os
 import sys
 
+import pytest
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -23,9 +25,15 @@ if os.path.exists(other_mcp_env):
 # Then load auto-news specific config (won't override existing vars)
 load_dotenv()
 
-from llm_agent import LLMAgentCategoryAndRanking, LLMAgentSummary, LLMAgentGeneric
+from llm_agent import (
+    LLMAgentCategoryAndRanking,
+    LLMAgentGeneric,
+    LLMAgentSummary,
+    is_text_in_lang,
+)
 
 
+@pytest.mark.network
 def test_generic_agent():
     """Test basic LLM call with generic agent"""
     print("\n" + "="*60)
@@ -41,6 +49,7 @@ def test_generic_agent():
     return result
 
 
+@pytest.mark.network
 def test_category_ranking():
     """Test category and ranking agent"""
     print("\n" + "="*60)
@@ -62,6 +71,7 @@ def test_category_ranking():
     return result
 
 
+@pytest.mark.network
 def test_summary_agent():
     """Test summary agent"""
     print("\n" + "="*60)
@@ -87,6 +97,31 @@ def test_summary_agent():
     return result
 
 
+def test_is_text_in_lang():
+    """Translation skip check, offline: only a script unique to the target counts"""
+    french = "Le gouvernement a annoncé mardi une nouvelle réforme des retraites, très contestée."
+    chinese = "今天的新闻主要讨论了人工智能在医疗领域的最新应用和挑战。"
+    russian = "Правительство во вторник объявило о новой пенсионной реформе."
+    japanese = "今日のニュースでは、人工知能の医療への応用について紹介します。"
+    korean = "오늘 뉴스에서는 인공지능의 의료 분야 활용을 다룹니다."
+    english = "The government announced a new pension reform on Tuesday."
+
+    # ASCII or Latin script proves nothing, always translate
+    assert not is_text_in_lang(french, "English")
+    assert not is_text_in_lang(english, "English")
+    assert not is_text_in_lang(chinese, "Japanese")
+    assert not is_text_in_lang(russian, "Chinese")
+    assert not is_text_in_lang(chinese, "javanese")
+    assert not is_text_in_lang(chinese, "Chinese")
+    assert not is_text_in_lang(russian, "Ukrainian")
+
+    assert is_text_in_lang(japanese, "Japanese")
+    assert is_text_in_lang(japanese, "ja-JP")
+    assert is_text_in_lang(korean, "Korean")
+    assert is_text_in_lang(russian, "Russian")
+    assert not is_text_in_lang(english, "Korean")
+
+
 if __name__ == "__main__":
     print("Auto-News LLM Test Suite")
     print(f"Using API: {os.getenv('OPENAI_API_BASE', 'default OpenAI')}")
@@ -105,6 +140,9 @@ if __name__ == "__main__":
         test_summary_agent()
         print("\n✓ Summary agent test passed")
 
+        test_is_text_in_lang()
+        print("\n✓ Translation language check passed")
+
         print("\n" + "="*60)
         print("All tests passed! Auto-News LLM functions are working.")
         print("="*60)
@@ -4,6 +4,8 @@
 import os
 import sys
 
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from dotenv import load_dotenv
@@ -12,6 +14,7 @@ load_dotenv()
 from notion import NotionAgent
 
 
+@pytest.mark.network
 def test_notion_connection():
     """Test basic Notion API connection"""
     print("="*60)
@@ -3,13 +3,47 @@
 Test enhanced RSS collector functionality
 """
 
+import ast
+import inspect
 import sys
 import os
+from functools import lru_cache
+
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from dotenv import load_dotenv
 load_dotenv()
 
+import feedparser
+
+from notion import NotionAgent
+from ops_rss import OperatorRSS, _parse_first_entries
+from ops_web_base import WebCollectorBase
+
+
+@lru_cache(maxsize=None)
+def parse_module(path):
+    """Parse a source file once for all the structure checks"""
+    with open(path) as f:
+        return ast.parse(f.read(), filename=path)
+
+
+def function_identifiers(cls, name):
+    """Names and string constants used in method `name` of `cls`"""
+    tree = parse_module(inspect.getsourcefile(cls))
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.name == cls.__name__:
+            for fn in node.body:
+                if isinstance(fn, ast.FunctionDef) and fn.name == name:
+                    return {n.id for n in ast.walk(fn) if isinstance(n, ast.Name)} | {
+                        n.value for n in ast.walk(fn)
+                        if isinstance(n, ast.Constant) and isinstance(n.value, str)}
+
+    raise AssertionError(f"{cls.__name__}.{name} not found")
+
 
 def test_imports():
     """Test that OperatorRSS inherits from WebCollectorBase"""
@@ -17,9 +51,6 @@ def test_imports():
     print("Testing imports...")
     print("=" * 50)
 
-    from ops_rss import OperatorRSS
-    from ops_web_base import WebCollectorBase
-
     op = OperatorRSS()
 
     # Check inheritance
@@ -36,14 +67,13 @@ def test_imports():
     return True
 
 
+@pytest.mark.network
 def test_fetch_basic_rss():
     """Test basic RSS fetching without enhanced features"""
     print("\n" + "=" * 50)
     print("Testing basic RSS fetch...")
     print("=" * 50)
 
-    from ops_rss import OperatorRSS
-
     op = OperatorRSS()
 
     # Use a reliable test RSS feed
@@ -65,14 +95,13 @@ def test_fetch_basic_rss():
     return True
 
 
+@pytest.mark.network
 def test_fetch_with_full_article():
     """Test RSS fetching with full article extraction"""
     print("\n" + "=" * 50)
     print("Testing RSS with full article extraction...")
     print("=" * 50)
 
-    from ops_rss import OperatorRSS
-
     op = OperatorRSS()
 
     # Use a feed where we can test full article fetch
@@ -102,24 +131,72 @@ def test_fetch_with_full_article():
     return True
 
 
+RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+<title>Test feed</title>
+<item><title>First &amp; foremost</title><link>https://example.com/1</link>
+<pubDate>Thu, 03 Mar 2022 08:00:00 GMT</pubDate><description>One</description>
+<category>ai</category></item>
+<item><title>Second</title><link>https://example.com/2</link>
+<pubDate>Fri, 04 Mar 2022 08:00:00 GMT</pubDate><description><![CDATA[<p>Two</p>]]></description></item>
+<item><title>Third</title><link>https://example.com/3</link></item>
+</channel></rss>"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Test feed</title>
+<entry><title>Atom one</title><link href="https://example.com/a1"/>
+<id>a1</id><updated>2022-03-03T08:00:00Z</updated><summary>One</summary></entry>
+<entry><title>Atom two</title><link href="https://example.com/a2"/>
+<id>a2</id><updated>2022-03-04T08:00:00Z</updated></entry>
+</feed>"""
+
+
+def test_parse_first_entries():
+    """Test that the partial parse matches the head of a full feedparser parse"""
+    print("\n" + "=" * 50)
+    print("Testing partial feed parse...")
+    print("=" * 50)
+
+    headers = {"content-location": "https://example.com/feed"}
+    keys = ("title", "link", "published", "published_parsed", "summary", "tags")
+
+    for body in (RSS_FEED, ATOM_FEED):
+        full = feedparser.parse(body, response_headers=headers)
+
+        for count in (1, 2):
+            partial = _parse_first_entries(body, count, headers)
+
+            assert partial is not None
+            assert len(partial.entries) == count
+            for got, expected in zip(partial.entries, full.entries):
+                for key in keys:
+                    assert got.get(key) == expected.get(key), key
+
+        # Asking for more than the feed has gives all the entries
+        assert len(_parse_first_entries(body, 10, headers).entries) == len(full.entries)
+
+    print("✓ Partial parse matches feedparser")
+
+    # Not RSS 2.0/Atom or not well-formed: fallback to the full parse
+    assert _parse_first_entries(b"<rdf:RDF></rdf:RDF>", 1, headers) is None
+    assert _parse_first_entries(b"<rss><channel><item>", 1, headers) is None
+    print("✓ Fallback cases detected")
+
+    return True
+
+
 def test_notion_rss_query():
     """Test that Notion RSS query includes enhanced fields"""
     print("\n" + "=" * 50)
     print("Testing Notion RSS query structure...")
     print("=" * 50)
 
-    from notion import NotionAgent
-
-    # Mock test - just verify the method exists and has right signature
-    agent = NotionAgent.__new__(NotionAgent)
-
-    # Check method signature includes enhanced fields handling
-    import inspect
-    source = inspect.getsource(NotionAgent.queryDatabase_RSSList)
+    # Structure check on the parsed source, no Notion access
+    identifiers = function_identifiers(NotionAgent, "queryDatabase_RSSList")
 
-    assert "xpath" in source.lower(), "Should handle xpath field"
-    assert "browser_mode" in source.lower() or "browser mode" in source.lower(), "Should handle browser_mode field"
-    assert "fetch_full_article" in source.lower() or "fetch full article" in source.lower(), "Should handle fetch_full_article field"
+    assert "xpath" in identifiers, "Should handle xpath field"
+    assert "browser_mode" in identifiers, "Should handle browser_mode field"
+    assert "fetch_full_article" in identifiers, "Should handle fetch_full_article field"
     print("✓ Notion query includes enhanced fields")
 
     return True
@@ -131,6 +208,7 @@ if __name__ == "__main__":
     results.append(("Imports", test_imports()))
     results.append(("Basic RSS fetch", test_fetch_basic_rss()))
     results.append(("Full article fetch", test_fetch_with_full_article()))
+    results.append(("Partial feed parse", test_parse_first_entries()))
     results.append(("Notion query structure", test_notion_rss_query()))
 
     print("\n" + "=" * 50)
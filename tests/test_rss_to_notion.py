@@ -4,8 +4,11 @@ Simplified RSS to Notion test - bypasses MySQL dependency
 Fetches RSS feeds and pushes directly to Notion
 """
 
+import io
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -24,35 +27,109 @@ if os.path.exists(other_mcp_env):
 load_dotenv()
 
 import feedparser
+import requests
+from lxml import etree
 from notion import NotionAgent
 from llm_agent import LLMAgentSummary
 import utils
 
 
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def parse_first_entries(body, count):
+    """
+    Read the first `count` RSS 2.0 items / Atom entries with lxml,
+    the parse stops at the count-th one (no full feedparser pass)
+    """
+    entries = []
+
+    for _, el in etree.iterparse(
+            io.BytesIO(body), events=("end",),
+            tag=("item", f"{_ATOM}entry"),
+            resolve_entities=False, no_network=True):
+        if el.tag == "item":
+            entry = {
+                "title": el.findtext("title", ""),
+                "link": el.findtext("link", ""),
+                "summary": el.findtext("description", ""),
+                "published": el.findtext("pubDate", ""),
+            }
+        else:
+            link = el.find(f"{_ATOM}link")
+            entry = {
+                "title": el.findtext(f"{_ATOM}title", ""),
+                "link": link.get("href", "") if link is not None else "",
+                "summary": el.findtext(f"{_ATOM}summary") or el.findtext(f"{_ATOM}content", ""),
+                "published": el.findtext(f"{_ATOM}published") or el.findtext(f"{_ATOM}updated", ""),
+            }
+
+        entries.append(entry)
+        if len(entries) >= count:
+            break
+
+    return entries
+
+
 def fetch_rss_articles(feed_url, feed_name, count=3):
     """Fetch articles from RSS feed"""
     print(f"\n📡 Fetching RSS: {feed_name}")
     print(f"   URL: {feed_url}")
 
-    feed = feedparser.parse(feed_url)
-    articles = []
+    body = None
+    entries = []
 
-    for i, entry in enumerate(feed.entries[:count]):
-        article = {
-            "title": entry.title,
-            "url": entry.link,
-            "summary": entry.get("summary", "")[:500],
-            "published": entry.get("published", ""),
+    try:
+        resp = requests.get(
+            feed_url, headers={"User-Agent": feedparser.USER_AGENT}, timeout=(5, 30))
+        resp.raise_for_status()
+        body = resp.content
+        entries = parse_first_entries(body, count)
+
+    except (requests.exceptions.RequestException, etree.XMLSyntaxError) as e:
+        print(f"   ⚠ Fast parse failed, fallback to feedparser: {e}")
+
+    # Nothing recognized (e.g. RSS 1.0), let feedparser handle it
+    if not entries:
+        entries = feedparser.parse(body or feed_url).entries[:count]
+
+    articles = [
+        {
+            "title": (entry.get("title") or "").strip(),
+            "url": (entry.get("link") or "").strip(),
+            "summary": (entry.get("summary") or "").strip()[:500],
+            "published": (entry.get("published") or "").strip(),
             "feed_name": feed_name,
         }
-        articles.append(article)
-        print(f"   [{i+1}] {article['title'][:50]}...")
+        for entry in entries
+    ]
+
+    # One write, the feeds are fetched concurrently
+    if articles:
+        print("\n".join(
+            f"   [{i+1}] {article['title'][:50]}..." for i, article in enumerate(articles)))
 
     return articles
 
 
+# Sentence endings, the dots inside urls are not followed by a space
+_SENTENCE_END_RE = re.compile(r"[.!?](?:\s|$)")
+
+
+def is_prose_summary(summary):
+    """
+    The feed summary is already a readable abstract: a few sentences
+    of plain text (no markup, not just links like HackerNews)
+    """
+    return 200 <= len(summary) <= 1800 and "<" not in summary \
+        and len(_SENTENCE_END_RE.findall(summary)) >= 2
+
+
 def summarize_article(agent, article):
     """Generate summary using LLM"""
+    if is_prose_summary(article['summary']):
+        return article['summary']
+
     content = f"{article['title']}\n\n{article['summary']}"
     if len(content) < 50:
         return article['summary']
@@ -89,6 +166,17 @@ def create_toread_database(notion_agent, parent_page_id):
     return db['id']
 
 
+def paragraph_block(text):
+    """Notion paragraph block with a single plain text part"""
+    return {
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [{"text": {"content": text}}]
+        }
+    }
+
+
 def push_to_notion(notion_agent, database_id, article, summary):
     """Push article to Notion database"""
     print(f"   📤 Pushing: {article['title'][:40]}...")
@@ -102,31 +190,12 @@ def push_to_notion(notion_agent, database_id, article, summary):
         },
     }
 
-    # Content blocks
-    blocks = []
-
-    # Add source info
-    blocks.append({
-        "object": "block",
-        "type": "paragraph",
-        "paragraph": {
-            "rich_text": [{
-                "text": {"content": f"🔗 Source: {article['url']}"}
-            }]
-        }
-    })
-
-    # Add summary
+    # Content blocks: source info, then the summary
     summary_text = summary[:1900] if summary else "No summary available"
-    blocks.append({
-        "object": "block",
-        "type": "paragraph",
-        "paragraph": {
-            "rich_text": [{
-                "text": {"content": f"\n📝 Summary:\n{summary_text}"}
-            }]
-        }
-    })
+    blocks = [
+        paragraph_block(f"🔗 Source: {article['url']}"),
+        paragraph_block(f"\n📝 Summary:\n{summary_text}"),
+    ]
 
     new_page = notion_agent.api.pages.create(
         parent={"database_id": database_id},
@@ -172,25 +241,31 @@ def main():
         # ("TechCrunch", "https://techcrunch.com/feed/"),
     ]
 
-    # Fetch and process
-    total_pushed = 0
+    # Fetch the feeds concurrently (network bound), merged in order
+    with ThreadPoolExecutor(max_workers=min(8, len(feeds))) as executor:
+        results = list(executor.map(
+            lambda feed: fetch_rss_articles(feed[1], feed[0], count=3), feeds))
+
+    articles = [article for feed_articles in results for article in feed_articles]
 
-    for feed_name, feed_url in feeds:
-        articles = fetch_rss_articles(feed_url, feed_name, count=3)
+    def _process_one(article):
+        try:
+            # Generate summary
+            summary = summarize_article(llm_agent, article)
 
-        print(f"\n🤖 Processing {len(articles)} articles with LLM...")
+            # Push to Notion
+            push_to_notion(notion_agent, database_id, article, summary)
+            return True
 
-        for article in articles:
-            try:
-                # Generate summary
-                summary = summarize_article(llm_agent, article)
+        except Exception as e:
+            print(f"   ❌ Error processing {article['title'][:30]}: {e}")
+            return False
 
-                # Push to Notion
-                push_to_notion(notion_agent, database_id, article, summary)
-                total_pushed += 1
+    print(f"\n🤖 Processing {len(articles)} articles with LLM...")
 
-            except Exception as e:
-                print(f"   ❌ Error processing {article['title'][:30]}: {e}")
+    # Notion allows ~3 requests per second
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        total_pushed = sum(executor.map(_process_one, articles))
 
     print("\n" + "="*60)
     print(f"✅ Done! Pushed {total_pushed} articles to Notion")
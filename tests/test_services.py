@@ -2,7 +2,12 @@
 """Test database service connections"""
 
 import os
+import socket
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -10,14 +15,32 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+# All of these need the data services running
+pytestmark = pytest.mark.network
+
+# By default only check the services accept connections, set
+# SERVICES_DEEP_CHECK=true to also authenticate and query them
+DEEP_CHECK = os.getenv("SERVICES_DEEP_CHECK", "false").lower() == "true"
+
+
+def tcp_probe(host, port, timeout=1):
+    """Open (and close) a TCP connection to host:port"""
+    with socket.create_connection((host, int(port)), timeout=timeout):
+        pass
+
+
 def test_redis():
     """Test Redis connection"""
     print("\n📡 Testing Redis...")
     try:
-        import redis
         url = os.getenv("BOT_REDIS_URL", "redis://:@localhost:6379/1")
-        r = redis.from_url(url)
-        r.ping()
+        if DEEP_CHECK:
+            import redis
+            r = redis.from_url(url)
+            r.ping()
+        else:
+            parsed = urlparse(url)
+            tcp_probe(parsed.hostname or "localhost", parsed.port or 6379)
         print(f"   ✓ Redis connected: {url}")
         return True
     except Exception as e:
@@ -29,10 +52,17 @@ def test_mysql():
     """Test MySQL connection"""
     print("\n📡 Testing MySQL...")
     try:
+        host = os.getenv("MYSQL_HOST", "localhost")
+        port = int(os.getenv("MYSQL_PORT", 3306))
+        if not DEEP_CHECK:
+            tcp_probe(host, port)
+            print(f"   ✓ MySQL reachable: {host}:{port}")
+            return True
+
         import mysql.connector
         conn = mysql.connector.connect(
-            host=os.getenv("MYSQL_HOST", "localhost"),
-            port=int(os.getenv("MYSQL_PORT", 3306)),
+            host=host,
+            port=port,
             user=os.getenv("MYSQL_USER", "bot"),
             password=os.getenv("MYSQL_PASSWORD", "bot"),
             database=os.getenv("MYSQL_DATABASE", "bot"),
@@ -52,12 +82,15 @@ def test_milvus():
     """Test Milvus connection"""
     print("\n📡 Testing Milvus...")
     try:
-        from pymilvus import connections
         host = os.getenv("MILVUS_HOST", "localhost")
         port = os.getenv("MILVUS_PORT", "19530")
-        connections.connect("default", host=host, port=port)
+        if DEEP_CHECK:
+            from pymilvus import connections
+            connections.connect("default", host=host, port=port)
+            connections.disconnect("default")
+        else:
+            tcp_probe(host, port)
         print(f"   ✓ Milvus connected: {host}:{port}")
-        connections.disconnect("default")
         return True
     except Exception as e:
         print(f"   ✗ Milvus failed: {e}")
@@ -69,10 +102,13 @@ if __name__ == "__main__":
     print("Testing Data Services")
     print("="*50)
 
-    results = []
-    results.append(("Redis", test_redis()))
-    results.append(("MySQL", test_mysql()))
-    results.append(("Milvus", test_milvus()))
+    checks = [("Redis", test_redis), ("MySQL", test_mysql), ("Milvus", test_milvus)]
+
+    # The checks are independent, run them concurrently so the failing
+    # ones time out together
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [(name, executor.submit(check)) for name, check in checks]
+        results = [(name, future.result()) for name, future in futures]
 
     print("\n" + "="*50)
     print("Summary")
@@ -5,11 +5,17 @@ Test Web Collector functionality
 
 import sys
 import os
+
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from dotenv import load_dotenv
 load_dotenv()
 
+from trafilatura import extract
+from ops_web_base import WebCollectorBase
+
 
 def test_imports():
     """Test that all modules can be imported"""
@@ -48,8 +54,6 @@ def test_web_collector_base():
     print("Testing WebCollectorBase...")
     print("=" * 50)
 
-    from ops_web_base import WebCollectorBase
-
     collector = WebCollectorBase()
 
     # Test configuration
@@ -113,8 +117,6 @@ def test_trafilatura():
     print("Testing Trafilatura extraction...")
     print("=" * 50)
 
-    from trafilatura import extract
-
     html = """
     <!DOCTYPE html>
     <html>
@@ -144,14 +146,68 @@ def test_trafilatura():
     return True
 
 
+def test_digest_urls():
+    """Test the link extraction and filtering of digest pages"""
+    print("\n" + "=" * 50)
+    print("Testing digest URL filtering...")
+    print("=" * 50)
+
+    collector = WebCollectorBase()
+
+    html = """
+    <html>
+        <body>
+            <a href="/post/1">Post 1</a>
+            <a href=" /post/2?utm_source=x ">Post 2</a>
+            <a href="/post/1#comments">Post 1 comments</a>
+            <a href="#top">Top</a>
+            <a href="javascript:void(0)">Menu</a>
+            <a href="mailto:me@example.com">Mail</a>
+            <a href="tel:123">Call</a>
+            <a>No href</a>
+            <a href="/images/cover.JPG">Cover</a>
+            <a href="/feed.xml">Feed</a>
+            <a href="https://other.com/post/3">Post 3</a>
+        </body>
+    </html>
+    """
+
+    urls = collector.get_urls_from_html("https://example.com/digest/", html)
+    assert urls == [
+        "https://example.com/post/1",
+        "https://example.com/post/2?utm_source=x",
+        "https://example.com/post/1#comments",
+        "https://example.com/images/cover.JPG",
+        "https://example.com/feed.xml",
+        "https://other.com/post/3",
+    ]
+    print("✓ Non-page hrefs skipped")
+
+    filtered = collector.filter_digest_urls("https://example.com/digest/", urls)
+    assert filtered == [
+        "https://example.com/post/1",
+        "https://example.com/post/2?utm_source=x",
+        "https://example.com/feed.xml",
+        "https://other.com/post/3",
+    ]
+    print("✓ Repeated and asset links dropped")
+
+    collector.digest_same_host = True
+    filtered = collector.filter_digest_urls("https://example.com/digest/", urls)
+    assert "https://other.com/post/3" not in filtered
+    assert len(filtered) == 3
+    print("✓ Off-host links dropped")
+
+    return True
+
+
+@pytest.mark.network
 def test_fetch_real_page():
     """Test fetching a real web page (without browser mode)"""
     print("\n" + "=" * 50)
     print("Testing real page fetch...")
     print("=" * 50)
 
-    from ops_web_base import WebCollectorBase
-
     collector = WebCollectorBase()
 
     # Fetch a simple page
@@ -169,14 +225,13 @@ def test_fetch_real_page():
         return False
 
 
+@pytest.mark.network
 def test_extract_web_content():
     """Test full content extraction pipeline"""
     print("\n" + "=" * 50)
     print("Testing web content extraction...")
     print("=" * 50)
 
-    from ops_web_base import WebCollectorBase
-
     collector = WebCollectorBase()
 
     # Use a simple test page
@@ -202,6 +257,7 @@ if __name__ == "__main__":
     results.append(("Imports", test_imports()))
     results.append(("WebCollectorBase", test_web_collector_base()))
     results.append(("Trafilatura", test_trafilatura()))
+    results.append(("Digest URLs", test_digest_urls()))
     results.append(("Real page fetch", test_fetch_real_page()))
     results.append(("Content extraction", test_extract_web_content()))
 